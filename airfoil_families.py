@@ -0,0 +1,148 @@
+"""Airfoil family classification from profile names and per-family statistics."""
+
+import re
+
+from extract_limits import extract_limits
+from filter_profiles import apply_criteria, resolve_column
+
+# (family, pattern on the profile name), first match wins
+FAMILY_PATTERNS = [
+    ("NACA 6-series", r"^NACA\s*6\d(\(\d\))?-|^NACA\s*6\d{4}a="),
+    ("NACA 5-digit", r"^NACA\s*\d{5}(?!\d)"),
+    ("NACA 4-digit", r"^NACA\s*\d{4}(?!\d)"),
+    ("NACA M-series", r"^NACA\s*M\d"),
+    ("Eppler", r"^E\d|^EPPLER\b"),
+    ("Wortmann FX", r"^(WORTMANN\s+)?FX\s"),
+    ("MH", r"^MH\s*\d"),
+    ("Selig-Donovan SD", r"^SD\d"),
+    ("Selig-Giguère SG", r"^SG\d"),
+    ("Selig S", r"^S\d"),
+    ("Drela AG", r"^AG\d"),
+    ("Göttingen GOE", r"^GOE\s*\d"),
+    ("Clark Y", r"^CLARK\s*Y"),
+]
+OTHER_FAMILY = "Other"
+
+_COMPILED = [(family, re.compile(p, re.IGNORECASE)) for family, p in FAMILY_PATTERNS]
+
+# Metrics aggregated by default
+DEFAULT_FAMILY_METRICS = ["Cd_min", "Cl_max", "Cl/Cd_max"]
+
+# Whether the best value of a metric is the highest (None: no best value)
+FAMILY_METRICS = {
+    "Cl_alpha (rad⁻¹)": True,
+    "Cm_0": True,  # least nose-down
+    "Cd_min": False,
+    "Cl_i": None,
+    "Cl/Cd @ Cl_i": True,
+    "Cl_max": True,
+    "Cd @ Cl_max": False,
+    "Cl/Cd_max": True,
+}
+
+
+def classify_family(name):
+    """Family of a profile name (see FAMILY_PATTERNS), or OTHER_FAMILY."""
+    for family, pattern in _COMPILED:
+        if pattern.search(name):
+            return family
+    return OTHER_FAMILY
+
+
+def add_family_column(df):
+    """Insert a 'Family' column after 'Profile' (each distinct name classified once)."""
+    if "Family" in df.columns:
+        return df
+    df = df.copy()
+    names = df["Profile"].astype(str)
+    families = {n: classify_family(n) for n in names.unique()}
+    df.insert(df.columns.get_loc("Profile") + 1, "Family", names.map(families))
+    return df
+
+
+def select_families(df, families):
+    """
+    Keep the rows whose family matches one of ``families``.
+
+    Matching is by case-insensitive substring, as --profiles does for
+    profile names: 'naca' selects all NACA families.
+    """
+    if not families:
+        return df
+    df = add_family_column(df)
+    wanted = [f.lower() for f in families]
+    keep = {
+        fam for fam in df["Family"].unique() if any(w in fam.lower() for w in wanted)
+    }
+    return df[df["Family"].isin(keep)].reset_index(drop=True)
+
+
+def family_statistics(
+    polars_dir=None,
+    profiles=None,
+    re_filter=None,
+    families=None,
+    criteria=None,
+    metrics=None,
+):
+    """
+    Per-family statistics of the limits table at each Reynolds number.
+
+    Parameters:
+    -----------
+    polars_dir : str
+        Directory containing polar files
+    profiles : list
+        List of profile name filters
+    re_filter : str
+        Reynolds number filter (all Re when None)
+    families : list, optional
+        Family filters (see select_families)
+    criteria : dict, optional
+        Filter criteria applied to the profiles before aggregating (see
+        filter_profiles; 'family == ...' is accepted too)
+    metrics : list, optional
+        Limits columns or filter aliases to aggregate (default:
+        DEFAULT_FAMILY_METRICS)
+
+    Returns:
+    --------
+    pd.DataFrame
+        One row per family and Re: Family, Re, Profiles (number of
+        profiles), then 'mean X', 'median X' and 'best X' for each metric X
+        ('best' is the lowest value for drag columns and the highest for the
+        others, see FAMILY_METRICS; angles and Cl_i have none), computed
+        with one groupby over the limits table
+    """
+    df = extract_limits(polars_dir, profiles, re_filter, with_re=True)
+    if df.empty:
+        return df
+    df = select_families(add_family_column(df), families)
+    from re_scaling import merge_re_fits, needs_re_fits
+
+    if needs_re_fits(list(criteria or []) + list(metrics or [])):
+        df = merge_re_fits(df, polars_dir)
+    if criteria:
+        df = apply_criteria(df, criteria)
+    if df.empty:
+        return df
+
+    columns = (
+        [resolve_column(m) for m in metrics] if metrics else DEFAULT_FAMILY_METRICS
+    )
+    numeric = [c for c in df.columns if df[c].dtype.kind in "biuf" and c != "Re"]
+    missing = [c for c in columns if c not in numeric]
+    if missing:
+        raise ValueError(
+            f"Unknown or non-numeric metric(s): {', '.join(missing)}. "
+            f"Available columns: {', '.join(numeric)}"
+        )
+
+    aggs = {"Profiles": ("Profile", "nunique")}
+    for col in columns:
+        aggs[f"mean {col}"] = (col, "mean")
+        aggs[f"median {col}"] = (col, "median")
+        higher = FAMILY_METRICS.get(col)
+        if higher is not None:
+            aggs[f"best {col}"] = (col, "max" if higher else "min")
+    return df.groupby(["Family", "Re"], sort=True).agg(**aggs).reset_index()
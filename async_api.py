@@ -0,0 +1,240 @@
+"""Asyncio counterparts of the loaders, for use inside an event loop."""
+
+import asyncio
+import os
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+
+from extract_limits import extract_limits
+from filter_profiles import filter_profiles
+from polars_reader import (
+    file_signature,
+    parse_polar_file,
+    parse_polar_files,
+    select_polar_files,
+)
+
+# Threads running file I/O and parsing, and blocking calls queued at once per loop
+MAX_WORKERS = min(8, os.cpu_count() or 1)
+MAX_CONCURRENCY = 64
+
+_settings = {"max_workers": MAX_WORKERS, "max_concurrency": MAX_CONCURRENCY}
+_executor = None
+_executor_lock = threading.Lock()
+_loops = weakref.WeakKeyDictionary()  # event loop -> {"semaphore", "inflight"}
+
+
+def configure(max_workers=None, max_concurrency=None):
+    """
+    Set the size of the worker pool and the concurrency limit.
+
+    ``max_workers`` threads run the blocking calls; at most
+    ``max_concurrency`` of them are submitted at once from each event loop,
+    the others wait without holding a worker. The pool is recreated on the
+    next call; work already running finishes on the old one.
+    """
+    global _executor
+    if max_workers is not None:
+        if max_workers < 1:
+            raise ValueError("max_workers must be >= 1")
+        with _executor_lock:
+            _settings["max_workers"] = int(max_workers)
+            if _executor is not None:
+                _executor.shutdown(wait=False)
+                _executor = None
+    if max_concurrency is not None:
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be >= 1")
+        _settings["max_concurrency"] = int(max_concurrency)
+        for state in _loops.values():
+            state["semaphore"] = None
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=_settings["max_workers"], thread_name_prefix="polars"
+            )
+        return _executor
+
+
+def _state():
+    loop = asyncio.get_running_loop()
+    state = _loops.get(loop)
+    if state is None:
+        state = _loops[loop] = {"semaphore": None, "inflight": {}}
+    if state["semaphore"] is None:
+        state["semaphore"] = asyncio.Semaphore(_settings["max_concurrency"])
+    return state
+
+
+async def _run(func, *args, **kwargs):
+    """Run a blocking call on the worker pool, within the concurrency limit."""
+    async with _state()["semaphore"]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _get_executor(), partial(func, *args, **kwargs)
+        )
+
+
+def _forget(inflight, key, entry, _task):
+    if inflight.get(key) is entry:
+        del inflight[key]
+
+
+async def _shared(key, factory):
+    """
+    Await the in-flight task for ``key``, starting it with ``factory()`` if none.
+
+    Callers asking for the same key while it runs share one task. A caller
+    being cancelled does not cancel the others; the task itself is cancelled
+    when its last caller is.
+    """
+    inflight = _state()["inflight"]
+    entry = inflight.get(key)
+    if entry is None:
+        entry = {"task": asyncio.ensure_future(factory()), "waiters": 0}
+        inflight[key] = entry
+        entry["task"].add_done_callback(partial(_forget, inflight, key, entry))
+    entry["waiters"] += 1
+    try:
+        return await asyncio.shield(entry["task"])
+    finally:
+        entry["waiters"] -= 1
+        if entry["waiters"] == 0 and not entry["task"].done():
+            _forget(inflight, key, entry, None)
+            entry["task"].cancel()
+
+
+def _select(polars_dir, profiles, re_filter, shard):
+    files = select_polar_files(polars_dir, profiles, re_filter, shard=shard)
+    if not files:
+        raise RuntimeError("No polar files matched selection")
+    return files, tuple((str(f), file_signature(f)) for f in files)
+
+
+async def aparse_polar_file(path, sort=True):
+    """Async parse_polar_file; concurrent calls for the same file share one parse."""
+    path = Path(path)
+    signature = await _run(file_signature, path)
+    parsed = await _shared(
+        ("parse", str(path), sort, signature),
+        partial(_run, parse_polar_file, path, sort),
+    )
+    return dict(parsed)
+
+
+async def _load(polars_dir, profiles, re_filter, shard):
+    files, signatures = await _run(_select, polars_dir, profiles, re_filter, shard)
+
+    async def load():
+        if not files[0].exists() and files[0].parent.is_file():
+            # Single-file source (archive, database, ...): one sequential pass
+            return await _run(parse_polar_files, files)
+        # Polar files: one job per file, shared with other selections
+        return await asyncio.gather(
+            *(
+                _shared(("parse", name, True, sig), partial(_run, parse_polar_file, f))
+                for f, (name, sig) in zip(files, signatures)
+            )
+        )
+
+    parsed = await _shared(("corpus", signatures), load)
+    return files, signatures, parsed
+
+
+async def aload_corpus(polars_dir=None, profiles=None, re_filter=None, shard=None):
+    """
+    Parse all selected polar files without blocking the event loop.
+
+    Parameters:
+    -----------
+    polars_dir : str
+        Polars directory or single-file source (see list_polar_files)
+    profiles : list
+        List of profile name filters
+    re_filter : str
+        Reynolds number filter
+    shard : tuple, optional
+        (index, count) pair passed to select_polar_files
+
+    Files are parsed on the worker pool (see configure) through the
+    parse_polar_file cache. Concurrent calls for the same files, or sharing
+    some files, wait for the same parses instead of starting new ones.
+
+    Returns:
+    --------
+    list
+        Parsed polars in the parse_polar_file format, in file order
+    """
+    _, _, parsed = await _load(polars_dir, profiles, re_filter, shard)
+    return [dict(p) for p in parsed]
+
+
+def _parser(files, parsed):
+    lookup = {str(f): p for f, p in zip(files, parsed)}
+
+    def parse(f):
+        p = lookup.get(str(f))
+        return dict(p) if p is not None else parse_polar_file(f)
+
+    return parse
+
+
+async def aextract_limits(
+    polars_dir=None,
+    profiles=None,
+    re_filter=None,
+    with_re=False,
+    shard=None,
+    with_file=False,
+):
+    """Async extract_limits (same arguments); concurrent identical calls share one run."""
+    files, signatures, parsed = await _load(polars_dir, profiles, re_filter, shard)
+    df = await _shared(
+        ("limits", signatures, with_re, with_file),
+        partial(
+            _run,
+            extract_limits,
+            polars_dir,
+            profiles,
+            re_filter,
+            parser=_parser(files, parsed),
+            with_re=with_re,
+            shard=shard,
+            with_file=with_file,
+        ),
+    )
+    return df.copy()
+
+
+async def afilter_profiles(
+    polars_dir=None,
+    profiles=None,
+    re_filter=None,
+    criteria=None,
+    shard=None,
+    with_file=False,
+):
+    """Async filter_profiles (same arguments); concurrent identical calls share one run."""
+    files, signatures, parsed = await _load(polars_dir, profiles, re_filter, shard)
+    df = await _shared(
+        ("filter", signatures, repr(criteria), with_file),
+        partial(
+            _run,
+            filter_profiles,
+            polars_dir,
+            profiles,
+            re_filter,
+            criteria,
+            parser=_parser(files, parsed),
+            shard=shard,
+            with_file=with_file,
+        ),
+    )
+    return df.copy()
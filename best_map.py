@@ -0,0 +1,173 @@
+"""Best-airfoil map: lowest-Cd profile and its margin over a Re x Cl grid."""
+
+import numpy as np
+import pandas as pd
+
+from mission import CL_STEP, drag_polar_grid, interp_cd
+from polar_tensor import build_polar_tensor, coefficient
+
+
+def best_airfoil_map(
+    re_grid,
+    cl_grid,
+    polars_dir=None,
+    profiles=None,
+    candidates=None,
+    cl_step=CL_STEP,
+    tensor=None,
+):
+    """
+    Find the lowest-drag profile in every (Re, Cl) cell.
+
+    Parameters:
+    -----------
+    re_grid : array
+        Reynolds numbers of the map (within the shipped range)
+    cl_grid : array
+        Lift coefficients of the map
+    polars_dir : str
+        Directory containing polar files
+    profiles : list
+        List of profile name filters
+    candidates : list, optional
+        Exact profile names allowed (e.g. the result of filter_profiles)
+    cl_step : float
+        Step of the Cl grid used to tabulate Cd(Cl)
+    tensor : dict, optional
+        Prebuilt polar tensor (see polar_tensor.build_polar_tensor)
+
+    Returns:
+    --------
+    pd.DataFrame
+        One row per cell: Re, Cl, Best, Cd, Runner-up, Cd runner-up,
+        ΔCd (runner-up minus best), Margin (%) and Feasible (number of
+        profiles that reach that Cl at that Re). Best is empty where no
+        profile can fly the cell.
+    """
+    if tensor is None:
+        tensor = build_polar_tensor(polars_dir, profiles)
+    names = np.array(tensor["profiles"])
+    keep = np.ones(len(names), dtype=bool)
+    if candidates is not None:
+        keep = np.isin(names, list(candidates))
+        if not keep.any():
+            raise RuntimeError("No candidate profile in the polar data")
+
+    cl_all = coefficient(tensor, "CL")
+    cl_tab = np.arange(
+        np.floor(np.nanmin(cl_all) / cl_step) * cl_step,
+        np.nanmax(cl_all) + cl_step,
+        cl_step,
+    )
+    cd_grid = drag_polar_grid(tensor, cl_tab)[keep]
+    names = names[keep]
+
+    re_grid = np.asarray(re_grid, dtype=float)
+    cl_grid = np.asarray(cl_grid, dtype=float)
+    re_pts, cl_pts = (g.ravel() for g in np.meshgrid(re_grid, cl_grid, indexing="ij"))
+    cd = interp_cd(tensor["re"], cl_tab, cd_grid, re_pts, cl_pts)  # (P, cells)
+
+    # Lower envelope and runner-up without sorting all profiles
+    cd = np.where(np.isnan(cd), np.inf, cd)
+    feasible = np.isfinite(cd).sum(axis=0)
+    best = np.argmin(cd, axis=0)
+    cd_best = cd[best, np.arange(cd.shape[1])]
+    if len(names) > 1:
+        cd_second = np.partition(cd, 1, axis=0)[1]
+        masked = cd.copy()
+        masked[best, np.arange(cd.shape[1])] = np.inf
+        second = np.argmin(masked, axis=0)
+    else:
+        cd_second = np.full(cd.shape[1], np.inf)
+        second = best
+
+    has_best = feasible >= 1
+    has_second = feasible >= 2
+    return pd.DataFrame(
+        {
+            "Re": re_pts,
+            "Cl": np.round(cl_pts, 6),
+            "Best": np.where(has_best, names[best], ""),
+            "Cd": np.where(has_best, cd_best, np.nan),
+            "Runner-up": np.where(has_second, names[second], ""),
+            "Cd runner-up": np.where(has_second, cd_second, np.nan),
+            "ΔCd": np.where(has_second, cd_second - cd_best, np.nan),
+            "Margin (%)": np.where(
+                has_second, 100 * (cd_second - cd_best) / cd_best, np.nan
+            ),
+            "Feasible": feasible,
+        }
+    )
+
+
+def plot_best_map(table, out_path=None, figsize=(14, 9)):
+    """
+    Draw the best-airfoil map as a heat map.
+
+    Cells are coloured by winning profile and labelled with its name and the
+    margin over the runner-up; cells no profile can fly are left blank.
+    """
+    import matplotlib.pyplot as plt
+    from matplotlib.colors import ListedColormap
+    from matplotlib.patches import Patch
+
+    from plot_polars import profile_colors
+
+    re_values = np.sort(table["Re"].unique())
+    cl_values = np.sort(table["Cl"].unique())
+    winners = sorted(w for w in table["Best"].unique() if w)
+    index = {w: i for i, w in enumerate(winners)}
+
+    grid = np.full((len(cl_values), len(re_values)), np.nan)
+    ri = np.searchsorted(re_values, table["Re"])
+    ci = np.searchsorted(cl_values, table["Cl"])
+    grid[ci, ri] = [index.get(w, np.nan) for w in table["Best"]]
+
+    cmap = ListedColormap(profile_colors(max(len(winners), 1)))
+
+    # One equal-sized cell per grid value, so close Reynolds numbers stay legible
+    fig, ax = plt.subplots(figsize=figsize)
+    ax.imshow(
+        np.ma.masked_invalid(grid),
+        cmap=cmap,
+        vmin=-0.5,
+        vmax=max(len(winners), 1) - 0.5,
+        origin="lower",
+        aspect="auto",
+        interpolation="nearest",
+    )
+    ax.set_xticks(np.arange(len(re_values)))
+    ax.set_xticklabels([f"{r / 1e6:g}M" for r in re_values], rotation=45)
+    ax.set_yticks(np.arange(len(cl_values)))
+    ax.set_yticklabels([f"{c:g}" for c in cl_values])
+    ax.set_xticks(np.arange(len(re_values) + 1) - 0.5, minor=True)
+    ax.set_yticks(np.arange(len(cl_values) + 1) - 0.5, minor=True)
+    ax.grid(which="minor", color="white", linewidth=0.8)
+    ax.tick_params(which="minor", length=0)
+
+    if len(re_values) * len(cl_values) <= 400:
+        fontsize = 6 if len(re_values) > 10 else 8
+        for r, c, best, margin in zip(ri, ci, table["Best"], table["Margin (%)"]):
+            if not best:
+                continue
+            label = best if len(best) <= 14 else best[:13] + "…"
+            if np.isfinite(margin):
+                label += f"\n+{margin:.0f}%"
+            ax.text(r, c, label, ha="center", va="center", fontsize=fontsize)
+
+    ax.set_xlabel("Re", fontsize=18)
+    ax.set_ylabel(r"$C_l$", fontsize=18)
+    ax.tick_params(axis="both", labelsize=14)
+    ax.set_title("Perfil de menor $C_d$ por Re y $C_l$", fontsize=20, pad=15)
+    ax.legend(
+        handles=[Patch(color=cmap(index[w]), label=w) for w in winners],
+        loc="center left",
+        bbox_to_anchor=(1.01, 0.5),
+        fontsize=11,
+    )
+    fig.tight_layout()
+    if out_path:
+        fig.savefig(out_path, dpi=300, bbox_inches="tight")
+        print("Saved figure to", out_path)
+    else:
+        plt.show()
@@ -0,0 +1,179 @@
+"""Parallel health check of polar files with a quarantine list."""
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from polars_reader import (
+    QUARANTINE_FILE,
+    cache_dir,
+    parse_polar_file,
+    parse_re_from_header,
+    select_polar_files,
+)
+
+REPORT_FILE = "check_report.csv"
+
+# Thresholds used by check_polar_file
+MAX_ALPHA_GAP = 1.0  # deg; wider holes mean unconverged points were dropped
+CD_SPIKE_RATIO = 1.5  # Cd / rolling median of its neighbours
+CD_SPIKE_ABS = 0.005  # minimum absolute Cd excess for a spike
+RE_TOLERANCE = 1e-3  # relative header vs file name Re mismatch
+
+
+def check_polar_file(path, max_gap=MAX_ALPHA_GAP):
+    """
+    Validate one polar file.
+
+    Returns a report row with the file name, profile, number of points,
+    ``Status`` ('ok', 'warning' or 'bad') and a description of the issues.
+    Files with status 'bad' are unusable and are quarantined by check_corpus.
+    """
+    path = Path(path)
+    row = {"File": path.name, "Profile": None, "Points": 0}
+    errors = []
+    warnings = []
+    try:
+        p = parse_polar_file(path, sort=False)
+    except Exception as e:
+        errors.append(f"parse error: {e}")
+        p = None
+
+    if p is not None:
+        row["Profile"] = p["name"]
+        df = p["df"]
+        if df is None or df.empty:
+            errors.append("no polar data")
+        else:
+            row["Points"] = len(df)
+            alpha = df["alpha"].to_numpy()
+            steps = np.diff(alpha)
+
+            if (steps < 0).any():
+                warnings.append(
+                    f"non-monotone alpha ({int((steps < 0).sum())} reversals)"
+                )
+            n_dup = int(df["alpha"].duplicated().sum())
+            if n_dup:
+                warnings.append(f"{n_dup} duplicate alpha rows")
+
+            gaps = np.diff(np.sort(alpha))
+            wide = gaps[gaps > max_gap]
+            if len(wide):
+                warnings.append(
+                    f"{len(wide)} alpha gaps > {max_gap:g} deg (max {wide.max():.1f} deg)"
+                )
+
+            n_nan = int(df[["CL", "CD", "Cm"]].isna().any(axis=1).sum())
+            if n_nan:
+                warnings.append(f"{n_nan} rows with NaN coefficients")
+
+            cd = df.sort_values("alpha")["CD"]
+            if (cd <= 0).any():
+                errors.append(f"{int((cd <= 0).sum())} non-positive Cd values")
+            median = cd.rolling(5, center=True, min_periods=3).median()
+            spikes = (cd > CD_SPIKE_RATIO * median) & (cd - median > CD_SPIKE_ABS)
+            if spikes.any():
+                warnings.append(f"{int(spikes.sum())} Cd spikes")
+
+        re_name = parse_re_from_header(path.name)
+        if re_name and p["re"]:
+            if abs(p["re"] - re_name) > RE_TOLERANCE * re_name:
+                errors.append(f"header Re {p['re']:.0f} != file name Re {re_name:.0f}")
+
+    row["Status"] = "bad" if errors else ("warning" if warnings else "ok")
+    row["Issues"] = "; ".join(errors + warnings)
+    return row
+
+
+def check_corpus(
+    polars_dir=None,
+    profiles=None,
+    re_filter=None,
+    workers=None,
+    max_gap=MAX_ALPHA_GAP,
+    quarantine=True,
+):
+    """
+    Check all selected polar files in parallel.
+
+    Parameters:
+    -----------
+    polars_dir : str
+        Directory containing polar files
+    profiles : list
+        List of profile name filters
+    re_filter : str
+        Reynolds number filter
+    workers : int, optional
+        Number of worker processes (default: CPU count)
+    max_gap : float
+        Alpha gaps wider than this (deg) are reported
+    quarantine : bool
+        Write the files with status 'bad' to the quarantine list, which the
+        loaders skip until the files change
+
+    Returns:
+    --------
+    pd.DataFrame
+        One report row per file (see check_polar_file)
+    """
+    files = select_polar_files(polars_dir, profiles, re_filter, skip_quarantined=False)
+    if not files:
+        raise RuntimeError("No polar files matched selection")
+
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(files) > 1:
+        chunksize = max(1, len(files) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            rows = list(
+                pool.map(
+                    check_polar_file,
+                    files,
+                    [max_gap] * len(files),
+                    chunksize=chunksize,
+                )
+            )
+    else:
+        rows = [check_polar_file(f, max_gap) for f in files]
+
+    report = pd.DataFrame(
+        rows, columns=["File", "Profile", "Points", "Status", "Issues"]
+    )
+    if quarantine and not Path(polars_dir or "").is_file():
+        write_quarantine(report, files, polars_dir)
+    return report
+
+
+def write_quarantine(report, files, polars_dir=None):
+    """
+    Update the quarantine list with the 'bad' files of a check report.
+
+    Entries of the checked files are replaced; entries of files outside
+    this check are kept. Returns the path of the quarantine file.
+    """
+    path = cache_dir(polars_dir) / QUARANTINE_FILE
+    quarantine = {}
+    if path.exists():
+        quarantine = json.loads(path.read_text(encoding="utf-8"))
+
+    by_name = {Path(f).name: Path(f) for f in files}
+    for name in by_name:
+        quarantine.pop(name, None)
+    for _, row in report[report["Status"] == "bad"].iterrows():
+        st = by_name[row["File"]].stat()
+        quarantine[row["File"]] = {
+            "mtime_ns": st.st_mtime_ns,
+            "size": st.st_size,
+            "issues": row["Issues"],
+        }
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        json.dumps(quarantine, indent=2, ensure_ascii=False), encoding="utf-8"
+    )
+    return path
@@ -0,0 +1,418 @@
+"""Clustering of profiles by polar behaviour: k-means / Ward, medoids and PCA."""
+
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from polar_tensor import build_polar_tensor, coefficient
+from similarity import load_embeddings
+
+CLUSTER_METHODS = ["kmeans", "hierarchical"]
+
+# Limits metrics computed on the resampled polars, one feature per Re each
+CLUSTER_METRICS = [
+    "Cl_alpha (rad⁻¹)",
+    "Cm_0",
+    "Cd_min",
+    "Cl_i",
+    "Cl_max",
+    "α @ Cl_max (deg)",
+    "Cl/Cd_max",
+]
+# Features valid for less than this fraction of the profiles are dropped,
+# and profiles with less than this fraction of valid features are skipped
+MIN_COVERAGE = 0.5
+# Random restarts of k-means (the lowest inertia wins)
+KMEANS_RUNS = 10
+
+
+def _take(values, idx):
+    """values[..., idx] along the last axis; NaN where idx is -1."""
+    safe = np.where(idx >= 0, idx, 0)
+    out = np.take_along_axis(values, safe[..., None], axis=-1)[..., 0]
+    return np.where(idx >= 0, out, np.nan)
+
+
+def _nanarg(values, largest=True):
+    valid = ~np.isnan(values)
+    fill = -np.inf if largest else np.inf
+    pick = np.argmax if largest else np.argmin
+    idx = pick(np.where(valid, values, fill), axis=-1)
+    return np.where(valid.any(axis=-1), idx, -1)
+
+
+def tensor_metrics(tensor):
+    """
+    Limits metrics of every polar of a tensor, vectorized over the grid.
+
+    Returns an array (profiles, re, len(CLUSTER_METRICS)); the values are
+    read on the common alpha grid, so they can differ slightly from
+    extract_limits on the raw points.
+    """
+    alpha = tensor["alpha"]
+    cl = coefficient(tensor, "CL")
+    cd = coefficient(tensor, "CD")
+    cm = coefficient(tensor, "Cm")
+    ld = coefficient(tensor, "Cl_Cd")
+
+    # Lift slope: least squares over -2..5 deg, masked per polar
+    x = np.deg2rad(alpha)
+    w = ((alpha >= -2) & (alpha <= 5)) & ~np.isnan(cl)
+    y = np.where(w, cl, 0.0)
+    n, sx, sy = w.sum(-1), (w * x).sum(-1), y.sum(-1)
+    sxx, sxy = (w * x**2).sum(-1), (y * x).sum(-1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        slope = np.where(n >= 2, (n * sxy - sx * sy) / (n * sxx - sx**2), np.nan)
+
+    i_cd = _nanarg(cd, largest=False)
+    i_cl = _nanarg(cl)
+    i_0 = np.full(cl.shape[:-1], int(np.abs(alpha).argmin()))
+    return np.stack(
+        [
+            slope,
+            _take(cm, i_0),
+            _take(cd, i_cd),
+            _take(cl, i_cd),
+            _take(cl, i_cl),
+            np.where(i_cl >= 0, alpha[np.maximum(i_cl, 0)], np.nan),
+            _take(ld, _nanarg(ld)),
+        ],
+        axis=-1,
+    )
+
+
+def cluster_features(tensor, embeddings, re_sel):
+    """
+    Standardized feature matrix of the profiles (one row per profile).
+
+    Two blocks are concatenated: the polar curves (the similarity
+    embeddings: Cl and Cm over alpha, Cd over Cl) and the limits metrics
+    (see tensor_metrics), both at the selected Reynolds numbers. Every
+    column is z-scored over the profiles, missing values are set to the
+    mean, and each block is scaled so both contribute the same total
+    variance. Returns (features, coverage), coverage being the fraction of
+    valid values of each profile.
+    """
+    n_p = len(tensor["profiles"])
+    blocks, valid = [], []
+    for raw in (
+        embeddings[:, re_sel].reshape(n_p, -1),
+        tensor_metrics(tensor)[:, re_sel].reshape(n_p, -1),
+    ):
+        raw = raw[:, ~np.isnan(raw).all(axis=0)]
+        dense = np.isnan(raw).mean(axis=0) <= 1 - MIN_COVERAGE
+        raw = raw[:, dense]
+        with np.errstate(invalid="ignore"):
+            mean, std = np.nanmean(raw, axis=0), np.nanstd(raw, axis=0)
+        raw, mean, std = raw[:, std > 0], mean[std > 0], std[std > 0]
+        valid.append(~np.isnan(raw))
+        z = np.nan_to_num((raw - mean) / std, nan=0.0)
+        blocks.append(z / np.sqrt(max(z.shape[1], 1)))
+    coverage = np.concatenate(valid, axis=1).mean(axis=1)
+    return np.concatenate(blocks, axis=1), coverage
+
+
+def _sq_distances(x, c):
+    d2 = (x**2).sum(1)[:, None] - 2 * x @ c.T + (c**2).sum(1)[None, :]
+    return np.maximum(d2, 0.0)
+
+
+def kmeans(x, k, seed=0, runs=KMEANS_RUNS, max_iter=100):
+    """
+    k-means (Lloyd) with k-means++ seeding, best of ``runs`` restarts.
+
+    Returns (labels, centers, inertia).
+    """
+    rng = np.random.default_rng(seed)
+    n = len(x)
+    best = None
+    for _ in range(runs):
+        # k-means++: each new center drawn with probability ∝ squared distance
+        centers = [x[rng.integers(n)]]
+        d2 = _sq_distances(x, np.array(centers))[:, 0]
+        for _ in range(1, k):
+            total = d2.sum()
+            i = rng.choice(n, p=d2 / total) if total > 0 else rng.integers(n)
+            centers.append(x[i])
+            d2 = np.minimum(d2, _sq_distances(x, x[i : i + 1])[:, 0])
+        centers = np.array(centers)
+
+        labels = None
+        for _ in range(max_iter):
+            d2 = _sq_distances(x, centers)
+            new = d2.argmin(axis=1)
+            if labels is not None and np.array_equal(new, labels):
+                break
+            labels = new
+            onehot = np.eye(k)[labels]
+            counts = onehot.sum(axis=0)
+            empty = counts == 0
+            centers = (onehot.T @ x) / np.maximum(counts, 1)[:, None]
+            if empty.any():
+                # Restart empty clusters on the points farthest from their center
+                far = np.argsort(d2[np.arange(n), labels])[::-1][: empty.sum()]
+                centers[empty] = x[far]
+        inertia = _sq_distances(x, centers)[np.arange(n), labels].sum()
+        if best is None or inertia < best[2]:
+            best = (labels, centers, inertia)
+    return best
+
+
+def ward(x, k):
+    """
+    Agglomerative clustering with Ward linkage, cut at ``k`` clusters.
+
+    The squared-distance matrix is updated with the Lance-Williams formula
+    after each merge (one vectorized row update). Returns the labels.
+    """
+    n = len(x)
+    d = _sq_distances(x, x)
+    np.fill_diagonal(d, np.inf)
+    size = np.ones(n)
+    members = {i: [i] for i in range(n)}
+    active = np.ones(n, dtype=bool)
+    for _ in range(n - k):
+        flat = int(np.argmin(d))
+        i, j = divmod(flat, n)
+        ni, nj = size[i], size[j]
+        nk = size
+        row = ((ni + nk) * d[i] + (nj + nk) * d[j] - nk * d[i, j]) / (ni + nj + nk)
+        row[~active] = np.inf
+        row[i] = np.inf
+        d[i, :], d[:, i] = row, row
+        d[j, :], d[:, j] = np.inf, np.inf
+        active[j] = False
+        size[i] += nj
+        members[i] += members.pop(j)
+    labels = np.empty(n, dtype=int)
+    for c, idx in enumerate(members.values()):
+        labels[idx] = c
+    return labels
+
+
+def silhouette(dist, labels):
+    """Mean silhouette coefficient from a distance matrix (0 for singletons)."""
+    k = labels.max() + 1
+    onehot = np.eye(k)[labels]
+    counts = onehot.sum(axis=0)
+    sums = dist @ onehot
+    n = np.arange(len(labels))
+    own = counts[labels] - 1
+    with np.errstate(invalid="ignore", divide="ignore"):
+        a = sums[n, labels] / own
+        mean_other = sums / counts
+    mean_other[n, labels] = np.inf
+    b = mean_other.min(axis=1)
+    s = np.where(own > 0, (b - a) / np.maximum(a, b), 0.0)
+    return float(np.nanmean(s))
+
+
+def cluster_profiles(
+    polars_dir=None,
+    profiles=None,
+    re_min=None,
+    re_max=None,
+    n_clusters=6,
+    method="kmeans",
+    seed=0,
+):
+    """
+    Group profiles with similar polars and pick a representative of each group.
+
+    Parameters:
+    -----------
+    polars_dir : str
+        Directory containing polar files
+    profiles : list
+        Profile name substrings to cluster (all profiles by default)
+    re_min, re_max : float, optional
+        Reynolds range of the features (all shipped Re by default)
+    n_clusters : int
+        Number of clusters
+    method : str
+        'kmeans' (k-means++ with KMEANS_RUNS restarts) or 'hierarchical'
+        (agglomerative, Ward linkage)
+    seed : int
+        Random seed of k-means
+
+    Returns:
+    --------
+    dict
+        'assignments': DataFrame with Profile, Cluster (1 = largest),
+        Medoid (True for the representative), Distance (to the medoid, in
+        standardized units), PC1 and PC2 (2-D projection);
+        'summary': one row per cluster with Size, Medoid and the mean
+        Cl/Cd_max, Cl_max, Cd_min and Cm_0 of its profiles;
+        'silhouette', 'explained' (variance fraction of PC1 and PC2),
+        'method' and 'n_clusters'
+    """
+    if method not in CLUSTER_METHODS:
+        raise ValueError(
+            f"Unknown method '{method}'. Use: {', '.join(CLUSTER_METHODS)}"
+        )
+    tensor = build_polar_tensor(polars_dir)
+    names, re_values, emb = load_embeddings(polars_dir)
+    if list(names) != list(tensor["profiles"]):
+        raise RuntimeError("Embeddings and polar tensor are out of date; rerun")
+
+    re_sel = np.ones(len(re_values), dtype=bool)
+    if re_min is not None:
+        re_sel &= re_values >= re_min
+    if re_max is not None:
+        re_sel &= re_values <= re_max
+    if not re_sel.any():
+        raise RuntimeError("No shipped Reynolds number in the requested range")
+
+    if n_clusters < 2:
+        raise ValueError("The number of clusters must be at least 2")
+
+    x, coverage = cluster_features(tensor, emb, re_sel)
+    selected = np.ones(len(names), dtype=bool)
+    if profiles:
+        selected = np.array([any(p in n for p in profiles) for n in names])
+    for i in np.flatnonzero(selected & (coverage < MIN_COVERAGE)):
+        print(f"WARNING: Skipping '{names[i]}' - too few polar points in the Re range")
+    idx = np.flatnonzero(selected & (coverage >= MIN_COVERAGE))
+    if len(idx) < n_clusters:
+        raise RuntimeError(
+            f"{len(idx)} profiles selected; need at least {n_clusters} "
+            "(lower --clusters)"
+        )
+    x = x[idx]
+    sel_names = [names[i] for i in idx]
+
+    if method == "kmeans":
+        labels = kmeans(x, n_clusters, seed=seed)[0]
+    else:
+        labels = ward(x, n_clusters)
+    # Number clusters by size (1 = largest), ties by first member
+    sizes = np.bincount(labels, minlength=n_clusters)
+    first = np.array([np.flatnonzero(labels == c)[0] for c in range(n_clusters)])
+    order = np.lexsort((first, -sizes))
+    labels = np.argsort(order)[labels]
+
+    dist = np.sqrt(_sq_distances(x, x))
+    np.fill_diagonal(dist, 0.0)
+    medoids = np.empty(n_clusters, dtype=int)
+    for c in range(n_clusters):
+        m = np.flatnonzero(labels == c)
+        medoids[c] = m[dist[np.ix_(m, m)].sum(axis=1).argmin()]
+
+    xc = x - x.mean(axis=0)
+    u, s, _ = np.linalg.svd(xc, full_matrices=False)
+    pcs = u[:, :2] * s[:2]
+    explained = s[:2] ** 2 / (s**2).sum()
+
+    assignments = pd.DataFrame(
+        {
+            "Profile": sel_names,
+            "Cluster": labels + 1,
+            "Medoid": np.isin(np.arange(len(idx)), medoids),
+            "Distance": dist[np.arange(len(idx)), medoids[labels]],
+            "PC1": pcs[:, 0],
+            "PC2": pcs[:, 1],
+        }
+    )
+    assignments = assignments.sort_values(
+        ["Cluster", "Distance"], kind="stable"
+    ).reset_index(drop=True)
+
+    with warnings.catch_warnings():
+        # Mean over Re of metrics missing at every selected Re is NaN
+        warnings.simplefilter("ignore", RuntimeWarning)
+        metrics = np.nanmean(tensor_metrics(tensor)[idx][:, re_sel], axis=1)
+    summary = pd.DataFrame(metrics, columns=CLUSTER_METRICS)
+    summary.insert(0, "Cluster", labels + 1)
+    summary = summary.groupby("Cluster")[
+        ["Cl/Cd_max", "Cl_max", "Cd_min", "Cm_0"]
+    ].mean()
+    summary.insert(0, "Size", np.bincount(labels, minlength=n_clusters))
+    summary.insert(1, "Medoid", [sel_names[i] for i in medoids])
+    summary = summary.reset_index()
+
+    return {
+        "assignments": assignments,
+        "summary": summary,
+        "silhouette": silhouette(dist, labels),
+        "explained": explained,
+        "method": method,
+        "n_clusters": n_clusters,
+    }
+
+
+def plot_clusters(result, out_path=None, figsize=(14, 10)):
+    """
+    Scatter the profiles on the first two principal components.
+
+    Points are coloured by cluster; medoids are drawn as stars and labelled.
+    All profiles are labelled when there are at most 40.
+    """
+    import matplotlib.pyplot as plt
+
+    from plot_polars import profile_colors
+
+    df = result["assignments"]
+    k = result["n_clusters"]
+    # tab10 keeps neighbouring clusters apart; the longer palette beyond 10
+    colors = (
+        [plt.get_cmap("tab10")(i) for i in range(k)] if k <= 10 else profile_colors(k)
+    )
+    fig, ax = plt.subplots(figsize=figsize)
+    for c in range(1, result["n_clusters"] + 1):
+        part = df[df["Cluster"] == c]
+        medoid = part[part["Medoid"]]
+        ax.scatter(
+            part["PC1"],
+            part["PC2"],
+            s=60,
+            color=colors[c - 1],
+            alpha=0.8,
+            label=f"{c}: {medoid['Profile'].iloc[0]} ({len(part)})",
+        )
+        ax.scatter(
+            medoid["PC1"],
+            medoid["PC2"],
+            s=400,
+            marker="*",
+            color=colors[c - 1],
+            edgecolor="black",
+            linewidth=1.2,
+            zorder=3,
+        )
+    label_all = len(df) <= 40
+    for _, row in df.iterrows():
+        if row["Medoid"] or label_all:
+            ax.annotate(
+                row["Profile"],
+                (row["PC1"], row["PC2"]),
+                xytext=(6, 4),
+                textcoords="offset points",
+                fontsize=11 if row["Medoid"] else 8,
+                fontweight="bold" if row["Medoid"] else "normal",
+            )
+
+    ev = result["explained"]
+    method = "k-means" if result["method"] == "kmeans" else "jerárquico (Ward)"
+    ax.set_xlabel(f"PC1 ({100 * ev[0]:.0f} %)", fontsize=18)
+    ax.set_ylabel(f"PC2 ({100 * ev[1]:.0f} %)", fontsize=18)
+    ax.tick_params(axis="both", labelsize=14)
+    ax.grid(True, alpha=0.3)
+    ax.set_title(
+        f"Agrupamiento de {len(df)} perfiles: {method}, "
+        f"k = {result['n_clusters']} (silueta {result['silhouette']:.2f})",
+        fontsize=20,
+        pad=15,
+    )
+    ax.legend(
+        title="Grupo: medoide (perfiles)",
+        loc="center left",
+        bbox_to_anchor=(1.01, 0.5),
+        fontsize=11,
+    )
+    fig.tight_layout()
+    if out_path:
+        fig.savefig(out_path, dpi=300, bbox_inches="tight")
+        print("Saved figure to", out_path)
+    else:
+        plt.show()
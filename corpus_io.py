@@ -0,0 +1,263 @@
+"""Columnar (Parquet / Feather / Arrow IPC) export and import of polar data."""
+
+import json
+import math
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from polars_reader import parse_polar_file, select_polar_files
+
+TABLE_FORMATS = ("csv", "parquet", "feather", "arrow", "ndjson")
+
+# Columns stored for every polar point in a corpus export
+CORPUS_COLUMNS = [
+    "File",
+    "Profile",
+    "Re",
+    "Mach",
+    "Ncrit",
+    "alpha",
+    "CL",
+    "CD",
+    "CDp",
+    "Cm",
+    "Cl_Cd",
+]
+_POINT_COLUMNS = CORPUS_COLUMNS[5:]
+
+# Loaded corpora, keyed by path -> (mtime_ns, size, point arrays, member index)
+_CORPUS_CACHE = {}
+
+
+def _require_pyarrow(fmt):
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise ImportError(
+            f"pyarrow is required for the '{fmt}' format (pip install pyarrow)"
+        ) from None
+
+
+def table_format(path, fmt=None):
+    """Resolve the table format from an explicit name or the file suffix."""
+    fmt = (fmt or Path(path).suffix.lstrip(".")).lower()
+    if fmt == "ipc":
+        fmt = "arrow"
+    elif fmt == "jsonl":
+        fmt = "ndjson"
+    if fmt not in TABLE_FORMATS:
+        raise ValueError(
+            f"Unknown table format '{fmt}'. Use: {', '.join(TABLE_FORMATS)}"
+        )
+    return fmt
+
+
+def _json_value(v):
+    if isinstance(v, float) and not math.isfinite(v):
+        return None
+    if isinstance(v, np.generic):
+        return _json_value(v.item())
+    return v
+
+
+def ndjson_line(record):
+    """One compact JSON line for a record (NaN and inf written as null)."""
+    return json.dumps(
+        {k: _json_value(v) for k, v in record.items()},
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+
+
+def write_ndjson(records, out, flush=True):
+    """
+    Write records as newline-delimited JSON, one line per record.
+
+    ``records`` may be a generator: each line is written as soon as its
+    record is produced, so memory stays constant. ``out`` is a path or an
+    open text stream; a stream is flushed after every line (unless
+    ``flush`` is False) so readers of a pipe see the first lines at once.
+    Returns the number of records written.
+    """
+    if isinstance(out, (str, Path)):
+        with open(out, "w", encoding="utf-8", newline="\n") as f:
+            return write_ndjson(records, f, flush=False)
+    n = 0
+    for record in records:
+        out.write(ndjson_line(record) + "\n")
+        if flush:
+            out.flush()
+        n += 1
+    return n
+
+
+def write_table(df, path, fmt=None):
+    """
+    Write a DataFrame as CSV, Parquet, Feather, Arrow IPC or NDJSON.
+
+    Feather and Arrow files are written uncompressed so they can be
+    memory-mapped without copying when read back.
+    """
+    fmt = table_format(path, fmt)
+    if fmt == "csv":
+        df.to_csv(path, index=False, encoding="utf-8-sig")
+        return
+    if fmt == "ndjson":
+        write_ndjson(df.to_dict("records"), path)
+        return
+    _require_pyarrow(fmt)
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        pq.write_table(table, path)
+    elif fmt == "feather":
+        import pyarrow.feather as feather
+
+        feather.write_feather(table, path, compression="uncompressed")
+    else:
+        with pa.OSFile(str(path), "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+
+
+def read_arrow_table(path, fmt=None):
+    """Read a Parquet/Feather/Arrow file as a pyarrow Table (memory-mapped)."""
+    fmt = table_format(path, fmt)
+    _require_pyarrow(fmt)
+    import pyarrow as pa
+
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        return pq.read_table(path, memory_map=True)
+    if fmt in ("csv", "ndjson"):
+        return pa.Table.from_pandas(read_table(path, fmt), preserve_index=False)
+    # Feather v2 is the Arrow IPC file format: map it and read zero-copy
+    source = pa.memory_map(str(path), "r")
+    return pa.ipc.open_file(source).read_all()
+
+
+def read_table(path, fmt=None):
+    """Read a table written by write_table back into a DataFrame."""
+    fmt = table_format(path, fmt)
+    if fmt == "csv":
+        return pd.read_csv(path, encoding="utf-8-sig", float_precision="round_trip")
+    if fmt == "ndjson":
+        return pd.read_json(
+            path, lines=True, dtype=False, convert_dates=False, precise_float=True
+        )
+    return read_arrow_table(path, fmt).to_pandas()
+
+
+def corpus_table(polars_dir=None, profiles=None, re_filter=None):
+    """
+    Build the long table of all points of all selected polars.
+
+    One row per (polar file, alpha) with the profile name, Reynolds, Mach
+    and Ncrit of the polar. Empty polars are skipped with a warning.
+    """
+    files = select_polar_files(polars_dir, profiles, re_filter)
+    if not files:
+        raise RuntimeError("No polar files matched selection")
+
+    frames = []
+    for f in files:
+        p = parse_polar_file(f)
+        df = p["df"]
+        if df is None or df.empty:
+            print(
+                f"WARNING: Skipping '{p['name']}' - no polar data available (empty file)"
+            )
+            continue
+        df = df.copy()
+        df.insert(0, "Ncrit", p.get("ncrit"))
+        df.insert(0, "Mach", p.get("mach"))
+        df.insert(0, "Re", p["re"])
+        df.insert(0, "Profile", p["name"])
+        df.insert(0, "File", Path(f).name)
+        frames.append(df)
+
+    corpus = pd.concat(frames, ignore_index=True)[CORPUS_COLUMNS]
+    for col in ("Re", "Mach", "Ncrit"):
+        corpus[col] = corpus[col].astype(float)
+    # Repeated strings compress to dictionary-encoded Arrow columns
+    corpus["File"] = corpus["File"].astype("category")
+    corpus["Profile"] = corpus["Profile"].astype("category")
+    return corpus
+
+
+def export_corpus(path, polars_dir=None, profiles=None, re_filter=None, fmt=None):
+    """Write the full corpus long table to ``path``; returns the row count."""
+    corpus = corpus_table(polars_dir, profiles, re_filter)
+    write_table(corpus, path, fmt)
+    return len(corpus)
+
+
+def _load_corpus(path):
+    """Return (point arrays, {file name: member info}) for a corpus file."""
+    path = Path(path)
+    st = path.stat()
+    cached = _CORPUS_CACHE.get(path)
+    if cached and cached[:2] == (st.st_mtime_ns, st.st_size):
+        return cached[2], cached[3]
+
+    table = read_arrow_table(path)
+    missing = [c for c in CORPUS_COLUMNS if c not in table.column_names]
+    if missing:
+        raise ValueError(
+            f"'{path}' is not a polar corpus export (missing: {', '.join(missing)})"
+        )
+    # Float columns of a memory-mapped single-chunk table convert to NumPy
+    # without copying; per-member frames are then just views of them
+    arrays = {
+        c: table.column(c).combine_chunks().to_numpy(zero_copy_only=False)
+        for c in _POINT_COLUMNS
+    }
+    # Rows of one polar are contiguous: index each member by its row range
+    files = table.column("File").to_pandas().astype(str).to_numpy()
+    profiles = table.column("Profile").to_pandas().astype(str).to_numpy()
+    meta = {c: table.column(c).to_numpy() for c in ("Re", "Mach", "Ncrit")}
+    starts = np.flatnonzero(np.r_[True, files[1:] != files[:-1]])
+    ends = np.r_[starts[1:], len(files)]
+    index = {
+        files[s]: (
+            int(s),
+            int(e),
+            profiles[s],
+            float(meta["Re"][s]),
+            float(meta["Mach"][s]),
+            float(meta["Ncrit"][s]),
+        )
+        for s, e in zip(starts, ends)
+    }
+
+    _CORPUS_CACHE[path] = (st.st_mtime_ns, st.st_size, arrays, index)
+    return arrays, index
+
+
+def list_members(path):
+    """List the original polar file names stored in a corpus file."""
+    _, index = _load_corpus(path)
+    return sorted(index)
+
+
+def read_member(path, name):
+    """Return one polar of a corpus file in the parse_polar_file format."""
+    arrays, index = _load_corpus(path)
+    if name not in index:
+        raise FileNotFoundError(f"'{name}' not found in corpus '{path}'")
+    start, end, profile, re_val, mach, ncrit = index[name]
+    df = pd.DataFrame({c: arrays[c][start:end] for c in _POINT_COLUMNS})
+    return {
+        "path": Path(path) / name,
+        "name": profile,
+        "re": re_val,
+        "mach": mach,
+        "ncrit": ncrit,
+        "df": df,
+    }
@@ -0,0 +1,141 @@
+"""Compare two polar directories: pair files, skip identical ones, report deltas."""
+
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from extract_limits import compute_limits
+from polars_reader import content_hash, parse_polar_file, select_polar_files
+
+_re_key = re.compile(r"^(.*?)_T\d+_Re([0-9.]+)")
+
+# Limits metrics reported as deltas (second directory minus first)
+DIFF_METRICS = [
+    "Cl_alpha (rad⁻¹)",
+    "Cm_0",
+    "Cd_min",
+    "Cl_i",
+    "Cl/Cd @ Cl_i",
+    "Cl_max",
+    "α @ Cl_max (deg)",
+    "Cl/Cd_max",
+    "α @ Cl/Cd_max (deg)",
+]
+
+
+def polar_key(path):
+    """
+    Pairing key (profile, Re) of a polar file name.
+
+    Settings encoded after the Reynolds number (Mach, Ncrit) are ignored, so
+    'X_T1_Re0.100_M0.00_N9.0.txt' and 'X_T1_Re0.100_M0.00_N5.0.txt' pair.
+    """
+    name = Path(path).name
+    m = _re_key.match(name)
+    if m:
+        return m.group(1), m.group(2)
+    return Path(path).stem, None
+
+
+def compare_polars(path_a, path_b):
+    """
+    Compare two polars of the same profile and Re.
+
+    Returns a dict with the limits deltas (b - a), the number of common
+    alphas and the maximum |delta| of CL, CD and Cm on those alphas.
+    """
+    pa, pb = parse_polar_file(path_a), parse_polar_file(path_b)
+    row = {"Profile": pa["name"]}
+    da, db = pa["df"], pb["df"]
+    if da is None or da.empty or db is None or db.empty:
+        row["Status"] = "empty"
+        return row
+
+    la, lb = compute_limits(da, pa["name"]), compute_limits(db, pb["name"])
+    for m in DIFF_METRICS:
+        row[f"Δ {m}"] = lb[m] - la[m]
+
+    # Align on the alphas computed in both runs
+    ka = np.round(da["alpha"].to_numpy(), 3)
+    kb = np.round(db["alpha"].to_numpy(), 3)
+    common, ia, ib = np.intersect1d(ka, kb, assume_unique=False, return_indices=True)
+    row["Common alphas"] = len(common)
+    for c in ("CL", "CD", "Cm"):
+        if len(common):
+            dev = np.abs(db[c].to_numpy()[ib] - da[c].to_numpy()[ia])
+            row[f"max |Δ {c}|"] = float(np.nanmax(dev))
+        else:
+            row[f"max |Δ {c}|"] = np.nan
+    row["Status"] = "changed"
+    return row
+
+
+def _compare_pair(pair):
+    return compare_polars(*pair)
+
+
+def diff_directories(
+    dir_a,
+    dir_b,
+    profiles=None,
+    re_filter=None,
+    workers=None,
+):
+    """
+    Compare the polars of two directories.
+
+    All files are compared, including those quarantined by 'check'. Files
+    are paired by profile and Re (see polar_key); identical files are
+    detected by content hash and skipped; changed pairs are parsed and
+    compared in parallel.
+
+    Returns:
+    --------
+    pd.DataFrame
+        One row per pair with 'Status' ('identical', 'changed', 'empty',
+        'only in first' or 'only in second') and, for changed pairs, the
+        limits deltas and maximum curve deviations.
+    """
+    # Compare what is on disk: files quarantined by 'check' are included
+    files_a = {
+        polar_key(f): f
+        for f in select_polar_files(dir_a, profiles, re_filter, skip_quarantined=False)
+    }
+    files_b = {
+        polar_key(f): f
+        for f in select_polar_files(dir_b, profiles, re_filter, skip_quarantined=False)
+    }
+    if not files_a and not files_b:
+        raise RuntimeError("No polar files matched selection")
+
+    rows = {}
+    changed = []
+    for key in sorted(set(files_a) | set(files_b), key=lambda k: (k[0], k[1] or "")):
+        base = {"Profile": key[0], "Re": key[1]}
+        if key not in files_b:
+            rows[key] = {**base, "Status": "only in first"}
+        elif key not in files_a:
+            rows[key] = {**base, "Status": "only in second"}
+        elif content_hash(files_a[key]) == content_hash(files_b[key]):
+            rows[key] = {**base, "Status": "identical"}
+        else:
+            rows[key] = base
+            changed.append(key)
+
+    pairs = [(files_a[k], files_b[k]) for k in changed]
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(pairs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_compare_pair, pairs, chunksize=4))
+    else:
+        results = [_compare_pair(p) for p in pairs]
+    for key, res in zip(changed, results):
+        rows[key] = {**rows[key], **res}
+
+    df = pd.DataFrame(list(rows.values()))
+    first = ["Profile", "Re", "Status"]
+    return df[first + [c for c in df.columns if c not in first]]
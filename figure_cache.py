@@ -0,0 +1,178 @@
+"""Content-addressed cache of rendered figures (plot actions with an output file)."""
+
+import functools
+import hashlib
+import inspect
+import os
+import shutil
+from pathlib import Path
+
+from polars_reader import (
+    cache_dir,
+    content_hash,
+    file_signature,
+    list_polar_files,
+    select_polar_files,
+)
+
+# Cached images kept at most, least recently used removed first
+FIGURE_CACHE_BUDGET = 256 * 2**20  # bytes
+
+# Sources whose changes invalidate every cached figure: the plotting code and
+# the modules producing the plotted numbers (parsing, limits, filters, fits)
+_CODE_FILES = [
+    "plot_polars.py",
+    "plot_maps.py",
+    "html_report.py",
+    "figure_cache.py",
+    "polars_reader.py",
+    "polar_archive.py",
+    "corpus_io.py",
+    "polar_db.py",
+    "extract_limits.py",
+    "filter_profiles.py",
+    "airfoil_families.py",
+    "re_scaling.py",
+    "hermite.py",
+    "polar_tensor.py",
+]
+
+# Arguments that do not change the image (a prebuilt tensor follows from the
+# polar files and the grid arguments, which are hashed)
+_IGNORED_ARGS = {"polars_dir", "out_path", "parser", "use_cache", "tensor"}
+
+_hashes = {}  # (path, signature) -> content hash
+
+
+def _file_hash(path):
+    key = (str(path), file_signature(path))
+    h = _hashes.get(key)
+    if h is None:
+        h = _hashes[key] = content_hash(path)
+    return h
+
+
+@functools.lru_cache(maxsize=1)
+def code_version():
+    """Hash of the _CODE_FILES and the matplotlib/adjustText versions."""
+    import matplotlib
+
+    h = hashlib.sha256(matplotlib.__version__.encode())
+    try:
+        from importlib.metadata import version
+
+        h.update(version("adjustText").encode())
+    except Exception:
+        pass
+    here = Path(__file__).parent
+    for name in _CODE_FILES:
+        h.update((here / name).read_bytes())
+    return h.hexdigest()[:16]
+
+
+def figure_key(kind, arguments):
+    """
+    Key of a figure: hash of the polar contents, the arguments and the code.
+
+    Parameters:
+    -----------
+    kind : str
+        Plot function name
+    arguments : dict
+        Arguments of the plot call. The polar files are those selected by
+        polars_dir, profiles and re_filter (all files when the filter uses
+        the Reynolds-scaling fits); their contents are hashed, so touching a
+        file without changing it keeps the key.
+
+    Returns:
+    --------
+    str or None
+        Hex key, or None when no polar file matches (nothing to cache)
+    """
+    from re_scaling import needs_re_fits
+
+    polars_dir = arguments.get("polars_dir")
+    if needs_re_fits(arguments.get("filter_criteria")):
+        files = list_polar_files(polars_dir)
+    else:
+        files = select_polar_files(
+            polars_dir, arguments.get("profiles"), arguments.get("re_filter")
+        )
+    if not files:
+        return None
+
+    h = hashlib.sha256(f"{kind}\0{code_version()}".encode())
+    h.update(Path(arguments["out_path"]).suffix.lower().encode())
+    for name in sorted(arguments):
+        if name not in _IGNORED_ARGS:
+            h.update(f"\0{name}={arguments[name]!r}".encode())
+    for f in files:
+        h.update(f"\0{Path(f).name}:{_file_hash(f)}".encode())
+    return h.hexdigest()[:32]
+
+
+def figure_cache_dir(polars_dir=None):
+    """Directory of the cached figures of a polar source."""
+    return cache_dir(polars_dir) / "figures"
+
+
+def _prune(directory, budget):
+    entries = sorted(
+        (p for p in directory.iterdir() if p.is_file()),
+        key=lambda p: p.stat().st_mtime_ns,
+    )
+    total = sum(p.stat().st_size for p in entries)
+    for p in entries:
+        if total <= budget:
+            break
+        total -= p.stat().st_size
+        p.unlink()
+
+
+def cached_figure(kind):
+    """
+    Decorator serving a plot function's output file from the figure cache.
+
+    The decorated function must take ``polars_dir``, ``profiles``,
+    ``re_filter``, ``out_path`` and ``use_cache`` arguments. When an output
+    file is requested and an identical figure was rendered before (same
+    polar contents, arguments and plotting code, see figure_key), the cached
+    image is copied to ``out_path`` instead of rendering it again. Figures
+    shown on screen and calls with ``use_cache=False`` are not cached.
+    """
+
+    def decorate(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = bound.arguments
+            out_path = arguments.get("out_path")
+            if not out_path or not arguments.get("use_cache", True):
+                return func(*args, **kwargs)
+
+            key = figure_key(kind, arguments)
+            if key is None:
+                return func(*args, **kwargs)
+            directory = figure_cache_dir(arguments.get("polars_dir"))
+            cached = directory / f"{key}{Path(out_path).suffix.lower()}"
+            if cached.exists():
+                shutil.copyfile(cached, out_path)
+                os.utime(cached)  # mark as recently used
+                print(f"Saved figure to {out_path} (cached)")
+                return None
+
+            result = func(*args, **kwargs)
+            if Path(out_path).exists():
+                directory.mkdir(parents=True, exist_ok=True)
+                tmp = cached.with_suffix(cached.suffix + ".tmp")
+                shutil.copyfile(out_path, tmp)
+                os.replace(tmp, cached)
+                _prune(directory, FIGURE_CACHE_BUDGET)
+            return result
+
+        return wrapper
+
+    return decorate
@@ -25,6 +25,16 @@ COLUMN_ALIASES = {
     "alpha_cd_min": "α @ Cd_min (deg)",
     "alpha_cl_max": "α @ Cl_max (deg)",
     "alpha_cl_cd_max": "α @ Cl/Cd_max (deg)",
+    # Reynolds scaling fits over all Re of a profile (re_scaling.py)
+    "n_cd_min": "n Cd_min",  # Cd_min ∝ Re^n
+    "n_cl_max": "n Cl_max",
+    "n_cl_cd_max": "n Cl/Cd_max",
+    "r2_cd_min": "R² Cd_min",
+    "r2_cl_max": "R² Cl_max",
+    "r2_cl_cd_max": "R² Cl/Cd_max",
+    "cd_min_low_high": "Cd_min low/high Re",  # low-Re drag penalty
+    # Airfoil family (airfoil_families.py), compared with == / !=
+    "family": "Family",
 }
 
 
@@ -33,6 +43,9 @@ def filter_profiles(
     profiles=None,
     re_filter=None,
     criteria=None,
+    parser=None,
+    shard=None,
+    with_file=False,
 ):
     """
     Filter profiles based on performance criteria.
@@ -45,6 +58,10 @@ def filter_profiles(
         List of profile name filters
     re_filter : str
         Reynolds number filter
+    parser : callable, optional
+        Function used to parse each polar file (defaults to parse_polar_file)
+    shard, with_file : optional
+        Shard selection and 'Source file' column (see extract_limits)
     criteria : dict
         Dictionary with filtering criteria. Format:
         {
@@ -67,6 +84,9 @@ def filter_profiles(
         - '==': equal to
         - '!=': not equal to
 
+        Text values (e.g. ('==', 'Eppler') on 'family') compare
+        case-insensitively and accept only == and !=.
+
     Returns:
     --------
     pd.DataFrame
@@ -91,21 +111,58 @@ def filter_profiles(
         polars_dir=polars_dir,
         profiles=profiles,
         re_filter=re_filter,
+        parser=parser,
+        shard=shard,
+        with_file=with_file,
     )
 
     if df.empty:
         return df
 
-    # Apply filtering criteria
+    if criteria:
+        from re_scaling import merge_re_fits, needs_re_fits
+
+        # Criteria on Reynolds-scaling columns bring in the per-profile fits
+        if needs_re_fits(criteria):
+            df = merge_re_fits(df, polars_dir)
+
+    return apply_criteria(df, criteria)
+
+
+def resolve_column(param):
+    """Resolve a short alias (case-insensitive) to its limits table column."""
+    actual_param = COLUMN_ALIASES.get(param)
+    if actual_param is None:
+        actual_param = COLUMN_ALIASES.get(param.lower(), param)
+    return actual_param
+
+
+def apply_criteria(df, criteria):
+    """Apply filtering criteria {param: (operator, value)} to a limits table."""
     if criteria:
         for param, (operator, value) in criteria.items():
             # Try to resolve alias to actual column name (case-insensitive)
-            # First try exact match, then try lowercase match
-            actual_param = COLUMN_ALIASES.get(param)
-            if actual_param is None:
-                # Try case-insensitive match
-                param_lower = param.lower()
-                actual_param = COLUMN_ALIASES.get(param_lower, param)
+            actual_param = resolve_column(param)
+
+            if actual_param == "Family" and "Profile" in df.columns:
+                from airfoil_families import add_family_column
+
+                df = add_family_column(df)
+
+            if isinstance(value, str):
+                # Text columns: case-insensitive equality only
+                if operator not in ("==", "!="):
+                    raise ValueError(
+                        f"Operator '{operator}' needs a number; "
+                        f"'{param}' accepts only == and != with text"
+                    )
+                if actual_param not in df.columns:
+                    raise ValueError(f"Parameter '{param}' not found.")
+                equal = df[actual_param].astype(str).str.lower() == value.lower()
+                df = df[equal if operator == "==" else ~equal]
+                continue
+            if actual_param == "Family":
+                raise ValueError(f"'{param}' is compared with == or != and a name")
 
             if actual_param not in df.columns:
                 # Show available aliases and columns
@@ -0,0 +1,605 @@
+"""Self-contained interactive HTML report of polars (no external resources)."""
+
+import html
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from extract_limits import compute_limits
+from polars_reader import parse_polar_file, select_polar_files
+
+# Curves are decimated so that no dropped point deviates from the kept
+# polyline by more than this fraction of the panel's data range
+DECIMATE_TOL = 0.002
+
+# Panels of the 'polars' report: (x key, y key, x label, y label)
+POLAR_PANELS = [
+    ("a", "cl", "α (deg)", "Cl"),
+    ("a", "cm", "α (deg)", "Cm"),
+    ("cl", "cd", "Cl", "Cd"),
+    ("a", "ld", "α (deg)", "Cl/Cd"),
+]
+# Rounding of the embedded values (keeps the file small)
+DIGITS = {"a": 2, "cl": 4, "cd": 5, "cm": 4, "ld": 2, "x": 4, "y": 4}
+
+
+def _palette(n):
+    """Same qualitative colours as the PNG figures, as hex strings."""
+    from matplotlib.colors import to_hex
+
+    from plot_polars import profile_colors
+
+    return [to_hex(c) for c in profile_colors(n)]
+
+
+def decimate_mask(x, y, tol):
+    """
+    Ramer-Douglas-Peucker simplification of one curve.
+
+    ``x`` and ``y`` must already be scaled to comparable units; points whose
+    distance to the simplified polyline is below ``tol`` are dropped.
+    Returns a boolean mask of the points kept (always the end points).
+    """
+    n = len(x)
+    keep = np.zeros(n, dtype=bool)
+    if n == 0:
+        return keep
+    keep[[0, -1]] = True
+    stack = [(0, n - 1)]
+    while stack:
+        i, j = stack.pop()
+        if j <= i + 1:
+            continue
+        dx, dy = x[j] - x[i], y[j] - y[i]
+        sx, sy = x[i + 1 : j] - x[i], y[i + 1 : j] - y[i]
+        norm = np.hypot(dx, dy)
+        if norm > 0:
+            d = np.abs(dx * sy - dy * sx) / norm
+        else:
+            d = np.hypot(sx, sy)
+        d = np.nan_to_num(d, nan=np.inf)
+        k = int(np.argmax(d))
+        if d[k] > tol:
+            m = i + 1 + k
+            keep[m] = True
+            stack += [(i, m), (m, j)]
+    return keep
+
+
+def _rounded(values, key):
+    return [
+        round(float(v), DIGITS[key]) if np.isfinite(v) else None
+        for v in np.asarray(values, dtype=float)
+    ]
+
+
+def _polar_series(parsed, re_index, tol):
+    """Decimated curves of every polar, sharing one point subset per polar."""
+    curves = []
+    for p in parsed:
+        df = p["df"]
+        curves.append(
+            {
+                "a": df["alpha"].to_numpy(dtype=float),
+                "cl": df["CL"].to_numpy(dtype=float),
+                "cd": df["CD"].to_numpy(dtype=float),
+                "cm": df["Cm"].to_numpy(dtype=float),
+                "ld": df["Cl_Cd"].to_numpy(dtype=float),
+            }
+        )
+
+    # Tolerance relative to the range of each quantity over the report
+    span = {}
+    for key in DIGITS:
+        if key in curves[0]:
+            allv = np.concatenate([c[key] for c in curves])
+            lo, hi = np.nanmin(allv), np.nanmax(allv)
+            span[key] = hi - lo if hi > lo else 1.0
+
+    series = []
+    for p, c in zip(parsed, curves):
+        keep = np.zeros(len(c["a"]), dtype=bool)
+        for xk, yk, _, _ in POLAR_PANELS:
+            keep |= decimate_mask(c[xk] / span[xk], c[yk] / span[yk], tol)
+        s = {"p": p["profile_index"], "r": re_index[p["re_key"]]}
+        for key in ("a", "cl", "cd", "cm"):
+            s[key] = _rounded(c[key][keep], key)
+        series.append(s)
+    return series
+
+
+def _re_key(p):
+    return round(p["re"]) if p["re"] is not None else None
+
+
+def write_html_report(
+    out_path,
+    polars_dir=None,
+    profiles=None,
+    re_filter=None,
+    kind="polars",
+    filter_criteria=None,
+    filter_display=None,
+    parser=None,
+    tol=DECIMATE_TOL,
+):
+    """
+    Write a single offline HTML file with interactive polar plots.
+
+    Parameters:
+    -----------
+    out_path : str
+        Output .html file
+    polars_dir : str
+        Directory containing polar files
+    profiles : list
+        List of profile name filters
+    re_filter : str
+        Reynolds number filter
+    kind : str
+        'polars' for the four polar panels (as plot_polars) or 'clmax' for
+        Cl_max vs Cl_i (as plot_clmax_vs_clideal)
+    filter_criteria : dict
+        Filter criteria dict {param: (operator, value)}
+    filter_display : dict
+        Original filter criteria for display
+    parser : callable, optional
+        Function used to parse each polar file (defaults to parse_polar_file)
+    tol : float
+        Decimation tolerance as a fraction of each quantity's range
+
+    The page embeds the decimated data as JSON and a small canvas renderer:
+    profiles can be toggled (click, double-click for solo, search box),
+    the Reynolds number selected, curves hovered for values, and panels
+    zoomed by dragging a box or with the mouse wheel (double-click resets).
+    """
+    parser = parser or parse_polar_file
+
+    if kind == "polars" and filter_criteria:
+        from filter_profiles import filter_profiles
+
+        filtered_df = filter_profiles(
+            polars_dir, profiles, re_filter, filter_criteria, parser=parser
+        )
+        if filtered_df.empty:
+            raise RuntimeError("No profiles match the filter criteria")
+        profiles = filtered_df["Profile"].tolist()
+
+    files = select_polar_files(polars_dir, profiles, re_filter)
+    if not files:
+        raise RuntimeError("No polar files matched selection")
+
+    parsed = []
+    for f in files:
+        p = parser(f)
+        if p["df"] is None or p["df"].empty:
+            print(
+                f"WARNING: Skipping '{p['name']}' - no polar data available (empty file)"
+            )
+            continue
+        parsed.append(dict(p, re_key=_re_key(p)))
+
+    if kind == "clmax":
+        rows = [
+            dict(compute_limits(p["df"], p["name"]), _i=i) for i, p in enumerate(parsed)
+        ]
+        limits = pd.DataFrame(rows)
+        if filter_criteria:
+            from filter_profiles import apply_criteria
+
+            limits = apply_criteria(limits, filter_criteria)
+        parsed = [parsed[i] for i in limits["_i"]]
+    if not parsed:
+        raise RuntimeError("No profiles to plot")
+
+    names = sorted({p["name"] for p in parsed})
+    p_index = {n: i for i, n in enumerate(names)}
+    re_values = sorted({p["re_key"] for p in parsed if p["re_key"] is not None})
+    re_index = {r: i for i, r in enumerate(re_values)}
+    re_index[None] = -1
+    for p in parsed:
+        p["profile_index"] = p_index[p["name"]]
+
+    if kind == "clmax":
+        panels = [
+            {
+                "x": "x",
+                "y": "y",
+                "xl": "Cl_i (Cl @ Cd_min)",
+                "yl": "Cl_max",
+                "scatter": True,
+            }
+        ]
+        series = []
+        for p, (_, row) in zip(parsed, limits.iterrows()):
+            series.append(
+                {
+                    "p": p["profile_index"],
+                    "r": re_index[p["re_key"]],
+                    "x": _rounded([row["Cl_i"]], "x"),
+                    "y": _rounded([row["Cl_max"]], "y"),
+                }
+            )
+    elif kind == "polars":
+        panels = [{"x": x, "y": y, "xl": xl, "yl": yl} for x, y, xl, yl in POLAR_PANELS]
+        series = _polar_series(parsed, re_index, tol)
+    else:
+        raise ValueError(f"Unknown report kind '{kind}'")
+
+    title = f"Simulaciones de {len(names)} perfiles"
+    if len(re_values) == 1 and re_values[0] is not None:
+        title += " a Re = " + f"{re_values[0]:,}".replace(",", " ")
+    subtitle = ""
+    if filter_display:
+        parts = []
+        for param, (op, value) in filter_display.items():
+            if op == "between":
+                parts.append(f"{value[0]} ≤ {param} ≤ {value[1]}")
+            else:
+                parts.append(f"{param} {op} {value}")
+        subtitle = "Filtros: " + "  |  ".join(parts)
+
+    payload = {
+        "title": title,
+        "subtitle": subtitle,
+        "panels": panels,
+        "profiles": names,
+        "colors": _palette(len(names)),
+        "re": re_values,
+        "series": series,
+    }
+    data = json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+    page = (
+        _TEMPLATE.replace("__TITLE__", html.escape(title))
+        .replace("__STYLE__", _STYLE)
+        .replace("__SCRIPT__", _SCRIPT)
+        .replace("__DATA__", data.replace("</", "<\\/"))
+    )
+
+    out_path = Path(out_path)
+    out_path.write_text(page, encoding="utf-8")
+    print(
+        f"Saved report to {out_path} ({len(series)} polars, "
+        f"{out_path.stat().st_size / 1e6:.1f} MB)"
+    )
+    return out_path
+
+
+_TEMPLATE = """<!DOCTYPE html>
+<html lang="es">
+<head>
+<meta charset="utf-8">
+<title>__TITLE__</title>
+<style>__STYLE__</style>
+</head>
+<body>
+<aside>
+  <label>Re <select id="re"></select></label>
+  <input id="search" type="search" placeholder="Buscar perfil">
+  <div class="buttons"><button id="all">Todos</button><button id="none">Ninguno</button></div>
+  <ul id="legend"></ul>
+</aside>
+<main>
+  <h1 id="title"></h1>
+  <p id="subtitle"></p>
+  <div id="panels"></div>
+  <p class="help">Arrastrar: zoom · Rueda: zoom · Doble clic: restablecer ·
+  Clic en la leyenda: mostrar/ocultar · Doble clic en la leyenda: solo ese perfil</p>
+</main>
+<div id="tip"></div>
+<script type="application/json" id="polar-data">__DATA__</script>
+<script>__SCRIPT__</script>
+</body>
+</html>
+"""
+
+_STYLE = """
+body { margin: 0; display: flex; height: 100vh; font: 13px sans-serif; color: #222; }
+aside { width: 240px; display: flex; flex-direction: column; gap: 6px; padding: 8px;
+  border-right: 1px solid #ccc; box-sizing: border-box; }
+aside select, aside input { width: 100%; box-sizing: border-box; }
+.buttons { display: flex; gap: 4px; } .buttons button { flex: 1; }
+#legend { list-style: none; margin: 0; padding: 0; overflow-y: auto; flex: 1; }
+#legend li { cursor: pointer; padding: 1px 2px; white-space: nowrap; user-select: none; }
+#legend li.off { opacity: 0.35; } #legend li:hover { background: #eef; }
+#legend span { display: inline-block; width: 14px; height: 4px; margin: 0 6px 3px 0; }
+main { flex: 1; display: flex; flex-direction: column; min-width: 0; padding: 4px 8px; }
+h1 { font-size: 17px; font-weight: normal; margin: 4px 0; text-align: center; }
+#subtitle { margin: 0; text-align: center; color: #345; }
+#panels { flex: 1; display: grid; gap: 6px; min-height: 0; }
+#panels canvas { width: 100%; height: 100%; min-height: 0; cursor: crosshair; }
+.help { margin: 2px 0; color: #777; font-size: 11px; text-align: center; }
+#tip { position: fixed; pointer-events: none; background: rgba(255,255,255,0.95);
+  border: 1px solid #999; padding: 3px 6px; display: none; white-space: pre; }
+"""
+
+_SCRIPT = r"""
+(function () {
+  "use strict";
+  const D = JSON.parse(document.getElementById("polar-data").textContent);
+  const M = { l: 58, r: 10, t: 10, b: 36 };
+  const visible = D.profiles.map(() => true);
+  let reSel = D.re.length > 1 ? 0 : -1;
+  let active = [];
+  let hover = null;
+  D.series.forEach((s) => {
+    if (s.cl && s.cd) s.ld = s.cl.map((v, i) => (v === null || !s.cd[i] ? null : v / s.cd[i]));
+  });
+
+  document.getElementById("title").textContent = D.title;
+  document.getElementById("subtitle").textContent = D.subtitle;
+  const tip = document.getElementById("tip");
+  const fmtRe = (r) => "Re = " + Math.round(r).toLocaleString("es");
+
+  // --- Reynolds selector and legend -------------------------------------
+  const reBox = document.getElementById("re");
+  if (D.re.length > 1) reBox.add(new Option("Todos", -1));
+  D.re.forEach((r, i) => reBox.add(new Option(fmtRe(r), i)));
+  reBox.value = reSel;
+  reBox.onchange = () => { reSel = +reBox.value; update(true); };
+
+  const legend = document.getElementById("legend");
+  const items = D.profiles.map((name, p) => {
+    const li = document.createElement("li");
+    li.innerHTML = '<span style="background:' + D.colors[p] + '"></span>';
+    li.appendChild(document.createTextNode(name));
+    li.onclick = () => { visible[p] = !visible[p]; update(true); };
+    li.ondblclick = () => { visible.fill(false); visible[p] = true; update(true); };
+    li.onmouseenter = () => { hover = { p: p }; drawOverlays(); };
+    li.onmouseleave = () => { hover = null; drawOverlays(); };
+    legend.appendChild(li);
+    return li;
+  });
+  const search = document.getElementById("search");
+  search.oninput = () => {
+    const q = search.value.toLowerCase();
+    items.forEach((li, p) => { li.style.display = D.profiles[p].toLowerCase().includes(q) ? "" : "none"; });
+  };
+  const setShown = (v) => { items.forEach((li, p) => { if (li.style.display !== "none") visible[p] = v; }); update(true); };
+  document.getElementById("all").onclick = () => setShown(true);
+  document.getElementById("none").onclick = () => setShown(false);
+
+  // --- Panels -------------------------------------------------------------
+  const grid = document.getElementById("panels");
+  const cols = D.panels.length > 1 ? 2 : 1;
+  grid.style.gridTemplateColumns = "repeat(" + cols + ", minmax(0, 1fr))";
+  grid.style.gridTemplateRows = "repeat(" + Math.ceil(D.panels.length / cols) + ", minmax(0, 1fr))";
+  const panels = D.panels.map((def) => {
+    const canvas = document.createElement("canvas");
+    grid.appendChild(canvas);
+    const pn = { def: def, canvas: canvas, base: document.createElement("canvas"), view: null, auto: null, drag: null };
+    attachMouse(pn);
+    return pn;
+  });
+
+  function extent(def) {
+    let x0 = Infinity, x1 = -Infinity, y0 = Infinity, y1 = -Infinity;
+    active.forEach((s) => {
+      const xs = s[def.x], ys = s[def.y];
+      for (let i = 0; i < xs.length; i++) {
+        const x = xs[i], y = ys[i];
+        if (x === null || y === null || !isFinite(y)) continue;
+        if (x < x0) x0 = x; if (x > x1) x1 = x;
+        if (y < y0) y0 = y; if (y > y1) y1 = y;
+      }
+    });
+    if (!(x1 >= x0)) return { x0: 0, x1: 1, y0: 0, y1: 1 };
+    const px = (x1 - x0 || 1) * 0.05, py = (y1 - y0 || 1) * 0.05;
+    return { x0: x0 - px, x1: x1 + px, y0: y0 - py, y1: y1 + py };
+  }
+
+  function ticks(a, b) {
+    const raw = (b - a) / 6, mag = Math.pow(10, Math.floor(Math.log10(raw)));
+    const step = [1, 2, 5, 10].map((m) => m * mag).find((s) => s >= raw);
+    const out = [];
+    for (let v = Math.ceil(a / step) * step; v <= b + step * 1e-9; v += step) out.push(+v.toPrecision(12));
+    return out;
+  }
+
+  function size(pn) {
+    const dpr = window.devicePixelRatio || 1;
+    const w = pn.canvas.clientWidth, h = pn.canvas.clientHeight;
+    pn.w = w; pn.h = h; pn.dpr = dpr;
+    [pn.canvas, pn.base].forEach((c) => { c.width = Math.max(1, w * dpr); c.height = Math.max(1, h * dpr); });
+  }
+
+  function mapper(pn) {
+    const v = pn.view || pn.auto;
+    const sx = (pn.w - M.l - M.r) / (v.x1 - v.x0), sy = (pn.h - M.t - M.b) / (v.y1 - v.y0);
+    return {
+      v: v,
+      x: (x) => M.l + (x - v.x0) * sx,
+      y: (y) => pn.h - M.b - (y - v.y0) * sy,
+      ix: (px) => v.x0 + (px - M.l) / sx,
+      iy: (py) => v.y0 + (pn.h - M.b - py) / sy,
+    };
+  }
+
+  function trace(ctx, s, def, m) {
+    const xs = s[def.x], ys = s[def.y];
+    if (def.scatter) {
+      for (let i = 0; i < xs.length; i++) {
+        if (xs[i] === null || ys[i] === null) continue;
+        ctx.moveTo(m.x(xs[i]) + 4, m.y(ys[i]));
+        ctx.arc(m.x(xs[i]), m.y(ys[i]), 4, 0, 2 * Math.PI);
+      }
+      return;
+    }
+    let pen = false;
+    for (let i = 0; i < xs.length; i++) {
+      const x = xs[i], y = ys[i];
+      if (x === null || y === null || !isFinite(y)) { pen = false; continue; }
+      if (pen) ctx.lineTo(m.x(x), m.y(y)); else ctx.moveTo(m.x(x), m.y(y));
+      pen = true;
+    }
+  }
+
+  function renderBase(pn) {
+    const ctx = pn.base.getContext("2d"), def = pn.def, m = mapper(pn);
+    ctx.setTransform(pn.dpr, 0, 0, pn.dpr, 0, 0);
+    ctx.fillStyle = "#fff"; ctx.fillRect(0, 0, pn.w, pn.h);
+    const L = M.l, R = pn.w - M.r, T = M.t, B = pn.h - M.b;
+    ctx.font = "11px sans-serif"; ctx.fillStyle = "#333"; ctx.strokeStyle = "#e4e4e4"; ctx.lineWidth = 1;
+    ctx.textAlign = "center"; ctx.textBaseline = "top";
+    ticks(m.v.x0, m.v.x1).forEach((t) => {
+      ctx.beginPath(); ctx.moveTo(m.x(t), T); ctx.lineTo(m.x(t), B); ctx.stroke();
+      ctx.fillText(String(t), m.x(t), B + 4);
+    });
+    ctx.textAlign = "right"; ctx.textBaseline = "middle";
+    ticks(m.v.y0, m.v.y1).forEach((t) => {
+      ctx.beginPath(); ctx.moveTo(L, m.y(t)); ctx.lineTo(R, m.y(t)); ctx.stroke();
+      ctx.fillText(String(t), L - 4, m.y(t));
+    });
+    ctx.textAlign = "center"; ctx.textBaseline = "bottom"; ctx.font = "13px sans-serif";
+    ctx.fillText(def.xl, (L + R) / 2, pn.h - 1);
+    ctx.save(); ctx.translate(13, (T + B) / 2); ctx.rotate(-Math.PI / 2); ctx.textBaseline = "middle";
+    ctx.fillText(def.yl, 0, 0); ctx.restore();
+    ctx.strokeStyle = "#999"; ctx.strokeRect(L, T, R - L, B - T);
+
+    ctx.save();
+    ctx.beginPath(); ctx.rect(L, T, R - L, B - T); ctx.clip();
+    ctx.strokeStyle = "#aaa";
+    ctx.beginPath(); ctx.moveTo(m.x(0), T); ctx.lineTo(m.x(0), B); ctx.moveTo(L, m.y(0)); ctx.lineTo(R, m.y(0)); ctx.stroke();
+    ctx.lineWidth = def.scatter ? 0.8 : 1.5;
+    active.forEach((s) => {
+      ctx.beginPath(); trace(ctx, s, def, m);
+      if (def.scatter) {
+        ctx.fillStyle = D.colors[s.p]; ctx.fill(); ctx.strokeStyle = "#000"; ctx.stroke();
+      } else {
+        ctx.strokeStyle = D.colors[s.p]; ctx.stroke();
+      }
+    });
+    if (def.scatter && active.length <= 200) {
+      ctx.fillStyle = "#333"; ctx.font = "10px sans-serif"; ctx.textBaseline = "bottom";
+      active.forEach((s) => {
+        if (s[def.x][0] !== null && s[def.y][0] !== null)
+          ctx.fillText(D.profiles[s.p], m.x(s[def.x][0]), m.y(s[def.y][0]) - 5);
+      });
+    }
+    ctx.restore();
+  }
+
+  function drawOverlay(pn) {
+    const ctx = pn.canvas.getContext("2d"), def = pn.def, m = mapper(pn);
+    ctx.setTransform(1, 0, 0, 1, 0, 0);
+    ctx.drawImage(pn.base, 0, 0);
+    ctx.setTransform(pn.dpr, 0, 0, pn.dpr, 0, 0);
+    ctx.save();
+    ctx.beginPath(); ctx.rect(M.l, M.t, pn.w - M.l - M.r, pn.h - M.t - M.b); ctx.clip();
+    if (hover) {
+      ctx.lineWidth = def.scatter ? 2 : 3.5;
+      active.forEach((s) => {
+        if (s.p !== hover.p) return;
+        ctx.beginPath(); trace(ctx, s, def, m);
+        ctx.strokeStyle = def.scatter ? "#000" : D.colors[s.p]; ctx.stroke();
+      });
+      if (hover.s && hover.pn === pn) {
+        const x = m.x(hover.s[def.x][hover.i]), y = m.y(hover.s[def.y][hover.i]);
+        ctx.beginPath(); ctx.arc(x, y, 5, 0, 2 * Math.PI); ctx.lineWidth = 2; ctx.strokeStyle = "#000"; ctx.stroke();
+      }
+    }
+    if (pn.drag && pn.drag.moved) {
+      const d = pn.drag;
+      ctx.fillStyle = "rgba(70,110,200,0.15)"; ctx.strokeStyle = "rgb(70,110,200)"; ctx.lineWidth = 1;
+      ctx.fillRect(d.x0, d.y0, d.x1 - d.x0, d.y1 - d.y0); ctx.strokeRect(d.x0, d.y0, d.x1 - d.x0, d.y1 - d.y0);
+    }
+    ctx.restore();
+  }
+
+  function drawOverlays() { panels.forEach(drawOverlay); }
+
+  function update(dataChanged) {
+    if (dataChanged) {
+      active = D.series.filter((s) => visible[s.p] && (reSel < 0 || s.r === reSel));
+      items.forEach((li, p) => li.classList.toggle("off", !visible[p]));
+    }
+    panels.forEach((pn) => {
+      size(pn);
+      pn.auto = extent(pn.def);
+      renderBase(pn);
+    });
+    drawOverlays();
+  }
+
+  // --- Mouse: hover, box zoom, wheel zoom, reset --------------------------
+  function nearest(pn, mx, my) {
+    const def = pn.def, m = mapper(pn);
+    let best = null, bd = 100;  // within 10 px
+    active.forEach((s) => {
+      const xs = s[def.x], ys = s[def.y];
+      for (let i = 0; i < xs.length; i++) {
+        if (xs[i] === null || ys[i] === null) continue;
+        const dx = m.x(xs[i]) - mx, dy = m.y(ys[i]) - my, d = dx * dx + dy * dy;
+        if (d < bd) { bd = d; best = { s: s, i: i, p: s.p, pn: pn }; }
+      }
+    });
+    return best;
+  }
+
+  function showTip(ev) {
+    if (!hover || !hover.s) { tip.style.display = "none"; return; }
+    const def = hover.pn.def, s = hover.s, i = hover.i;
+    let txt = D.profiles[s.p] + (s.r >= 0 ? "\n" + fmtRe(D.re[s.r]) : "");
+    if (def.scatter) txt += "\n" + def.xl + ": " + s[def.x][i] + "\n" + def.yl + ": " + s[def.y][i];
+    else ["a", "cl", "cd", "cm", "ld"].forEach((k, j) => {
+      const v = s[k][i];
+      txt += "\n" + ["α", "Cl", "Cd", "Cm", "Cl/Cd"][j] + ": " + (v === null ? "-" : +v.toPrecision(4));
+    });
+    tip.textContent = txt;
+    tip.style.display = "block";
+    tip.style.left = Math.min(ev.clientX + 14, window.innerWidth - tip.offsetWidth - 4) + "px";
+    tip.style.top = Math.min(ev.clientY + 14, window.innerHeight - tip.offsetHeight - 4) + "px";
+  }
+
+  function attachMouse(pn) {
+    const c = pn.canvas;
+    let pending = null;
+    const pos = (ev) => { const r = c.getBoundingClientRect(); return [ev.clientX - r.left, ev.clientY - r.top]; };
+    c.addEventListener("mousedown", (ev) => {
+      const [x, y] = pos(ev);
+      pn.drag = { x0: x, y0: y, x1: x, y1: y, moved: false };
+    });
+    c.addEventListener("mousemove", (ev) => {
+      const [x, y] = pos(ev);
+      if (pn.drag) {
+        pn.drag.x1 = x; pn.drag.y1 = y;
+        pn.drag.moved = Math.abs(x - pn.drag.x0) > 4 || Math.abs(y - pn.drag.y0) > 4;
+      }
+      if (pending) return;
+      pending = requestAnimationFrame(() => {
+        pending = null;
+        if (!pn.drag || !pn.drag.moved) hover = nearest(pn, x, y);
+        showTip(ev);
+        drawOverlays();
+      });
+    });
+    window.addEventListener("mouseup", () => {
+      const d = pn.drag;
+      pn.drag = null;
+      if (!d || !d.moved) return;
+      const m = mapper(pn);
+      const xa = m.ix(d.x0), xb = m.ix(d.x1), ya = m.iy(d.y0), yb = m.iy(d.y1);
+      pn.view = { x0: Math.min(xa, xb), x1: Math.max(xa, xb), y0: Math.min(ya, yb), y1: Math.max(ya, yb) };
+      renderBase(pn); drawOverlay(pn);
+    });
+    c.addEventListener("mouseleave", () => { hover = null; tip.style.display = "none"; drawOverlays(); });
+    c.addEventListener("dblclick", () => { pn.view = null; renderBase(pn); drawOverlay(pn); });
+    c.addEventListener("wheel", (ev) => {
+      ev.preventDefault();
+      const [x, y] = pos(ev), m = mapper(pn), v = m.v, f = ev.deltaY > 0 ? 1.25 : 0.8;
+      const cx = m.ix(x), cy = m.iy(y);
+      pn.view = { x0: cx - (cx - v.x0) * f, x1: cx + (v.x1 - cx) * f, y0: cy - (cy - v.y0) * f, y1: cy + (v.y1 - cy) * f };
+      renderBase(pn); drawOverlay(pn);
+    }, { passive: false });
+  }
+
+  let resizing = null;
+  window.addEventListener("resize", () => {
+    cancelAnimationFrame(resizing);
+    resizing = requestAnimationFrame(() => update(false));
+  });
+  update(true);
+})();
+"""
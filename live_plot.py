@@ -0,0 +1,349 @@
+"""Live polar plot: tail polar files being written and update the figure in place."""
+
+import re
+import time
+from pathlib import Path
+
+import numpy as np
+
+from polars_reader import (
+    parse_name_from_header,
+    parse_re_from_header,
+    select_polar_files,
+)
+
+# Bytes at the start of a file compared on every poll to detect rewrites
+_PREFIX = 512
+
+# Margin added around the data, as a fraction of its span, when the axes are rescaled
+HEADROOM = 0.25
+
+
+class PolarTail:
+    """
+    Incremental reader of one polar file that is still being written.
+
+    Each read() parses only the bytes appended since the previous call, with
+    the same row rules as parse_polar_file (header line with 'alpha' and
+    'CL', a separator line, then rows of at least 5 numbers up to the first
+    blank line). A trailing line without newline is kept until it is
+    complete. If the file shrinks or its beginning changes, it is read again
+    from the start.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.reset()
+
+    def reset(self):
+        self.offset = 0
+        self.prefix = b""
+        self.pending = b""
+        self.header = ""
+        self.state = "header"  # header -> separator -> data -> done
+        self.name = self.path.stem
+        self.re = None
+        self.rows = np.empty((0, 5))
+
+    def _changed(self, f, size):
+        if size < self.offset:
+            return True
+        if self.prefix:
+            f.seek(0)
+            return f.read(len(self.prefix)) != self.prefix
+        return False
+
+    def read(self):
+        """Parse newly appended lines; return the number of new rows (-1 after a reset)."""
+        try:
+            size = self.path.stat().st_size
+        except FileNotFoundError:
+            return 0
+        reset = False
+        with open(self.path, "rb") as f:
+            if self._changed(f, size):
+                self.reset()
+                reset = True
+            if size == self.offset:
+                return -1 if reset else 0
+            f.seek(self.offset)
+            data = f.read(size - self.offset)
+        if len(self.prefix) < _PREFIX:
+            self.prefix = (self.prefix + data)[:_PREFIX]
+        self.offset += len(data)
+
+        data = self.pending + data
+        cut = data.rfind(b"\n") + 1
+        self.pending = data[cut:]
+        new_rows = []
+        for line in data[:cut].decode("utf-8", errors="ignore").splitlines():
+            self._line(line, new_rows)
+        if new_rows:
+            self.rows = np.vstack([self.rows, new_rows])
+        return -1 if reset else len(new_rows)
+
+    def _line(self, line, new_rows):
+        if self.state == "header":
+            self.header += line + "\n"
+            low = line.lower()
+            if "alpha" in low and "cl" in low:
+                self.name = parse_name_from_header(self.header) or self.path.stem
+                self.re = parse_re_from_header(self.header)
+                self.state = "separator"
+        elif self.state == "separator":
+            self.state = "data"
+        elif self.state == "data":
+            if not line.strip():
+                self.state = "done"
+                return
+            values = []
+            for t in re.split(r"\s+", line.strip()):
+                try:
+                    values.append(float(t))
+                except ValueError:
+                    pass
+            if len(values) >= 5:
+                new_rows.append(values[:5])
+
+    def curves(self):
+        """Return alpha, CL, CD, Cm and Cl/Cd sorted by alpha."""
+        rows = self.rows[np.argsort(self.rows[:, 0], kind="stable")]
+        alpha, cl, cd, _, cm = rows.T
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ld = np.where(cd != 0, cl / cd, np.nan)
+        return alpha, cl, cd, cm, ld
+
+
+# Panels as in plot_polars: (x, y) among alpha, CL, CD, Cm, Cl/Cd
+_PANELS = [
+    (0, 1, r"$\alpha$ (deg)", r"$C_l$"),
+    (0, 3, r"$\alpha$ (deg)", r"$C_m$"),
+    (1, 2, r"$C_l$", r"$C_d$"),
+    (0, 4, r"$\alpha$ (deg)", r"$C_l/C_d$"),
+]
+
+
+class LivePolarPlot:
+    """
+    Four-panel polar figure (as plot_polars) updated in place.
+
+    Every polar has one animated Line2D per panel. On update() only the
+    tails with new rows get set_data(); the figure is then repainted by
+    restoring the cached background and drawing the lines (blitting). A full
+    redraw happens only when a curve leaves the current axes limits or the
+    set of files changes.
+    """
+
+    def __init__(
+        self, polars_dir=None, profiles=None, re_filter=None, figsize=(16, 12)
+    ):
+        import matplotlib.pyplot as plt
+
+        self.polars_dir = polars_dir
+        self.profiles = profiles
+        self.re_filter = re_filter
+        self.fig, axs = plt.subplots(2, 2, figsize=figsize)
+        self.axes = list(axs.flatten())
+        for ax, (_, _, xlabel, ylabel) in zip(self.axes, _PANELS):
+            ax.set_xlabel(xlabel, fontsize=18)
+            ax.set_ylabel(ylabel, fontsize=18)
+            ax.tick_params(axis="both", labelsize=16)
+            ax.grid(True, alpha=0.3)
+            ax.axhline(y=0, color="gray", linewidth=1.0, alpha=0.6, zorder=1)
+            ax.axvline(x=0, color="gray", linewidth=1.0, alpha=0.6, zorder=1)
+        self.tails = {}
+        self.lines = {}
+        self.background = None
+        self.fig.canvas.mpl_connect("draw_event", self._on_draw)
+
+    def _on_draw(self, event):
+        # Background without the animated lines, reused by every blit
+        canvas = self.fig.canvas
+        if getattr(canvas, "supports_blit", False):
+            self.background = canvas.copy_from_bbox(self.fig.bbox)
+        self._draw_lines()
+
+    def _draw_lines(self):
+        for lines in self.lines.values():
+            for line in lines:
+                line.axes.draw_artist(line)
+
+    def _sync_files(self):
+        """Start tailing new files and drop removed ones; True if the set changed."""
+        files = select_polar_files(self.polars_dir, self.profiles, self.re_filter)
+        changed = False
+        for f in files:
+            if f not in self.tails:
+                self.tails[f] = PolarTail(f)
+                changed = True
+        for f in [f for f in self.tails if f not in set(files)]:
+            del self.tails[f]
+            for line in self.lines.pop(f, []):
+                line.remove()
+            changed = True
+        return changed
+
+    def _relayout(self):
+        from plot_polars import profile_colors
+
+        colors = profile_colors(len(self.tails))
+        for color, (f, tail) in zip(colors, self.tails.items()):
+            if f not in self.lines:
+                self.lines[f] = [
+                    ax.plot([], [], color=color, linewidth=2.5, animated=True)[0]
+                    for ax in self.axes
+                ]
+            for line in self.lines[f]:
+                line.set_color(color)
+                line.set_label(tail.name)
+        if self.fig.legends:
+            self.fig.legends[0].remove()
+        handles = [
+            lines[0] for f, lines in self.lines.items() if len(self.tails[f].rows)
+        ]
+        if handles:
+            self.fig.legend(
+                handles,
+                [h.get_label() for h in handles],
+                loc="center left",
+                bbox_to_anchor=(0.91, 0.5),
+                fontsize=13,
+            )
+        title = f"Simulaciones en curso de {len(self.tails)} perfiles"
+        if self.re_filter:
+            title += f" a Re = {self.re_filter}"
+        self.fig.suptitle(title, fontsize=24, fontweight="bold")
+        self.fig.tight_layout(rect=[0, 0, 0.90, 0.97])
+
+    def _outside_limits(self, curves):
+        for ax, (ix, iy, _, _) in zip(self.axes, _PANELS):
+            x, y = curves[ix], curves[iy]
+            ok = np.isfinite(x) & np.isfinite(y)
+            if not ok.any():
+                continue
+            (x0, x1), (y0, y1) = ax.get_xlim(), ax.get_ylim()
+            if x[ok].min() < x0 or x[ok].max() > x1:
+                return True
+            if y[ok].min() < y0 or y[ok].max() > y1:
+                return True
+        return False
+
+    def _rescale(self):
+        for ax, (ix, iy, _, _) in zip(self.axes, _PANELS):
+            xs, ys = [], []
+            for tail in self.tails.values():
+                if len(tail.rows):
+                    c = tail.curves()
+                    xs.append(c[ix])
+                    ys.append(c[iy])
+            if not xs:
+                continue
+            x, y = np.concatenate(xs), np.concatenate(ys)
+            ok = np.isfinite(x) & np.isfinite(y)
+            if not ok.any():
+                continue
+            for values, setter in ((x[ok], ax.set_xlim), (y[ok], ax.set_ylim)):
+                # Headroom so curves still growing do not force a redraw each tick
+                lo, hi = values.min(), values.max()
+                pad = HEADROOM * (hi - lo) or HEADROOM * abs(hi) or HEADROOM
+                setter(lo - pad, hi + pad)
+
+    def update(self):
+        """
+        Read the appended rows of all tailed files and repaint the figure.
+
+        Returns (new rows, polars updated, full redraw).
+        """
+        files_changed = self._sync_files()
+        new_rows, updated, rescale = 0, 0, False
+        names_changed = False
+        for f, tail in self.tails.items():
+            old_name = tail.name
+            n = tail.read()
+            if n == 0:
+                continue
+            names_changed |= tail.name != old_name or n < 0 or len(tail.rows) == n
+            rescale |= n < 0
+            new_rows += max(n, 0)
+            updated += 1
+            if f not in self.lines:
+                continue
+            curves = tail.curves()
+            for line, (ix, iy, _, _) in zip(self.lines[f], _PANELS):
+                line.set_data(curves[ix], curves[iy])
+            rescale |= self._outside_limits(curves)
+
+        full = files_changed or names_changed or rescale
+        if files_changed or names_changed:
+            self._relayout()
+            for f, tail in self.tails.items():
+                if len(tail.rows):
+                    curves = tail.curves()
+                    for line, (ix, iy, _, _) in zip(self.lines[f], _PANELS):
+                        line.set_data(curves[ix], curves[iy])
+        canvas = self.fig.canvas
+        if full or self.background is None:
+            if rescale or files_changed:
+                self._rescale()
+            canvas.draw()
+        elif updated:
+            canvas.restore_region(self.background)
+            self._draw_lines()
+            canvas.blit(self.fig.bbox)
+        canvas.flush_events()
+        return new_rows, updated, full
+
+
+def run_live(
+    polars_dir=None,
+    profiles=None,
+    re_filter=None,
+    interval=0.5,
+    out_path=None,
+    max_frames=None,
+):
+    """
+    Show the live polar plot until the window is closed or Ctrl+C.
+
+    Parameters:
+    -----------
+    polars_dir : str
+        Directory containing polar files
+    profiles : list
+        List of profile name filters
+    re_filter : str
+        Reynolds number filter
+    interval : float
+        Polling interval in seconds
+    out_path : str, optional
+        Also save the figure to this path whenever new rows arrive (for
+        headless use)
+    max_frames : int, optional
+        Stop after this many polling cycles
+    """
+    import matplotlib.pyplot as plt
+
+    live = LivePolarPlot(polars_dir, profiles, re_filter)
+    if not out_path:
+        plt.show(block=False)
+    frames = 0
+    try:
+        while max_frames is None or frames < max_frames:
+            start = time.perf_counter()
+            new_rows, updated, full = live.update()
+            frames += 1
+            if new_rows or full:
+                elapsed = (time.perf_counter() - start) * 1000
+                stamp = time.strftime("%H:%M:%S")
+                print(
+                    f"[{stamp}] +{new_rows} rows in {updated} polars "
+                    f"({'redraw' if full else 'blit'} {elapsed:.0f} ms)"
+                )
+                if out_path:
+                    live.fig.savefig(out_path, dpi=150, bbox_inches="tight")
+            if not out_path and not plt.fignum_exists(live.fig.number):
+                break
+            live.fig.canvas.start_event_loop(interval)
+    except KeyboardInterrupt:
+        print("Stopped live plot.")
+    return live
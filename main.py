@@ -1,7 +1,9 @@
 import argparse
+import contextlib
+import sys
 from pathlib import Path
 
-from filter_profiles import filter_profiles
+from filter_profiles import filter_profiles, resolve_column
 from polars_reader import list_available_re
 
 
@@ -25,6 +27,7 @@ def _parse_filter_criteria(filter_list):
     Supports:
     - Standard operators: >, >=, <, <=, ==, !=
     - Between operator: "param between min,max"
+    - Text values with == and != (e.g. "family == Eppler")
 
     Returns:
     - criteria: dict with parsed criteria
@@ -65,12 +68,15 @@ def _parse_filter_criteria(filter_list):
                         param = parts[0].strip()
                         try:
                             value = float(parts[1].strip())
-                            criteria[param] = (op, value)
-                            display[param] = (op, value)
-                            parsed = True
-                            break
                         except ValueError:
-                            continue
+                            # Text values (e.g. 'family == Eppler') for == and !=
+                            value = parts[1].strip().strip("'\"")
+                            if op not in ("==", "!=") or not value:
+                                continue
+                        criteria[param] = (op, value)
+                        display[param] = (op, value)
+                        parsed = True
+                        break
 
         if not parsed:
             print(f"Warning: Could not parse criterion: {criterion}")
@@ -79,11 +85,266 @@ def _parse_filter_criteria(filter_list):
     return criteria if criteria else None, display if display else None
 
 
+def _sort_table(df, sort, top=None):
+    """
+    Sort a table by column; a leading '-' sorts in descending order.
+
+    With ``top`` only the first N rows are kept; when sorting they are found
+    by partial selection (nsmallest/nlargest) instead of a full sort.
+    """
+    if not sort:
+        return df.head(top) if top else df
+    sort_col = sort
+    ascending = True
+    if sort_col.startswith("-"):
+        ascending = False
+        sort_col = sort_col[1:]
+    sort_col = resolve_column(sort_col)
+
+    if sort_col in df.columns:
+        if top and df[sort_col].dtype.kind not in "biuf":
+            # Text columns (Profile, Family): nsmallest/nlargest need numbers
+            df = df.sort_values(by=sort_col, ascending=ascending).head(top)
+        elif top:
+            select = df.nsmallest if ascending else df.nlargest
+            df = select(top, sort_col)
+        else:
+            df = df.sort_values(by=sort_col, ascending=ascending)
+    else:
+        print(
+            f"Warning: Column '{sort_col}' not found. Available columns: {', '.join(df.columns)}"
+        )
+        if top:
+            df = df.head(top)
+    return df
+
+
+def _export_table(df, args):
+    """
+    Export a result table according to --csv or --format/--out.
+
+    Returns True when the table was exported (or an export error was
+    reported), False when it should be printed to the console instead.
+    """
+    if args.csv:
+        df.to_csv(args.csv, index=False, encoding="utf-8-sig")
+        print(f"Data exported to {args.csv}")
+        return True
+    if args.format:
+        if args.format == "ndjson" and not args.out:
+            from corpus_io import write_ndjson
+
+            write_ndjson(df.to_dict("records"), args.records_out)
+            return True
+        if not args.out:
+            print(f"Error: --format {args.format} requires --out")
+            return True
+        from corpus_io import write_table
+
+        write_table(df, args.out, args.format)
+        print(f"Data exported to {args.out}")
+        return True
+    return False
+
+
+def _streams_ndjson(args):
+    """True if the records of extract/limits/filter can be streamed as NDJSON."""
+    if args.format != "ndjson" or args.csv:
+        return False
+    if args.action not in ("extract", "limits", "filter"):
+        return False
+    from re_scaling import needs_re_fits
+
+    filter_criteria, _ = _parse_filter_criteria(args.filter)
+    # Sorting and the Reynolds-scaling fits need the whole table first
+    return not (
+        args.sort
+        or args.top
+        or args.re_fits
+        or (args.action != "extract" and needs_re_fits(filter_criteria))
+    )
+
+
+def _stream_ndjson(args, profiles, alphas, families, shard):
+    """
+    Write extract/limits/filter records as NDJSON while they are computed.
+
+    Records go to --out, or to stdout (messages are then sent to stderr by
+    main).
+    """
+    import pandas as pd
+
+    from corpus_io import write_ndjson
+    from extract_limits import iter_limits, iter_values
+    from filter_profiles import apply_criteria
+
+    filter_criteria, _ = _parse_filter_criteria(args.filter)
+    out = args.out or args.records_out
+
+    if args.action == "extract":
+        keep = None
+        if filter_criteria:
+            # Profiles passing at any selected Re, as without streaming
+            keep = set(
+                filter_profiles(
+                    polars_dir=args.polars_dir,
+                    profiles=profiles,
+                    re_filter=args.re,
+                    criteria=filter_criteria,
+                )["Profile"]
+            )
+            print(f"Filtered to {len(keep)} profile(s) matching criteria")
+        records = (
+            r
+            for r in iter_values(
+                args.polars_dir,
+                profiles,
+                args.re,
+                alphas,
+                shard=shard,
+                with_file=shard is not None,
+            )
+            if keep is None or r["Profile"] in keep
+        )
+    else:
+        records = iter_limits(
+            args.polars_dir,
+            profiles,
+            args.re,
+            shard=shard,
+            with_file=shard is not None,
+        )
+        if filter_criteria or families:
+            from airfoil_families import add_family_column, select_families
+
+            def passing(rows):
+                for row in rows:
+                    df = pd.DataFrame([row])
+                    if families:
+                        df = select_families(add_family_column(df), families)
+                    if filter_criteria and not df.empty:
+                        df = apply_criteria(df, filter_criteria)
+                    if not df.empty:
+                        yield df.iloc[0].to_dict()
+
+            print(f"Applying filters: {filter_criteria or families}")
+            records = passing(records)
+
+    try:
+        n = write_ndjson(records, out)
+    except BrokenPipeError:
+        # Reader closed the pipe (e.g. | head): stop quietly
+        import os
+
+        os.dup2(os.open(os.devnull, os.O_WRONLY), out.fileno())
+        return
+    if args.out:
+        print(f"Streamed {n} records to {args.out}")
+
+
+def _run_watch(args, profiles):
+    """Re-emit the limits table or figure every time the polar files change."""
+    import time
+
+    from watch_polars import watch
+
+    filter_criteria, filter_display = _parse_filter_criteria(args.filter)
+
+    if args.action in ("plot", "plot-clmax-cli") and not args.out:
+        print("Error: --watch with plot actions requires --out")
+        return
+    if args.action not in ("limits", "filter", "plot", "plot-clmax-cli"):
+        print(f"Error: --watch is not supported for '{args.action}'")
+        return
+
+    def on_change(watcher, changes):
+        added, modified, removed = changes
+        stamp = time.strftime("%H:%M:%S")
+        print(
+            f"[{stamp}] {len(added)} added, {len(modified)} modified, "
+            f"{len(removed)} removed ({len(watcher.snapshot)} polar files)"
+        )
+        if not watcher.snapshot:
+            print("No polar files matched selection")
+            return
+
+        if args.action in ("limits", "filter"):
+            try:
+                df = watcher.limits_table(filter_criteria)
+            except ValueError as e:
+                # Bad criteria: report and keep watching
+                print(f"Error: {e}")
+                return
+            df = _sort_table(df, args.sort, args.top)
+            if _export_table(df, args):
+                pass
+            elif df.empty:
+                print("No profiles match the specified criteria.")
+            else:
+                print(df.to_string(index=False))
+            return
+
+        import matplotlib.pyplot as plt
+
+        if args.action == "plot":
+            from plot_polars import plot_polars as plot_fn
+        else:
+            from plot_polars import plot_clmax_vs_clideal as plot_fn
+        try:
+            plot_fn(
+                polars_dir=args.polars_dir,
+                profiles=profiles,
+                re_filter=args.re,
+                out_path=args.out,
+                filter_criteria=filter_criteria,
+                filter_display=filter_display,
+                parser=watcher.parse,
+            )
+        except RuntimeError as e:
+            print(f"Warning: {e}")
+        except ValueError as e:
+            print(f"Error: {e}")
+        finally:
+            plt.close("all")
+
+    print(f"Watching {args.polars_dir} (Ctrl+C to stop)")
+    watch(
+        on_change,
+        polars_dir=args.polars_dir,
+        profiles=profiles,
+        re_filter=args.re,
+        interval=args.interval,
+    )
+
+
 def main():
     p = argparse.ArgumentParser(description="Tools for XFLR5 polar analysis")
     p.add_argument(
         "action",
-        choices=["plot", "extract", "limits", "plot-clmax-cli"],
+        nargs="?",
+        choices=[
+            "plot",
+            "extract",
+            "limits",
+            "plot-clmax-cli",
+            "export",
+            "import-db",
+            "check",
+            "tensor",
+            "mission",
+            "similar",
+            "diff",
+            "filter",
+            "rank",
+            "surrogate",
+            "merge",
+            "best-map",
+            "plot-map",
+            "families",
+            "cluster",
+            "wing",
+            "robustness",
+        ],
         help="Functionality to execute",
     )
     p.add_argument(
@@ -91,19 +352,52 @@ def main():
         "-p",
         help="Profiles to include (comma-separated, substring of name). Default: all",
     )
+    p.add_argument(
+        "--family",
+        help="Airfoil families to include (comma-separated, substring of the family "
+        "name, e.g. 'NACA,Eppler') for limits, filter and families",
+    )
     p.add_argument(
         "--re",
         help="Reynolds filter (e.g.: 0.100 or Re0.100). If not specified, uses all",
     )
     p.add_argument(
         "--polars-dir",
-        default=str(Path(__file__).parent / "polars"),
-        help="Polars directory",
+        action="append",
+        help="Polars directory, a corpus file written by 'export' "
+        "(.parquet, .feather, .arrow), a database written by 'import-db' (.sqlite) "
+        "or an archive of polar files (.zip, .tar, .tar.gz, .tar.zst). "
+        "Give it twice for 'diff'. Default: polars/ next to this script",
+    )
+    p.add_argument(
+        "--out",
+        "-o",
+        help="Output path for figures (plot; a .html path writes an interactive report) "
+        "or exported tables (--format, export)",
+    )
+    p.add_argument(
+        "--format",
+        choices=["csv", "parquet", "feather", "arrow", "ndjson"],
+        help="Table format for --out (extract, limits). For 'export' it is "
+        "inferred from the --out suffix if omitted. 'ndjson' writes one JSON "
+        "record per line (to stdout without --out); extract, limits and filter "
+        "stream the records as they are computed",
+    )
+    p.add_argument(
+        "--dpi",
+        type=int,
+        help="Resolution of saved figures (plot: default 300, plot-clmax-cli: 600)",
+    )
+    p.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always render plot figures instead of copying an identical one "
+        "from the figure cache",
     )
-    p.add_argument("--out", "-o", help="Output path for figures (plot)")
     p.add_argument(
         "--alphas",
-        help="List of alpha for extraction in 'extract' (comma-separated)",
+        help="List of alpha for extraction in 'extract' or evaluation in "
+        "'surrogate' (comma-separated)",
     )
     p.add_argument(
         "--sort",
@@ -125,8 +419,230 @@ def main():
         action="store_true",
         help="List available Re values in polars",
     )
+    p.add_argument(
+        "--alpha-range",
+        default="-10,30",
+        help="Common alpha grid range 'min,max' in degrees (tensor, plot-map). "
+        "Default: -10,30",
+    )
+    p.add_argument(
+        "--alpha-step",
+        type=float,
+        default=0.1,
+        help="Common alpha grid step in degrees (tensor, plot-map). Default: 0.1",
+    )
+    p.add_argument(
+        "--max-gap",
+        type=float,
+        default=0.5,
+        help="Largest alpha gap (deg) bridged by interpolation when resampling; "
+        "wider gaps are masked. Default: 0.5",
+    )
+    p.add_argument(
+        "--chord",
+        type=float,
+        help="Wing chord in m (mission)",
+    )
+    p.add_argument(
+        "--wing-area",
+        type=float,
+        help="Wing area in m^2 (mission)",
+    )
+    p.add_argument(
+        "--rho",
+        type=float,
+        default=1.225,
+        help="Air density in kg/m^3 (mission, wing). Default: 1.225",
+    )
+    p.add_argument(
+        "--mu",
+        type=float,
+        default=1.81e-5,
+        help="Air dynamic viscosity in Pa s (mission, wing). Default: 1.81e-5",
+    )
+    p.add_argument(
+        "--segment",
+        action="append",
+        help="Flight segment 'speed,weight,fraction' in m/s, N and time fraction "
+        "(mission). Can be used multiple times",
+    )
+    p.add_argument(
+        "--segments",
+        help="CSV file with 'speed', 'weight' and 'fraction' columns (mission)",
+    )
+    p.add_argument(
+        "--stations",
+        help="CSV file of half-wing stations with 'y' and 'chord' (m) and 'cl' or "
+        "'twist' (deg) columns (wing)",
+    )
+    p.add_argument(
+        "--speed",
+        type=float,
+        help="Flight speed in m/s (wing)",
+    )
+    p.add_argument(
+        "--weight",
+        type=float,
+        help="Lift to carry in N (wing): scales a 'cl' distribution, required "
+        "with 'twist'",
+    )
+    p.add_argument(
+        "--query",
+        help="Reference profile for 'similar' (exact name or unique substring)",
+    )
+    p.add_argument(
+        "--re-range",
+        help="Reynolds range 'min,max' in millions as in file names, e.g. 0.2,0.5 "
+        "(similar, best-map, cluster; robustness samples Re uniformly in log "
+        "over it)",
+    )
+    p.add_argument(
+        "--clusters",
+        type=int,
+        default=6,
+        help="Number of clusters for 'cluster'. Default: 6",
+    )
+    p.add_argument(
+        "--cluster-method",
+        choices=["kmeans", "hierarchical"],
+        default="kmeans",
+        help="Clustering algorithm for 'cluster': k-means or agglomerative "
+        "(Ward). Default: kmeans",
+    )
+    p.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Random seed of k-means (cluster) and of the samples (robustness). "
+        "Default: 0",
+    )
+    p.add_argument(
+        "--samples",
+        type=int,
+        default=2000,
+        help="Number of Monte-Carlo samples for 'robustness'. Default: 2000",
+    )
+    p.add_argument(
+        "--re-spread",
+        type=float,
+        default=0.1,
+        help="Standard deviation of log(Re) around --re for 'robustness' "
+        "(0.1: about 10 %%). Default: 0.1",
+    )
+    p.add_argument(
+        "--threshold-spread",
+        type=float,
+        default=0.05,
+        help="Relative standard deviation of the --filter thresholds for "
+        "'robustness'. Default: 0.05",
+    )
+    p.add_argument(
+        "--re-points",
+        type=int,
+        help="Number of log-spaced Reynolds numbers of the 'best-map' grid. "
+        "Default: the shipped Reynolds numbers in --re-range",
+    )
+    p.add_argument(
+        "--cl-range",
+        default="0,1.4",
+        help="Lift coefficient range 'min,max' of the 'best-map' grid. Default: 0,1.4",
+    )
+    p.add_argument(
+        "--cl-step",
+        type=float,
+        default=0.1,
+        help="Lift coefficient step of the 'best-map' grid. Default: 0.1",
+    )
+    p.add_argument(
+        "--top",
+        type=int,
+        help="Number of results to show "
+        "(similar: default 10; limits, filter, rank, mission, wing: all)",
+    )
+    p.add_argument(
+        "--re-fits",
+        action="store_true",
+        help="Add the Reynolds-scaling fit columns (n Cd_min, n Cl_max, ...) to "
+        "limits/filter. Implied when --sort or --filter uses one of them",
+    )
+    p.add_argument(
+        "--tolerance",
+        help="Maximum surrogate error per coefficient for 'surrogate', e.g. "
+        "'cl=0.005,cd=0.0001,cm=0.002' (defaults for omitted ones)",
+    )
+    p.add_argument(
+        "--shard",
+        help="Process only shard i of N ('i/N', files split by a hash of their "
+        "name) in limits/filter/extract and write a partial table for 'merge'",
+    )
+    p.add_argument(
+        "--inputs",
+        help="Shard outputs for 'merge' (comma-separated paths or glob patterns)",
+    )
+    p.add_argument(
+        "--metrics",
+        help="Limits columns or filter aliases aggregated by 'families' "
+        "(comma-separated). Default: Cd_min,Cl_max,Cl/Cd_max",
+    )
+    p.add_argument(
+        "--objective",
+        help="Expression to maximize for 'rank' and 'robustness' over limits "
+        "columns or filter aliases, e.g. '2*cl_cd_max - 5000*cd_min + cl_max'",
+    )
+    p.add_argument(
+        "--normalize",
+        choices=["none", "minmax", "zscore", "rank"],
+        default="none",
+        help="Normalization of the columns used by --objective (default: none)",
+    )
+    p.add_argument(
+        "--across-re",
+        choices=["none", "mean", "min"],
+        default="none",
+        help="'rank' without --re: score each profile/Re pair (none) or profiles "
+        "by their mean or worst score over Re",
+    )
+    p.add_argument(
+        "--workers",
+        type=int,
+        help="Number of worker processes for parallel actions (check, diff). "
+        "Default: CPU count",
+    )
+    p.add_argument(
+        "--sql",
+        help="Run a raw SQL query against the database given by --polars-dir "
+        "(tables: polars, points, limits)",
+    )
+    p.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and re-emit the limits table or figure whenever polar files change",
+    )
+    p.add_argument(
+        "--interval",
+        type=float,
+        default=0.5,
+        help="Polling interval in seconds for --watch and --live (default: 0.5)",
+    )
+    p.add_argument(
+        "--live",
+        action="store_true",
+        help="For plot: tail the polar files while XFLR5 writes them and update "
+        "the figure in place (with --out, re-save the file on each change)",
+    )
     args = p.parse_args()
+    args.polars_dirs = args.polars_dir or [str(Path(__file__).parent / "polars")]
+    args.polars_dir = args.polars_dirs[0]
+
+    # NDJSON on stdout: every message goes to stderr so the output stays valid
+    args.records_out = sys.stdout
+    ndjson_stdout = args.format == "ndjson" and not args.out and not args.csv
+    with contextlib.redirect_stdout(sys.stderr if ndjson_stdout else sys.stdout):
+        _run_action(p, args)
 
+
+def _run_action(p, args):
+    """Run the action selected on the command line."""
     if args.list_re:
         vals = list_available_re(args.polars_dir)
         print("Available Reynolds (appearing in file names):")
@@ -134,9 +650,71 @@ def main():
             print(" -", v)
         return
 
+    if args.sql:
+        from polar_db import run_query
+
+        df = run_query(args.polars_dir, args.sql)
+        if not _export_table(df, args):
+            print(df.to_string(index=False))
+        return
+
+    if args.action is None:
+        p.error("the following arguments are required: action")
+
     profiles = _parse_csv_list(args.profiles)
+    families = _parse_csv_list(args.family)
     alphas = _parse_alphas(args.alphas)
 
+    shard = None
+    if args.shard:
+        from shards import parse_shard
+
+        if args.action not in ("limits", "filter", "extract"):
+            print(f"Error: --shard is not supported for '{args.action}'")
+            return
+        if not (args.csv or (args.format and args.out)):
+            print(
+                "Error: --shard requires an output file (--csv, or --format and --out)"
+            )
+            return
+        try:
+            shard = parse_shard(args.shard)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return
+
+    if args.watch:
+        _run_watch(args, profiles)
+        return
+
+    if _streams_ndjson(args):
+        if args.action == "extract" and not alphas:
+            print("Error: must specify --alphas for extract")
+            return
+        try:
+            _stream_ndjson(args, profiles, alphas, families, shard)
+        except (RuntimeError, ValueError) as e:
+            print(f"Error: {e}")
+        return
+
+    if args.live:
+        from live_plot import run_live
+
+        if args.action != "plot":
+            print("Error: --live is only supported for 'plot'")
+            return
+        if args.filter:
+            print("Error: --filter is not supported with --live")
+            return
+        run_live(
+            polars_dir=args.polars_dir,
+            profiles=profiles,
+            re_filter=args.re,
+            interval=args.interval,
+            out_path=args.out,
+        )
+        return
+
     if args.action == "plot":
         from plot_polars import plot_polars
 
@@ -150,6 +728,8 @@ def main():
             out_path=args.out,
             filter_criteria=filter_criteria,
             filter_display=filter_display,
+            dpi=args.dpi,
+            use_cache=not args.no_cache,
         )
 
     elif args.action == "plot-clmax-cli":
@@ -165,7 +745,45 @@ def main():
             out_path=args.out,
             filter_criteria=filter_criteria,
             filter_display=filter_display,
+            dpi=args.dpi,
+            use_cache=not args.no_cache,
+        )
+
+    elif args.action == "plot-map":
+        from plot_maps import map_ridges, plot_polar_maps
+        from polar_tensor import build_polar_tensor
+
+        if not profiles:
+            print("Error: must specify --profiles for plot-map")
+            return
+        alpha_min, alpha_max = _parse_alphas(args.alpha_range)
+        grid = dict(
+            alpha_min=alpha_min,
+            alpha_max=alpha_max,
+            alpha_step=args.alpha_step,
+            max_gap=args.max_gap,
         )
+        try:
+            tensor = build_polar_tensor(args.polars_dir, profiles, args.re, **grid)
+            ridges = map_ridges(tensor)
+            plot_polar_maps(
+                polars_dir=args.polars_dir,
+                profiles=profiles,
+                re_filter=args.re,
+                out_path=args.out,
+                dpi=args.dpi,
+                use_cache=not args.no_cache,
+                tensor=tensor,
+                **grid,
+            )
+        except RuntimeError as e:
+            print(f"Error: {e}")
+            return
+        if args.csv:
+            ridges.to_csv(args.csv, index=False, encoding="utf-8-sig")
+            print(f"Data exported to {args.csv}")
+        else:
+            print(ridges.to_string(index=False))
 
     elif args.action == "extract":
         if not alphas:
@@ -175,21 +793,31 @@ def main():
 
         from extract_limits import extract_values
 
+        if shard and args.filter:
+            print("Error: --filter is not supported with --shard for extract")
+            return
         res = extract_values(
             polars_dir=args.polars_dir,
             profiles=profiles,
             re_filter=args.re,
             alphas=alphas,
+            shard=shard,
+            by_file=shard is not None,
         )
 
         # Convert to DataFrame for easier CSV export
         rows = []
-        for profile_name, data in res.items():
+        for key, data in res.items():
+            data = dict(data)
+            profile_name = data.pop("Profile", key)
             for alpha_key, values in data.items():
                 row = {
                     "Profile": profile_name,
                     "Alpha_target": alpha_key.replace("alpha_", ""),
                 }
+                if shard:
+                    # Partial output: keep every file for 'merge'
+                    row = {"Source file": key, **row}
                 row.update(values)
                 rows.append(row)
 
@@ -217,21 +845,20 @@ def main():
                     f"Filtered to {len(filtered_profiles)} profile(s) matching criteria"
                 )
 
-        if args.csv:
-            df_extract.to_csv(args.csv, index=False, encoding="utf-8-sig")
-            print(f"Data exported to {args.csv}")
-        else:
+        if not _export_table(df_extract, args):
             import json
 
             print(json.dumps(res, indent=2, ensure_ascii=False))
 
-    elif args.action == "limits":
+    elif args.action in ("limits", "filter"):
         from extract_limits import extract_limits
 
         df = extract_limits(
             polars_dir=args.polars_dir,
             profiles=profiles,
             re_filter=args.re,
+            shard=shard,
+            with_file=shard is not None,
         )
 
         # Apply filters if provided
@@ -244,6 +871,8 @@ def main():
                     profiles=profiles,
                     re_filter=args.re,
                     criteria=filter_criteria,
+                    shard=shard,
+                    with_file=shard is not None,
                 )
 
                 if df.empty:
@@ -251,27 +880,506 @@ def main():
                     return
                 print(f"Found {len(df)} matching profile(s)")
 
-        # Apply sorting if requested
-        if args.sort:
-            sort_col = args.sort
-            ascending = True
-            if sort_col.startswith("-"):
-                ascending = False
-                sort_col = sort_col[1:]
+        # Family column when selecting or sorting by family
+        if families or (args.sort or "").lstrip("-").lower() == "family":
+            from airfoil_families import add_family_column, select_families
 
-            if sort_col in df.columns:
-                df = df.sort_values(by=sort_col, ascending=ascending)
-            else:
-                print(
-                    f"Warning: Column '{sort_col}' not found. Available columns: {', '.join(df.columns)}"
+            df = select_families(add_family_column(df), families)
+            if df.empty:
+                print("No profiles match the specified families.")
+                return
+
+        # Add the Reynolds-scaling fits if requested or needed for sorting
+        from re_scaling import FIT_COLUMNS, merge_re_fits, needs_re_fits
+
+        sort_key = (args.sort or "").lstrip("-")
+        if (args.re_fits or needs_re_fits([sort_key])) and not (
+            set(FIT_COLUMNS) & set(df.columns)
+        ):
+            df = merge_re_fits(df, args.polars_dir)
+
+        # Apply sorting if requested (by 'merge' for partial shard outputs)
+        if shard:
+            if args.sort or args.top:
+                print("Note: --sort/--top are applied when merging shard outputs")
+            print(f"Shard {args.shard}: {len(df)} polar(s)")
+        else:
+            df = _sort_table(df, args.sort, args.top)
+
+        if not _export_table(df, args):
+            print(df.to_string(index=False))
+
+    elif args.action == "export":
+        if not args.out:
+            print("Error: must specify --out for export (e.g. corpus.parquet)")
+            return
+        from corpus_io import export_corpus
+
+        n_rows = export_corpus(
+            args.out,
+            polars_dir=args.polars_dir,
+            profiles=profiles,
+            re_filter=args.re,
+            fmt=args.format,
+        )
+        print(f"Exported {n_rows} polar points to {args.out}")
+
+    elif args.action == "import-db":
+        if not args.out:
+            print("Error: must specify --out for import-db (e.g. polars.sqlite)")
+            return
+        from polar_db import import_corpus
+
+        n_polars = import_corpus(
+            args.out,
+            polars_dir=args.polars_dir,
+            profiles=profiles,
+            re_filter=args.re,
+        )
+        print(f"Imported {n_polars} polars into {args.out}")
+
+    elif args.action == "tensor":
+        from polar_tensor import build_polar_tensor, save_polar_tensor
+
+        alpha_min, alpha_max = _parse_alphas(args.alpha_range)
+        tensor = build_polar_tensor(
+            polars_dir=args.polars_dir,
+            profiles=profiles,
+            re_filter=args.re,
+            alpha_min=alpha_min,
+            alpha_max=alpha_max,
+            alpha_step=args.alpha_step,
+            max_gap=args.max_gap,
+        )
+        n_p, n_r, n_a, n_c = tensor["data"].shape
+        print(
+            f"Polar tensor: {n_p} profiles x {n_r} Re x {n_a} alpha x {n_c} coefficients "
+            f"({', '.join(tensor['coeffs'])})"
+        )
+        print(f"Valid points: {tensor['mask'].mean():.1%} of the grid")
+        if tensor["path"]:
+            print(f"Cached in {tensor['path']}")
+        if args.out:
+            out = save_polar_tensor(tensor, args.out)
+            print(f"Tensor saved to {out}")
+
+    elif args.action == "mission":
+        import pandas as pd
+
+        from mission import mission_ranking
+
+        if not args.chord or not args.wing_area:
+            print("Error: mission requires --chord and --wing-area")
+            return
+        segments = [_parse_alphas(seg) for seg in args.segment or []]
+        if args.segments:
+            segments = pd.read_csv(args.segments)
+        if len(segments) == 0:
+            print("Error: mission requires --segment or --segments")
+            return
+
+        ranking, seg_table = mission_ranking(
+            segments,
+            chord=args.chord,
+            wing_area=args.wing_area,
+            rho=args.rho,
+            mu=args.mu,
+            polars_dir=args.polars_dir,
+            profiles=profiles,
+        )
+
+        # Apply filters (evaluated on the limits at --re) if provided
+        if args.filter:
+            filter_criteria, _ = _parse_filter_criteria(args.filter)
+            if filter_criteria:
+                filtered_df = filter_profiles(
+                    polars_dir=args.polars_dir,
+                    profiles=profiles,
+                    re_filter=args.re,
+                    criteria=filter_criteria,
                 )
+                keep = ranking["Profile"].isin(set(filtered_df["Profile"]))
+                ranking = ranking[keep].reset_index(drop=True)
+                ranking["Rank"] = range(1, len(ranking) + 1)
+                print(f"Filtered to {len(ranking)} profile(s) matching criteria")
+
+        if len(seg_table) <= 20:
+            print(seg_table.to_string(index=False))
+        else:
+            print(f"{len(seg_table)} flight segments")
+        ranking = ranking.head(args.top) if args.top else ranking
+        if not _export_table(ranking, args):
+            print(ranking.to_string(index=False))
 
+    elif args.action == "wing":
+        from wing_eval import load_stations, wing_ranking
+
+        if not args.stations or not args.speed:
+            print("Error: wing requires --stations and --speed")
+            return
+        # Apply filters (evaluated on the limits at --re) if provided
+        candidates = None
+        if args.filter:
+            filter_criteria, _ = _parse_filter_criteria(args.filter)
+            if filter_criteria:
+                filtered_df = filter_profiles(
+                    polars_dir=args.polars_dir,
+                    profiles=profiles,
+                    re_filter=args.re,
+                    criteria=filter_criteria,
+                )
+                candidates = set(filtered_df["Profile"])
+                if not candidates:
+                    print("No profiles match the specified criteria.")
+                    return
+                print(f"Filtered to {len(candidates)} profile(s) matching criteria")
+        try:
+            stations = load_stations(args.stations)
+            ranking, station_table = wing_ranking(
+                stations,
+                speed=args.speed,
+                weight=args.weight,
+                rho=args.rho,
+                mu=args.mu,
+                polars_dir=args.polars_dir,
+                profiles=profiles,
+                candidates=candidates,
+            )
+        except (RuntimeError, ValueError) as e:
+            print(f"Error: {e}")
+            return
+
+        print(f"Stations (best profile: {ranking['Profile'].iloc[0]}):")
+        if len(station_table) <= 40:
+            print(station_table.to_string(index=False))
+        else:
+            print(f"{len(station_table)} stations")
+        ranking = ranking.head(args.top) if args.top else ranking
+        if not _export_table(ranking, args):
+            print(ranking.to_string(index=False))
+
+    elif args.action == "best-map":
+        import numpy as np
+
+        from best_map import best_airfoil_map, plot_best_map
+        from polar_tensor import build_polar_tensor
+
+        try:
+            tensor = build_polar_tensor(args.polars_dir, profiles)
+        except RuntimeError as e:
+            print(f"Error: {e}")
+            return
+        re_min, re_max = tensor["re"][0], tensor["re"][-1]
+        if args.re_range:
+            re_min, re_max = (v * 1e6 for v in _parse_alphas(args.re_range))
+        if args.re_points:
+            re_grid = np.geomspace(re_min, re_max, args.re_points).round(-3)
+        else:
+            re_grid = tensor["re"][(tensor["re"] >= re_min) & (tensor["re"] <= re_max)]
+        cl_min, cl_max = _parse_alphas(args.cl_range)
+        cl_grid = np.arange(cl_min, cl_max + args.cl_step / 2, args.cl_step).round(6)
+        if len(re_grid) == 0 or len(cl_grid) == 0:
+            print("Error: empty Re or Cl grid")
+            return
+
+        # Apply filters (evaluated on the limits at --re) if provided
+        candidates = None
+        if args.filter:
+            filter_criteria, _ = _parse_filter_criteria(args.filter)
+            if filter_criteria:
+                filtered_df = filter_profiles(
+                    polars_dir=args.polars_dir,
+                    profiles=profiles,
+                    re_filter=args.re,
+                    criteria=filter_criteria,
+                )
+                candidates = set(filtered_df["Profile"])
+                print(f"Filtered to {len(candidates)} profile(s) matching criteria")
+        try:
+            table = best_airfoil_map(
+                re_grid, cl_grid, tensor=tensor, candidates=candidates
+            )
+        except RuntimeError as e:
+            print(f"Error: {e}")
+            return
+
+        wins = table.loc[table["Best"] != "", "Best"].value_counts()
+        print(
+            f"{len(re_grid)} Re x {len(cl_grid)} Cl cells, "
+            f"{len(wins)} winning profile(s):"
+        )
+        print(
+            wins.rename_axis("Profile").reset_index(name="Cells").to_string(index=False)
+        )
         if args.csv:
-            df.to_csv(args.csv, index=False, encoding="utf-8-sig")
+            table.to_csv(args.csv, index=False, encoding="utf-8-sig")
             print(f"Data exported to {args.csv}")
-        else:
+        if args.out or not args.csv:
+            plot_best_map(table, out_path=args.out)
+
+    elif args.action == "families":
+        from airfoil_families import family_statistics
+
+        filter_criteria, _ = _parse_filter_criteria(args.filter)
+        try:
+            res = family_statistics(
+                polars_dir=args.polars_dir,
+                profiles=profiles,
+                re_filter=args.re,
+                families=families,
+                criteria=filter_criteria,
+                metrics=_parse_csv_list(args.metrics),
+            )
+        except (RuntimeError, ValueError) as e:
+            print(f"Error: {e}")
+            return
+        if res.empty:
+            print("No profiles match the specified criteria.")
+            return
+        res = _sort_table(res, args.sort, args.top)
+        if not _export_table(res, args):
+            print(res.to_string(index=False))
+
+    elif args.action == "cluster":
+        from cluster_profiles import cluster_profiles, plot_clusters
+
+        re_min = re_max = None
+        if args.re_range:
+            re_min, re_max = (v * 1e6 for v in _parse_alphas(args.re_range))
+        try:
+            res = cluster_profiles(
+                polars_dir=args.polars_dir,
+                profiles=profiles,
+                re_min=re_min,
+                re_max=re_max,
+                n_clusters=args.clusters,
+                method=args.cluster_method,
+                seed=args.seed,
+            )
+        except (RuntimeError, ValueError) as e:
+            print(f"Error: {e}")
+            return
+        print(
+            f"{len(res['assignments'])} profiles in {args.clusters} clusters "
+            f"({args.cluster_method}), silhouette {res['silhouette']:.3f}"
+        )
+        print(res["summary"].to_string(index=False))
+        if not _export_table(res["assignments"], args):
+            print()
+            print(res["assignments"].to_string(index=False))
+        if args.out or not (args.csv or args.format):
+            plot_clusters(res, out_path=args.out)
+
+    elif args.action == "robustness":
+        from robustness import plot_rank_distribution, robustness_ranking
+
+        re_min = re_max = None
+        if args.re_range:
+            re_min, re_max = (v * 1e6 for v in _parse_alphas(args.re_range))
+        elif not args.re:
+            print("Error: robustness requires a nominal --re or a --re-range")
+            return
+        filter_criteria, _ = _parse_filter_criteria(args.filter)
+        try:
+            res = robustness_ranking(
+                polars_dir=args.polars_dir,
+                profiles=profiles,
+                re_filter=args.re,
+                criteria=filter_criteria,
+                objective=args.objective,
+                sort=args.sort,
+                normalize=args.normalize,
+                n_samples=args.samples,
+                re_spread=args.re_spread,
+                threshold_spread=args.threshold_spread,
+                re_min=re_min,
+                re_max=re_max,
+                seed=args.seed,
+            )
+        except (RuntimeError, ValueError) as e:
+            print(f"Error: {e}")
+            return
+        summary = res["summary"]
+        ever = summary["P(selected)"] > 0
+        print(
+            f"{res['n_samples']} samples, objective {res['objective']}: "
+            f"{ever.sum()} of {len(summary)} profiles selected at least once"
+        )
+        summary = summary[ever].reset_index(drop=True)
+        summary = summary.head(args.top) if args.top else summary
+        if not _export_table(summary, args):
+            print(summary.to_string(index=False))
+        if args.out and not args.format:
+            plot_rank_distribution(res, out_path=args.out, top=args.top or 15)
+
+    elif args.action == "similar":
+        from similarity import similar_profiles
+
+        if not args.query:
+            print("Error: must specify --query for similar")
+            return
+        re_min = re_max = None
+        if args.re_range:
+            re_min, re_max = (v * 1e6 for v in _parse_alphas(args.re_range))
+        try:
+            res = similar_profiles(
+                args.query,
+                re_min=re_min,
+                re_max=re_max,
+                k=args.top or 10,
+                polars_dir=args.polars_dir,
+                candidates=profiles,
+            )
+        except (RuntimeError, ValueError) as e:
+            print(f"Error: {e}")
+            return
+        if not _export_table(res, args):
+            print(res.to_string(index=False))
+
+    elif args.action == "rank":
+        from rank_profiles import rank_profiles
+
+        if not args.objective:
+            print("Error: must specify --objective for rank")
+            return
+        filter_criteria, _ = _parse_filter_criteria(args.filter)
+        try:
+            res = rank_profiles(
+                args.objective,
+                polars_dir=args.polars_dir,
+                profiles=profiles,
+                re_filter=args.re,
+                normalize=args.normalize,
+                top=args.top,
+                criteria=filter_criteria,
+                across_re=args.across_re,
+            )
+        except ValueError as e:
+            print(f"Error: {e}")
+            return
+        if res.empty:
+            print("No profiles match the specified criteria.")
+        elif not _export_table(res, args):
+            print(res.to_string(index=False))
+
+    elif args.action == "surrogate":
+        from polar_surrogate import (
+            build_surrogates,
+            error_table,
+            save_surrogates,
+            surrogate_table,
+        )
+        from polars_reader import cache_dir, select_polar_files
+
+        tolerance = {}
+        for item in _parse_csv_list(args.tolerance) or []:
+            key, _, value = item.partition("=")
+            key = {"cl": "CL", "cd": "CD", "cm": "Cm"}.get(key.strip().lower())
+            if key is None or not value:
+                print(f"Error: invalid tolerance '{item}' (use cl=, cd= or cm=)")
+                return
+            tolerance[key] = float(value)
+
+        store = build_surrogates(
+            polars_dir=args.polars_dir,
+            profiles=profiles,
+            re_filter=args.re,
+            tolerance=tolerance,
+        )
+        # With --format, --out is the table and the surrogates go to the cache
+        out = (
+            Path(args.out)
+            if args.out and not args.format
+            else cache_dir(args.polars_dir) / "surrogates.npz"
+        )
+        out = save_surrogates(store, out)
+        errors = error_table(store)
+        raw_size = sum(
+            f.stat().st_size
+            for f in select_polar_files(args.polars_dir, profiles, args.re)
+            if f.exists()
+        )
+        print(
+            f"Saved {len(errors)} polar surrogates to {out} "
+            f"({errors['Knots'].sum()} knots for {errors['Points'].sum()} points, "
+            f"{out.stat().st_size / 1e6:.2f} MB"
+            + (f" vs {raw_size / 1e6:.2f} MB of polar files)" if raw_size else ")")
+        )
+        print(
+            "Max error: "
+            + ", ".join(
+                f"{c} {errors[f'max |err {c}|'].max():.2g}" for c in ("CL", "CD", "Cm")
+            )
+        )
+        table = surrogate_table(store, alphas) if alphas else errors
+        if not _export_table(table, args) and alphas:
+            print(table.to_string(index=False))
+
+    elif args.action == "merge":
+        from shards import merge_shard_outputs
+
+        if not args.inputs:
+            print("Error: must specify --inputs for merge (e.g. 'limits_*.csv')")
+            return
+        df, paths = merge_shard_outputs(args.inputs)
+        print(f"Merged {len(paths)} shard output(s): {len(df)} rows")
+        df = _sort_table(df, args.sort, args.top)
+        if not _export_table(df, args):
             print(df.to_string(index=False))
 
+    elif args.action == "diff":
+        from diff_polars import diff_directories
+
+        if len(args.polars_dirs) != 2:
+            print("Error: 'diff' needs exactly two --polars-dir")
+            return
+        res = diff_directories(
+            *args.polars_dirs,
+            profiles=profiles,
+            re_filter=args.re,
+            workers=args.workers,
+        )
+        counts = res["Status"].value_counts()
+        print(
+            f"{len(res)} polars: {counts.get('identical', 0)} identical, "
+            f"{counts.get('changed', 0)} changed, "
+            f"{counts.get('only in first', 0)} only in {args.polars_dirs[0]}, "
+            f"{counts.get('only in second', 0)} only in {args.polars_dirs[1]}"
+        )
+        res = res[res["Status"] != "identical"]
+        if not _export_table(res, args) and not res.empty:
+            print(res.to_string(index=False))
+
+    elif args.action == "check":
+        from check_polars import REPORT_FILE, check_corpus
+        from polars_reader import QUARANTINE_FILE, cache_dir
+
+        report = check_corpus(
+            polars_dir=args.polars_dir,
+            profiles=profiles,
+            re_filter=args.re,
+            workers=args.workers,
+        )
+        counts = report["Status"].value_counts()
+        print(
+            f"Checked {len(report)} polar files: {counts.get('ok', 0)} ok, "
+            f"{counts.get('warning', 0)} with warnings, {counts.get('bad', 0)} bad"
+        )
+        issues = report[report["Status"] != "ok"]
+        if not issues.empty:
+            print(issues.to_string(index=False))
+
+        if not _export_table(report, args):
+            out = cache_dir(args.polars_dir) / REPORT_FILE
+            out.parent.mkdir(parents=True, exist_ok=True)
+            report.to_csv(out, index=False, encoding="utf-8-sig")
+            print(f"Report written to {out}")
+        if counts.get("bad", 0):
+            print(
+                f"Bad files quarantined in {cache_dir(args.polars_dir) / QUARANTINE_FILE} "
+                "(skipped by the loaders until they change)"
+            )
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,183 @@
+"""Mission-weighted airfoil ranking over a set of flight segments."""
+
+import numpy as np
+import pandas as pd
+
+from polar_tensor import build_polar_tensor, coefficient
+
+# Standard sea-level air
+RHO = 1.225  # kg/m^3
+MU = 1.81e-5  # Pa s
+
+CL_STEP = 0.01
+
+
+def drag_polar_grid(tensor, cl_grid):
+    """
+    Tabulate Cd(Cl) of every polar of a tensor on a common Cl grid.
+
+    Only the attached branch is used, from the minimum to the maximum Cl of
+    each polar, keeping the points where Cl keeps increasing. Returns an
+    array (profiles, re, len(cl_grid)) with NaN outside that Cl range.
+    """
+    cl_all = coefficient(tensor, "CL")
+    cd_all = coefficient(tensor, "CD")
+    n_p, n_r, _ = cl_all.shape
+    cd_grid = np.full((n_p, n_r, len(cl_grid)), np.nan)
+    for i in range(n_p):
+        for k in range(n_r):
+            cl = cl_all[i, k]
+            valid = ~np.isnan(cl)
+            if valid.sum() < 2:
+                continue
+            cl, cd = cl[valid], cd_all[i, k][valid]
+            lo, hi = int(np.argmin(cl)), int(np.argmax(cl))
+            if hi <= lo:
+                continue
+            cl, cd = cl[lo : hi + 1], cd[lo : hi + 1]
+            rising = np.r_[True, cl[1:] > np.maximum.accumulate(cl)[:-1]]
+            cl, cd = cl[rising], cd[rising]
+            inside = (cl_grid >= cl[0]) & (cl_grid <= cl[-1])
+            cd_grid[i, k, inside] = np.interp(cl_grid[inside], cl, cd)
+    return cd_grid
+
+
+def interp_cd(re_values, cl_grid, cd_grid, re_points, cl_points):
+    """
+    Bilinear interpolation of Cd in (log Re, Cl) for all profiles at once.
+
+    Parameters:
+    -----------
+    re_values : array (R,)
+        Shipped Reynolds numbers (sorted)
+    cl_grid : array (G,)
+        Uniform Cl grid of cd_grid
+    cd_grid : array (P, R, G)
+        Output of drag_polar_grid
+    re_points, cl_points : array (N,)
+        Operating points
+
+    Returns:
+    --------
+    np.ndarray (P, N)
+        Cd of every profile at every operating point; NaN when the point is
+        outside the shipped Re range or beyond a polar's Cl range.
+    """
+    re_points = np.atleast_1d(np.asarray(re_points, dtype=float))
+    cl_points = np.atleast_1d(np.asarray(cl_points, dtype=float))
+    log_re = np.log(re_values)
+    x = np.log(re_points)
+
+    ir = np.clip(np.searchsorted(log_re, x) - 1, 0, len(log_re) - 2)
+    wr = (x - log_re[ir]) / (log_re[ir + 1] - log_re[ir])
+    step = cl_grid[1] - cl_grid[0]
+    ic = np.clip(((cl_points - cl_grid[0]) // step).astype(int), 0, len(cl_grid) - 2)
+    wc = (cl_points - cl_grid[ic]) / step
+
+    def lerp(a, b, w):
+        # On a grid node take that node's value, so a NaN neighbour with zero
+        # weight does not leak in (NaN * 0 is NaN)
+        blend = a * (1 - w) + b * w
+        return np.where(w < 1e-9, a, np.where(w > 1 - 1e-9, b, blend))
+
+    cd = lerp(
+        lerp(cd_grid[:, ir, ic], cd_grid[:, ir + 1, ic], wr),
+        lerp(cd_grid[:, ir, ic + 1], cd_grid[:, ir + 1, ic + 1], wr),
+        wc,
+    )
+    outside = (
+        (x < log_re[0] - 1e-9)
+        | (x > log_re[-1] + 1e-9)
+        | (cl_points < cl_grid[0])
+        | (cl_points > cl_grid[-1])
+    )
+    cd[:, outside] = np.nan
+    return cd
+
+
+def mission_ranking(
+    segments,
+    chord,
+    wing_area,
+    rho=RHO,
+    mu=MU,
+    polars_dir=None,
+    profiles=None,
+    cl_step=CL_STEP,
+    tensor=None,
+):
+    """
+    Rank profiles by time-weighted drag over a set of flight segments.
+
+    Parameters:
+    -----------
+    segments : list or pd.DataFrame
+        Flight segments as (speed [m/s], weight [N], time fraction) tuples,
+        or a DataFrame with 'speed', 'weight' and 'fraction' columns
+    chord : float
+        Wing chord (m), used for the Reynolds number
+    wing_area : float
+        Wing area (m^2), used for the required Cl
+    rho, mu : float
+        Air density (kg/m^3) and dynamic viscosity (Pa s)
+    polars_dir : str
+        Directory containing polar files
+    profiles : list
+        List of profile name filters
+    cl_step : float
+        Step of the Cl grid used to tabulate Cd(Cl)
+    tensor : dict, optional
+        Prebuilt polar tensor (see polar_tensor.build_polar_tensor)
+
+    Returns:
+    --------
+    (pd.DataFrame, pd.DataFrame)
+        Ranking (one row per profile, best first; profiles that cannot fly
+        every segment are ranked last) and the segment table with Re and Cl
+    """
+    if not isinstance(segments, pd.DataFrame):
+        segments = pd.DataFrame(segments, columns=["speed", "weight", "fraction"])
+    speed = segments["speed"].to_numpy(dtype=float)
+    weight = segments["weight"].to_numpy(dtype=float)
+    frac = segments["fraction"].to_numpy(dtype=float)
+    frac = frac / frac.sum()
+
+    q = 0.5 * rho * speed**2
+    re_points = rho * speed * chord / mu
+    cl_points = weight / (q * wing_area)
+    segments = segments.assign(Re=re_points, Cl=cl_points)
+
+    if tensor is None:
+        tensor = build_polar_tensor(polars_dir, profiles)
+    cl_all = coefficient(tensor, "CL")
+    cl_grid = np.arange(
+        np.floor(np.nanmin(cl_all) / cl_step) * cl_step,
+        np.nanmax(cl_all) + cl_step,
+        cl_step,
+    )
+    cd_grid = drag_polar_grid(tensor, cl_grid)
+    cd = interp_cd(tensor["re"], cl_grid, cd_grid, re_points, cl_points)
+
+    feasible = ~np.isnan(cd)
+    drag = q * wing_area * cd  # (profiles, segments) in N
+    mission_drag = np.where(feasible, drag, 0.0) @ frac
+    weighted_cd = np.where(feasible, cd, 0.0) @ frac
+    n_ok = feasible.sum(axis=1)
+    all_ok = n_ok == len(frac)
+
+    ranking = pd.DataFrame(
+        {
+            "Profile": tensor["profiles"],
+            "Mission drag (N)": np.where(all_ok, mission_drag, np.nan),
+            "Weighted Cd": np.where(all_ok, weighted_cd, np.nan),
+            "Feasible segments": n_ok,
+        }
+    )
+    # Infeasible profiles last, ordered by how many segments they can fly
+    ranking = ranking.sort_values(
+        ["Mission drag (N)", "Feasible segments"],
+        ascending=[True, False],
+        na_position="last",
+    ).reset_index(drop=True)
+    ranking.insert(0, "Rank", np.arange(1, len(ranking) + 1))
+    return ranking, segments
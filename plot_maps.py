@@ -0,0 +1,231 @@
+"""Filled contour maps of the coefficients of a profile over Re x alpha."""
+
+import numpy as np
+import pandas as pd
+
+from figure_cache import cached_figure
+from polar_tensor import (
+    ALPHA_MAX,
+    ALPHA_MIN,
+    ALPHA_STEP,
+    MAX_GAP,
+    build_polar_tensor,
+    coefficient,
+)
+
+# Profiles drawn at most in one figure (one row of panels each)
+MAX_MAP_PROFILES = 8
+
+# Panels: (coefficient, title, colormap)
+MAP_PANELS = [
+    ("Cl_Cd", r"$C_l/C_d$", "viridis"),
+    ("CD", r"$C_d$", "magma_r"),
+    ("Cm", r"$C_m$", "RdBu_r"),
+]
+
+
+def _nanargmax(values):
+    """argmax along the last axis ignoring NaN; -1 where all values are NaN."""
+    valid = ~np.isnan(values)
+    idx = np.argmax(np.where(valid, values, -np.inf), axis=-1)
+    return np.where(valid.any(axis=-1), idx, -1)
+
+
+def map_ridges(tensor):
+    """
+    Locate the Cl_max and Cl/Cd_max ridges of every polar of a tensor.
+
+    Returns:
+    --------
+    pd.DataFrame
+        One row per profile and Re with a polar: Profile, Re,
+        'α @ Cl_max (deg)', 'Cl_max', 'α @ Cl/Cd_max (deg)' and 'Cl/Cd_max'
+        (read on the common alpha grid)
+    """
+    alpha = tensor["alpha"]
+    table = {}
+    for coeff, label in (("CL", "Cl_max"), ("Cl_Cd", "Cl/Cd_max")):
+        values = coefficient(tensor, coeff)
+        idx = _nanargmax(values)
+        ok = idx >= 0
+        safe = np.where(ok, idx, 0)
+        peak = np.take_along_axis(values, safe[..., None], axis=-1)[..., 0]
+        table[f"α @ {label} (deg)"] = np.where(ok, alpha[safe], np.nan)
+        table[label] = np.where(ok, peak, np.nan)
+
+    n_p, n_r = len(tensor["profiles"]), len(tensor["re"])
+    df = pd.DataFrame(
+        {
+            "Profile": np.repeat(tensor["profiles"], n_r),
+            "Re": np.tile(tensor["re"], n_p),
+            **{k: v.ravel() for k, v in table.items()},
+        }
+    )
+    return df.dropna(subset=["Cl_max"]).reset_index(drop=True)
+
+
+def _levels(values, log=False, n=16):
+    finite = values[np.isfinite(values)]
+    if log:
+        finite = finite[finite > 0]
+    if finite.size == 0:
+        return None
+    lo, hi = np.percentile(finite, [1, 99])
+    if hi <= lo:
+        return None
+    return np.geomspace(lo, hi, n) if log else np.linspace(lo, hi, n)
+
+
+@cached_figure("plot_polar_maps")
+def plot_polar_maps(
+    polars_dir=None,
+    profiles=None,
+    re_filter=None,
+    out_path=None,
+    alpha_min=ALPHA_MIN,
+    alpha_max=ALPHA_MAX,
+    alpha_step=ALPHA_STEP,
+    max_gap=MAX_GAP,
+    figsize=None,
+    dpi=None,
+    use_cache=True,
+    tensor=None,
+):
+    """
+    Plot contour maps of Cl/Cd, Cd and Cm over Re x alpha for each profile.
+
+    All polars of the selected profiles are resampled onto the common alpha
+    grid of the polar tensor, and each map is drawn from one (Re, alpha)
+    array. The Cl_max and Cl/Cd_max ridges (alpha of the maximum at each Re)
+    are drawn on every panel.
+
+    Parameters:
+    -----------
+    polars_dir : str
+        Directory containing polar files
+    profiles : list
+        List of profile name filters (at most MAX_MAP_PROFILES profiles)
+    re_filter : str
+        Reynolds number filter
+    out_path : str
+        Output file path for the figure
+    alpha_min, alpha_max, alpha_step, max_gap : float
+        Common alpha grid and largest interpolated gap (see build_polar_tensor)
+    figsize : tuple, optional
+        Figure size (width, height); grows with the number of profiles
+    dpi : int, optional
+        Resolution of the saved figure (default 300)
+    use_cache : bool
+        Copy an identical figure rendered before from the figure cache
+    tensor : dict, optional
+        Polar tensor already built with the same selection and grid (see
+        polar_tensor.build_polar_tensor)
+    """
+    import matplotlib.pyplot as plt
+    from matplotlib.colors import LogNorm, TwoSlopeNorm
+    from matplotlib.ticker import FixedLocator, FuncFormatter, NullFormatter
+
+    if tensor is None:
+        tensor = build_polar_tensor(
+            polars_dir,
+            profiles,
+            re_filter,
+            alpha_min=alpha_min,
+            alpha_max=alpha_max,
+            alpha_step=alpha_step,
+            max_gap=max_gap,
+        )
+    names = tensor["profiles"]
+    if len(names) > MAX_MAP_PROFILES:
+        raise RuntimeError(
+            f"{len(names)} profiles selected; narrow the selection to at most "
+            f"{MAX_MAP_PROFILES} with --profiles"
+        )
+    re_values, alpha = tensor["re"], tensor["alpha"]
+    if len(re_values) < 2:
+        raise RuntimeError("Contour maps need polars at two Reynolds numbers or more")
+    ridges = map_ridges(tensor)
+    re_ticks = [
+        r
+        for r in (1e4, 2e4, 5e4, 1e5, 2e5, 5e5, 1e6, 2e6, 5e6, 1e7)
+        if re_values[0] <= r <= re_values[-1]
+    ] or [re_values[0], re_values[-1]]
+
+    n_rows = len(names)
+    fig, axs = plt.subplots(
+        n_rows,
+        len(MAP_PANELS),
+        figsize=figsize or (18, 4.5 * n_rows + 1),
+        squeeze=False,
+    )
+    for i, name in enumerate(names):
+        valid = tensor["mask"][i].any(axis=0)
+        if not valid.any():
+            continue
+        lo, hi = np.flatnonzero(valid)[[0, -1]]
+        rows = slice(lo, hi + 1)
+        ridge = ridges[ridges["Profile"] == name]
+
+        for j, (coeff, label, cmap) in enumerate(MAP_PANELS):
+            ax = axs[i, j]
+            z = np.ma.masked_invalid(coefficient(tensor, coeff)[i][:, rows].T)
+            norm = None
+            levels = _levels(z.filled(np.nan), log=coeff == "CD")
+            if coeff == "CD" and levels is not None:
+                norm = LogNorm(levels[0], levels[-1])
+            elif coeff == "Cm" and levels is not None and levels[0] < 0 < levels[-1]:
+                norm = TwoSlopeNorm(0.0, levels[0], levels[-1])
+            cs = ax.contourf(
+                re_values,
+                alpha[rows],
+                z,
+                levels=levels if levels is not None else 10,
+                cmap=cmap,
+                norm=norm,
+                extend="both" if levels is not None else "neither",
+            )
+            cbar = fig.colorbar(cs, ax=ax)
+            if levels is not None:
+                ticks = levels[::3]
+                cbar.set_ticks(ticks)
+                cbar.set_ticklabels([f"{t:.3g}" for t in ticks])
+                cbar.ax.minorticks_off()
+            cbar.ax.tick_params(labelsize=11)
+
+            ax.plot(
+                ridge["Re"],
+                ridge["α @ Cl_max (deg)"],
+                "w-o",
+                lw=2,
+                ms=4,
+                mec="black",
+                label=r"$C_{l_{max}}$",
+            )
+            ax.plot(
+                ridge["Re"],
+                ridge["α @ Cl/Cd_max (deg)"],
+                "k--s",
+                lw=1.5,
+                ms=4,
+                mfc="white",
+                label=r"$(C_l/C_d)_{max}$",
+            )
+            ax.set_xscale("log")
+            ax.set_xlim(re_values[0], re_values[-1])
+            ax.xaxis.set_major_locator(FixedLocator(re_ticks))
+            ax.xaxis.set_major_formatter(FuncFormatter(lambda v, _: f"{v / 1e6:g}M"))
+            ax.xaxis.set_minor_formatter(NullFormatter())
+            ax.set_title(f"{name}: {label}", fontsize=15)
+            ax.set_xlabel("Re", fontsize=13)
+            ax.set_ylabel(r"$\alpha$ (°)", fontsize=13)
+            ax.tick_params(axis="both", labelsize=11)
+            if i == 0 and j == 0:
+                ax.legend(loc="lower right", fontsize=10, framealpha=0.8)
+
+    fig.suptitle("Mapas de coeficientes sobre Re y α", fontsize=20)
+    fig.tight_layout(rect=[0, 0, 1, 0.97])
+    if out_path:
+        fig.savefig(out_path, dpi=dpi or 300, bbox_inches="tight")
+        print("Saved figure to", out_path)
+    else:
+        plt.show()
@@ -2,12 +2,28 @@ import warnings
 
 import matplotlib.pyplot as plt
 
-from polars_reader import list_polar_files, parse_polar_file
+from figure_cache import cached_figure
+from polars_reader import parse_polar_file, select_polar_files
 
 # Suppress adjustText FancyArrowPatch warning
 warnings.filterwarnings("ignore", message=".*FancyArrowPatch.*")
 
 
+def profile_colors(n):
+    """
+    n distinct, saturated colours for profile curves.
+
+    tab20 + Dark2 + Set1 (37 colours, then repeated); avoids light colours
+    like yellow that don't show well.
+    """
+    import matplotlib.cm as cm
+
+    colors = [cm.get_cmap("tab20")(i) for i in range(20)]
+    colors += [cm.get_cmap("Dark2")(i / 8) for i in range(8)]
+    colors += [cm.get_cmap("Set1")(i / 9) for i in range(9)]
+    return [colors[i % len(colors)] for i in range(n)]
+
+
 def _match_re(filename, target_re):
     if target_re is None:
         return True
@@ -16,6 +32,7 @@ def _match_re(filename, target_re):
     return target_re in s
 
 
+@cached_figure("plot_polars")
 def plot_polars(
     polars_dir=None,
     profiles=None,
@@ -24,6 +41,9 @@ def plot_polars(
     figsize=(16, 12),
     filter_criteria=None,
     filter_display=None,
+    parser=None,
+    dpi=None,
+    use_cache=True,
 ):
     """
     Plot polar curves for selected profiles.
@@ -37,7 +57,8 @@ def plot_polars(
     re_filter : str
         Reynolds number filter
     out_path : str
-        Output file path for the figure
+        Output file path for the figure. A '.html' path writes an
+        interactive report instead (see html_report.write_html_report)
     figsize : tuple
         Figure size (width, height)
     filter_criteria : dict
@@ -45,12 +66,38 @@ def plot_polars(
         If provided, only profiles matching these criteria will be plotted
     filter_display : dict
         Original filter criteria for display (with user's original aliases)
+    parser : callable, optional
+        Function used to parse each polar file (defaults to parse_polar_file)
+    dpi : int, optional
+        Resolution of the saved figure (default 300)
+    use_cache : bool
+        Copy an identical figure rendered before from the figure cache
+        instead of rendering it again (see figure_cache.cached_figure)
     """
+    if out_path and str(out_path).lower().endswith(".html"):
+        from html_report import write_html_report
+
+        write_html_report(
+            out_path,
+            polars_dir,
+            profiles,
+            re_filter,
+            kind="polars",
+            filter_criteria=filter_criteria,
+            filter_display=filter_display,
+            parser=parser,
+        )
+        return
+
+    parser = parser or parse_polar_file
+
     # Apply filter criteria if provided
     if filter_criteria:
         from filter_profiles import filter_profiles
 
-        filtered_df = filter_profiles(polars_dir, profiles, re_filter, filter_criteria)
+        filtered_df = filter_profiles(
+            polars_dir, profiles, re_filter, filter_criteria, parser=parser
+        )
 
         if filtered_df.empty:
             raise RuntimeError("No profiles match the filter criteria")
@@ -58,20 +105,11 @@ def plot_polars(
         # Get list of profile names from filtered results
         profiles = filtered_df["Profile"].tolist()
 
-    files = list_polar_files(polars_dir)
-    # filter by profiles list if provided (list of names or substrings)
-    if profiles:
-        procs = []
-        for p in profiles:
-            for f in files:
-                if p in f.name:
-                    procs.append(f)
-        files = sorted(set(procs), key=lambda p: p.name)
-    # filter by re
+    # filter by profiles list (names or substrings) and by re
+    files = select_polar_files(polars_dir, profiles, re_filter)
     re_value = None
     re_display = None
     if re_filter:
-        files = [f for f in files if re_filter in f.name]
         # Extract Re value for title and convert to actual Reynolds number
         re_value = re_filter
         try:
@@ -93,27 +131,10 @@ def plot_polars(
     # Use only solid lines for better readability
     linestyle = "-"
 
-    # Generate colors dynamically using matplotlib colormaps
-    # Use tab20 + Dark2 + Set1 for distinct, saturated colors
-    # Avoids light colors like yellow that don't show well
-    import matplotlib.cm as cm
-
-    # Get qualitative colormaps with saturated colors
-    tab20_cmap = cm.get_cmap("tab20")
-    dark2_cmap = cm.get_cmap("Dark2")
-    set1_cmap = cm.get_cmap("Set1")
-
-    # Sample colors from each colormap
-    tab20_colors = [tab20_cmap(i) for i in range(20)]
-    dark2_colors = [dark2_cmap(i / 8) for i in range(8)]
-    set1_colors = [set1_cmap(i / 9) for i in range(9)]
-
-    # Combine all colors - total 37 distinct colors
-    all_colors = tab20_colors + dark2_colors + set1_colors
-    colors = [all_colors[i % len(all_colors)] for i in range(num_profiles)]
+    colors = profile_colors(num_profiles)
 
     for i, f in enumerate(files):
-        parsed = parse_polar_file(f)
+        parsed = parser(f)
         df = parsed["df"]
         # Only use profile name in legend, no Reynolds
         label = parsed["name"]
@@ -274,12 +295,13 @@ def plot_polars(
     # Adjust layout to maximize plot area while keeping space for legend
     fig.tight_layout(rect=[0, 0, 0.90, 0.97])
     if out_path:
-        fig.savefig(out_path, dpi=300, bbox_inches="tight")
+        fig.savefig(out_path, dpi=dpi or 300, bbox_inches="tight")
         print("Saved figure to", out_path)
     else:
         plt.show()
 
 
+@cached_figure("plot_clmax_vs_clideal")
 def plot_clmax_vs_clideal(
     polars_dir=None,
     profiles=None,
@@ -288,6 +310,9 @@ def plot_clmax_vs_clideal(
     figsize=(12, 10),
     filter_criteria=None,
     filter_display=None,
+    parser=None,
+    dpi=None,
+    use_cache=True,
 ):
     """
     Plot Cl_max vs Cl_ideal (Cl at Cd_min) for profile comparison.
@@ -304,18 +329,43 @@ def plot_clmax_vs_clideal(
     re_filter : str
         Reynolds number filter
     out_path : str
-        Output file path for the figure
+        Output file path for the figure. A '.html' path writes an
+        interactive report instead (see html_report.write_html_report)
     figsize : tuple
         Figure size (width, height)
     filter_criteria : dict
         Filter criteria dict {param: (operator, value)}
     filter_display : dict
         Original filter criteria for display
+    parser : callable, optional
+        Function used to parse each polar file (defaults to parse_polar_file)
+    dpi : int, optional
+        Resolution of the saved figure (default 600)
+    use_cache : bool
+        Copy an identical figure rendered before from the figure cache
+        instead of rendering it again (see figure_cache.cached_figure)
     """
+    if out_path and str(out_path).lower().endswith(".html"):
+        from html_report import write_html_report
+
+        write_html_report(
+            out_path,
+            polars_dir,
+            profiles,
+            re_filter,
+            kind="clmax",
+            filter_criteria=filter_criteria,
+            filter_display=filter_display,
+            parser=parser,
+        )
+        return
+
     from extract_limits import extract_limits
 
     # Get limits data with Cl_ideal
-    df = extract_limits(polars_dir=polars_dir, profiles=profiles, re_filter=re_filter)
+    df = extract_limits(
+        polars_dir=polars_dir, profiles=profiles, re_filter=re_filter, parser=parser
+    )
 
     if df.empty:
         raise RuntimeError("No profiles to plot")
@@ -366,20 +416,8 @@ def plot_clmax_vs_clideal(
     # Create figure
     fig, ax = plt.subplots(figsize=figsize)
 
-    # Generate colors for profiles
-    import matplotlib.cm as cm
-
-    tab20_cmap = cm.get_cmap("tab20")
-    dark2_cmap = cm.get_cmap("Dark2")
-    set1_cmap = cm.get_cmap("Set1")
-
-    tab20_colors = [tab20_cmap(i) for i in range(20)]
-    dark2_colors = [dark2_cmap(i / 8) for i in range(8)]
-    set1_colors = [set1_cmap(i / 9) for i in range(9)]
-
-    all_colors = tab20_colors + dark2_colors + set1_colors
     num_profiles = len(df)
-    colors = [all_colors[i % len(all_colors)] for i in range(num_profiles)]
+    colors = profile_colors(num_profiles)
 
     # Plot each profile with annotations above points
     texts = []
@@ -604,9 +642,9 @@ def plot_clmax_vs_clideal(
         # High resolution for presentations
         # Use bbox_inches="tight" with extra padding to avoid cutting the filter box
         if filter_display:
-            fig.savefig(out_path, dpi=600, bbox_inches="tight", pad_inches=0.2)
+            fig.savefig(out_path, dpi=dpi or 600, bbox_inches="tight", pad_inches=0.2)
         else:
-            fig.savefig(out_path, dpi=600, bbox_inches="tight")
+            fig.savefig(out_path, dpi=dpi or 600, bbox_inches="tight")
         print(f"Saved figure to {out_path}")
     else:
         plt.show()
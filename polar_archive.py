@@ -0,0 +1,262 @@
+"""Zip and tar archives of polar files as data sources (read without extracting)."""
+
+import hashlib
+import json
+import tarfile
+import threading
+import zipfile
+from pathlib import Path
+
+from polars_reader import cache_dir, file_signature, parse_polar_text
+
+# Archive suffixes handled here (registered in polars_reader.SOURCE_BACKENDS)
+ARCHIVE_SUFFIXES = [".zip", ".tar", ".tar.gz", ".tgz", ".tar.zst", ".tzst"]
+
+_indexes = {}  # resolved archive path -> (signature, index)
+_streams = {}  # resolved archive path -> (signature, ZipFile or _TarStream)
+_lock = threading.Lock()
+
+
+def archive_kind(path):
+    """Return 'zip', 'tar', 'tar.gz' or 'tar.zst' for an archive path."""
+    name = Path(path).name.lower()
+    if name.endswith(".zip"):
+        return "zip"
+    if name.endswith((".tar.gz", ".tgz")):
+        return "tar.gz"
+    if name.endswith((".tar.zst", ".tzst")):
+        return "tar.zst"
+    if name.endswith(".tar"):
+        return "tar"
+    raise ValueError(f"Unsupported archive '{path}'")
+
+
+def _open_zstd(path):
+    try:
+        from compression import zstd  # Python >= 3.14
+
+        return zstd.open(path, "rb")
+    except ImportError:
+        pass
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError(
+            "zstandard is required for .tar.zst archives (pip install zstandard)"
+        ) from None
+    return zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+
+
+class _ZstdTarFile(tarfile.TarFile):
+    """Tar stream over a zstd decompressor, closing both together."""
+
+    def close(self):
+        try:
+            super().close()
+        finally:
+            self.source.close()
+
+
+def _open_tar_stream(path):
+    """Open a tar archive for one sequential pass over its members."""
+    kind = archive_kind(path)
+    if kind == "tar.zst":
+        source = _open_zstd(path)
+        tar = _ZstdTarFile.open(fileobj=source, mode="r|")
+        tar.source = source
+        return tar
+    return tarfile.open(path, mode="r|gz" if kind == "tar.gz" else "r|")
+
+
+def _is_polar(name):
+    return name.lower().endswith(".txt") and not Path(name).name.startswith(".")
+
+
+def _scan(path):
+    """Read the member list of an archive: [[name, member name, offset, size], ...]."""
+    entries = []
+    if archive_kind(path) == "zip":
+        with zipfile.ZipFile(path) as z:
+            for info in z.infolist():
+                if not info.is_dir() and _is_polar(info.filename):
+                    entries.append([Path(info.filename).name, info.filename, 0, 0])
+        return entries
+    with _open_tar_stream(path) as tar:
+        for info in tar:
+            if info.isfile() and _is_polar(info.name):
+                entries.append(
+                    [Path(info.name).name, info.name, info.offset_data, info.size]
+                )
+    return entries
+
+
+def _index_path(path):
+    h = hashlib.sha1(repr((Path(path).name, file_signature(path))).encode())
+    return cache_dir(path) / f"archive_index_{h.hexdigest()[:16]}.json"
+
+
+def member_index(path):
+    """
+    Return the member index of an archive, in archive order.
+
+    The index maps each polar file name to its member name and, for tar
+    archives, the data offset and size. It is built with one pass over the
+    archive and stored in the cache directory next to it (keyed by the
+    archive name, modification time and size), so listing a compressed tar
+    does not decompress it again.
+
+    Returns:
+    --------
+    dict
+        name -> (position, member name, offset, size)
+    """
+    path = Path(path)
+    key = str(path.resolve())
+    signature = file_signature(path)
+    with _lock:
+        cached = _indexes.get(key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+    index_path = _index_path(path)
+    if index_path.exists():
+        entries = json.loads(index_path.read_text(encoding="utf-8"))
+    else:
+        entries = _scan(path)
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        index_path.write_text(json.dumps(entries), encoding="utf-8")
+
+    index = {}
+    for i, (name, member, offset, size) in enumerate(entries):
+        if name in index:
+            print(
+                f"WARNING: Duplicate polar '{name}' in '{path.name}', keeping the first"
+            )
+            continue
+        index[name] = (i, member, offset, size)
+    with _lock:
+        _indexes[key] = (signature, index)
+    return index
+
+
+def list_members(path):
+    """List the polar file names stored in an archive."""
+    return sorted(member_index(path))
+
+
+class _TarStream:
+    """
+    Forward-only reader of a compressed tar archive.
+
+    Reading members in archive order continues the same decompression pass;
+    asking for a member already passed starts a new pass.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.tar = None
+        self.position = -1
+
+    def read(self, position, member):
+        with self.lock:
+            if self.tar is None or position <= self.position:
+                self.close()
+                self.tar = _open_tar_stream(self.path)
+                self.position = -1
+            # next() continues the pass; iterating the TarFile would start
+            # again from the first member it has already seen
+            info = self.tar.next()
+            while info is not None:
+                if info.isfile() and _is_polar(info.name):
+                    self.position += 1
+                    if info.name == member:
+                        return self.tar.extractfile(info).read()
+                info = self.tar.next()
+            self.close()
+        raise FileNotFoundError(f"'{member}' not found in archive '{self.path}'")
+
+    def close(self):
+        if self.tar is not None:
+            self.tar.close()
+            self.tar = None
+
+
+def _handle(path, factory):
+    """Open reader of an archive (ZipFile or _TarStream), reopened when it changes."""
+    key = str(Path(path).resolve())
+    signature = file_signature(path)
+    with _lock:
+        cached = _streams.get(key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        if cached is not None:
+            cached[1].close()
+        handle = factory(path)
+        _streams[key] = (signature, handle)
+        return handle
+
+
+def _read_bytes(path, entry):
+    position, member, offset, size = entry
+    kind = archive_kind(path)
+    if kind == "zip":
+        return _handle(path, zipfile.ZipFile).read(member)
+    if kind == "tar":
+        # Uncompressed tar: members are read directly at their offset
+        with open(path, "rb") as f:
+            f.seek(offset)
+            return f.read(size)
+    return _handle(path, _TarStream).read(position, member)
+
+
+def _parse(path, name, data):
+    text = data.decode("utf-8", errors="ignore")
+    return parse_polar_text(text, Path(path) / name)
+
+
+def read_member(path, name):
+    """Return one polar of an archive in the parse_polar_file format."""
+    entry = member_index(path).get(name)
+    if entry is None:
+        raise FileNotFoundError(f"'{name}' not found in archive '{path}'")
+    return _parse(path, name, _read_bytes(path, entry))
+
+
+def read_members(path, names):
+    """
+    Parse several polars of an archive in one sequential pass.
+
+    Yields (name, parsed) in archive order. Only the requested members are
+    decompressed and parsed; a compressed tar is read once, up to the last
+    requested member.
+    """
+    index = member_index(path)
+    missing = [n for n in names if n not in index]
+    if missing:
+        raise FileNotFoundError(f"'{missing[0]}' not found in archive '{path}'")
+    wanted = sorted(set(names), key=lambda n: index[n][0])
+    kind = archive_kind(path)
+
+    if kind == "zip":
+        with zipfile.ZipFile(path) as z:
+            for name in wanted:
+                yield name, _parse(path, name, z.read(index[name][1]))
+        return
+    if kind == "tar":
+        with open(path, "rb") as f:
+            for name in wanted:
+                _, _, offset, size = index[name]
+                f.seek(offset)
+                yield name, _parse(path, name, f.read(size))
+        return
+
+    by_member = {index[n][1]: n for n in wanted}
+    with _open_tar_stream(path) as tar:
+        for info in tar:
+            name = by_member.pop(info.name, None)
+            if name is None:
+                continue
+            yield name, _parse(path, name, tar.extractfile(info).read())
+            if not by_member:
+                break
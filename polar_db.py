@@ -0,0 +1,175 @@
+"""SQLite-backed polar store with indexed point queries."""
+
+import sqlite3
+from pathlib import Path
+
+import pandas as pd
+
+from extract_limits import compute_limits
+from polars_reader import parse_polar_file, select_polar_files
+
+# limits table column -> limits DataFrame column
+LIMITS_SQL_COLUMNS = {
+    "cl_alpha_deg": "Cl_alpha (deg⁻¹)",
+    "cl_alpha_rad": "Cl_alpha (rad⁻¹)",
+    "cm_0": "Cm_0",
+    "cd_min": "Cd_min",
+    "alpha_cd_min": "α @ Cd_min (deg)",
+    "cl_i": "Cl_i",
+    "cl_cd_at_cli": "Cl/Cd @ Cl_i",
+    "cl_max": "Cl_max",
+    "alpha_cl_max": "α @ Cl_max (deg)",
+    "cd_at_cl_max": "Cd @ Cl_max",
+    "cl_cd_max": "Cl/Cd_max",
+    "alpha_cl_cd_max": "α @ Cl/Cd_max (deg)",
+}
+
+_SCHEMA = f"""
+DROP TABLE IF EXISTS limits;
+DROP TABLE IF EXISTS points;
+DROP TABLE IF EXISTS polars;
+CREATE TABLE polars (
+    id INTEGER PRIMARY KEY,
+    file TEXT NOT NULL UNIQUE,
+    profile TEXT NOT NULL,
+    re REAL,
+    mach REAL,
+    ncrit REAL
+);
+CREATE TABLE points (
+    polar_id INTEGER NOT NULL REFERENCES polars(id),
+    alpha REAL NOT NULL,
+    CL REAL,
+    CD REAL,
+    CDp REAL,
+    Cm REAL,
+    Cl_Cd REAL
+);
+CREATE TABLE limits (
+    polar_id INTEGER PRIMARY KEY REFERENCES polars(id),
+    {", ".join(f"{c} REAL" for c in LIMITS_SQL_COLUMNS)}
+);
+"""
+
+# Indexes are created after the bulk insert, which is much faster
+_INDEXES = """
+CREATE INDEX idx_points_polar_alpha ON points(polar_id, alpha);
+CREATE INDEX idx_points_cl ON points(CL);
+CREATE INDEX idx_polars_profile ON polars(profile);
+CREATE INDEX idx_polars_re ON polars(re);
+ANALYZE;
+"""
+
+# Open read connections, keyed by path -> (mtime_ns, size, connection)
+_CONNECTIONS = {}
+
+
+def _connect(path):
+    """Return a cached read connection, reopened when the file changes."""
+    path = Path(path)
+    st = path.stat()
+    cached = _CONNECTIONS.get(path)
+    if cached and cached[:2] == (st.st_mtime_ns, st.st_size):
+        return cached[2]
+    if cached:
+        cached[2].close()
+    con = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+    _CONNECTIONS[path] = (st.st_mtime_ns, st.st_size, con)
+    return con
+
+
+def _sql_float(v):
+    # Plain Python float (not NumPy), with NaN stored as NULL
+    v = float(v)
+    return None if v != v else v
+
+
+def import_corpus(db_path, polars_dir=None, profiles=None, re_filter=None):
+    """
+    Load the selected polar files into a SQLite database.
+
+    Creates (replacing any previous import) a ``polars`` metadata table, a
+    ``points`` table indexed on (polar_id, alpha) and on CL, and a ``limits``
+    table with one row per polar (column names are the filter aliases).
+
+    Returns the number of imported polars.
+    """
+    files = select_polar_files(polars_dir, profiles, re_filter)
+    if not files:
+        raise RuntimeError("No polar files matched selection")
+
+    con = sqlite3.connect(db_path)
+    try:
+        con.executescript(_SCHEMA)
+        placeholders = ", ".join("?" * (len(LIMITS_SQL_COLUMNS) + 1))
+        n_polars = 0
+        with con:
+            for f in files:
+                p = parse_polar_file(f)
+                df = p["df"]
+                if df is None or df.empty:
+                    print(
+                        f"WARNING: Skipping '{p['name']}' - no polar data available (empty file)"
+                    )
+                    continue
+                cur = con.execute(
+                    "INSERT INTO polars (file, profile, re, mach, ncrit) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (Path(f).name, p["name"], p["re"], p.get("mach"), p.get("ncrit")),
+                )
+                polar_id = cur.lastrowid
+                points = df[["alpha", "CL", "CD", "CDp", "Cm", "Cl_Cd"]].to_numpy()
+                # sqlite3 binds float NaN as NULL
+                con.executemany(
+                    "INSERT INTO points VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [(polar_id, *row) for row in points.tolist()],
+                )
+                limits = compute_limits(df, p["name"])
+                con.execute(
+                    f"INSERT INTO limits VALUES ({placeholders})",
+                    (
+                        polar_id,
+                        *(_sql_float(limits[c]) for c in LIMITS_SQL_COLUMNS.values()),
+                    ),
+                )
+                n_polars += 1
+        con.executescript(_INDEXES)
+    finally:
+        con.close()
+    return n_polars
+
+
+def run_query(db_path, sql, params=()):
+    """Run a read-only SQL query against a polar database as a DataFrame."""
+    return pd.read_sql_query(sql, _connect(db_path), params=params)
+
+
+def list_members(path):
+    """List the original polar file names stored in a database."""
+    rows = _connect(path).execute("SELECT file FROM polars ORDER BY file")
+    return [r[0] for r in rows]
+
+
+def read_member(path, name):
+    """Return one polar of a database in the parse_polar_file format."""
+    con = _connect(path)
+    row = con.execute(
+        "SELECT id, profile, re, mach, ncrit FROM polars WHERE file = ?", (name,)
+    ).fetchone()
+    if row is None:
+        raise FileNotFoundError(f"'{name}' not found in database '{path}'")
+    polar_id, profile, re_val, mach, ncrit = row
+    df = pd.read_sql_query(
+        "SELECT alpha, CL, CD, CDp, Cm, Cl_Cd FROM points "
+        "WHERE polar_id = ? ORDER BY alpha",
+        con,
+        params=(polar_id,),
+    )
+    return {
+        "path": Path(path) / name,
+        "name": profile,
+        "re": re_val,
+        "mach": mach,
+        "ncrit": ncrit,
+        "df": df,
+    }
@@ -0,0 +1,261 @@
+"""Compact piecewise-cubic surrogates of polars, fitted under an error tolerance."""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from hermite import hermite_eval, pchip_slopes
+from polars_reader import parse_polar_file, select_polar_files
+
+SURROGATE_COEFFS = ["CL", "CD", "Cm"]
+
+# Default maximum absolute error of the surrogate per coefficient
+TOLERANCE = {"CL": 0.005, "CD": 0.0001, "Cm": 0.002}
+
+
+def fit_polar(alpha, values, tol):
+    """
+    Fit one polar with a cubic Hermite spline on adaptively chosen knots.
+
+    Parameters:
+    -----------
+    alpha : array (n,)
+        Increasing angles of attack
+    values : array (n, C)
+        Coefficients at those angles
+    tol : array (C,)
+        Maximum absolute error allowed for each coefficient
+
+    Knots are data points, so the surrogate is exact there; the slopes are
+    the monotone (PCHIP) slopes of the full-resolution data. Starting from
+    the end points, the worst-fitted point of every interval whose error
+    exceeds the tolerance is added as a knot until all points are within it.
+
+    Returns:
+    --------
+    (knots, knot_values, knot_slopes, max_error)
+        Arrays (K,), (K, C), (K, C) and the maximum absolute error (C,)
+    """
+    alpha = np.asarray(alpha, dtype=float)
+    values = np.asarray(values, dtype=float)
+    slopes = (
+        pchip_slopes(alpha, values.T).T if len(alpha) > 1 else np.zeros_like(values)
+    )
+    if len(alpha) <= 2:
+        return alpha, values, slopes, np.zeros(values.shape[1])
+
+    idx = np.array([0, len(alpha) - 1])
+    while True:
+        fit = hermite_eval(alpha[idx], values[idx].T, slopes[idx].T, alpha).T
+        err = np.abs(fit - values)
+        e = np.nanmax(err / tol, axis=1)
+        if not (e > 1).any():
+            return alpha[idx], values[idx], slopes[idx], np.nanmax(err, axis=0)
+        # Worst point of each interval still out of tolerance becomes a knot
+        seg = np.clip(
+            np.searchsorted(alpha[idx], alpha, side="right") - 1, 0, len(idx) - 2
+        )
+        order = np.lexsort((e, seg))
+        last = np.r_[seg[order][1:] != seg[order][:-1], True]
+        new = order[last]
+        new = new[e[new] > 1]
+        idx = np.union1d(idx, new)
+
+
+def build_surrogates(
+    polars_dir=None,
+    profiles=None,
+    re_filter=None,
+    tolerance=None,
+    parser=None,
+):
+    """
+    Fit a surrogate for every selected polar.
+
+    Parameters:
+    -----------
+    polars_dir : str
+        Directory containing polar files
+    profiles : list
+        List of profile name filters
+    re_filter : str
+        Reynolds number filter
+    tolerance : dict, optional
+        Maximum absolute error per coefficient, e.g. {'CD': 5e-5}; missing
+        entries use TOLERANCE
+    parser : callable, optional
+        Function used to parse each polar file (defaults to parse_polar_file)
+
+    Returns:
+    --------
+    dict
+        - files, profiles, re: one entry per polar
+        - offsets: array (N+1,); the knots of polar i are offsets[i]:offsets[i+1]
+        - alpha: knot angles (K,)
+        - values, slopes: knot values and slopes (K, 3) of SURROGATE_COEFFS
+        - errors: maximum absolute fit error per polar (N, 3)
+        - points: number of data points of each polar (N,)
+        - tolerance: tolerance used (3,)
+    """
+    parser = parser or parse_polar_file
+    tol = dict(TOLERANCE, **(tolerance or {}))
+    tol = np.array([tol[c] for c in SURROGATE_COEFFS], dtype=float)
+
+    files = select_polar_files(polars_dir, profiles, re_filter)
+    if not files:
+        raise RuntimeError("No polar files matched selection")
+
+    names, profiles_out, re_out, points = [], [], [], []
+    knots, kvalues, kslopes, errors, counts = [], [], [], [], []
+    for f in files:
+        p = parser(f)
+        df = p["df"]
+        if df is None or df.empty:
+            print(f"WARNING: Skipping '{p['name']}' - no polar data available")
+            continue
+        df = df.dropna(subset=["alpha"] + SURROGATE_COEFFS)
+        df = df.sort_values("alpha").drop_duplicates("alpha")
+        a, v, d, err = fit_polar(
+            df["alpha"].to_numpy(), df[SURROGATE_COEFFS].to_numpy(), tol
+        )
+        names.append(Path(f).name)
+        profiles_out.append(p["name"])
+        re_out.append(p["re"] if p["re"] is not None else np.nan)
+        points.append(len(df))
+        knots.append(a)
+        kvalues.append(v)
+        kslopes.append(d)
+        errors.append(err)
+        counts.append(len(a))
+    if not names:
+        raise RuntimeError("No polar data available for the selection")
+
+    return {
+        "files": names,
+        "profiles": profiles_out,
+        "re": np.array(re_out, dtype=float),
+        "offsets": np.r_[0, np.cumsum(counts)],
+        "alpha": np.concatenate(knots),
+        "values": np.concatenate(kvalues),
+        "slopes": np.concatenate(kslopes),
+        "errors": np.array(errors),
+        "points": np.array(points),
+        "tolerance": tol,
+    }
+
+
+def save_surrogates(store, path):
+    """
+    Save a surrogate store as a compressed .npz file (float32 knots).
+
+    '.npz' is appended to any other suffix, as numpy does; returns the path
+    actually written.
+    """
+    path = Path(path)
+    if path.suffix.lower() != ".npz":
+        path = path.with_name(path.name + ".npz")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.savez_compressed(
+        path,
+        files=np.array(store["files"]),
+        profiles=np.array(store["profiles"]),
+        re=store["re"],
+        offsets=store["offsets"].astype(np.int32),
+        alpha=store["alpha"].astype(np.float32),
+        values=store["values"].astype(np.float32),
+        slopes=store["slopes"].astype(np.float32),
+        errors=store["errors"].astype(np.float32),
+        points=store["points"].astype(np.int32),
+        tolerance=store["tolerance"],
+    )
+    return path
+
+
+def load_surrogates(path):
+    """Load a surrogate store saved by save_surrogates."""
+    with np.load(path) as z:
+        store = {k: z[k] for k in z.files}
+    store["files"] = store["files"].tolist()
+    store["profiles"] = store["profiles"].tolist()
+    for k in ("alpha", "values", "slopes", "errors"):
+        store[k] = store[k].astype(float)
+    return store
+
+
+def evaluate_surrogates(store, alphas):
+    """
+    Evaluate all polars of a store at ``alphas`` in one vectorized call.
+
+    Returns an array (polars, len(alphas), 3) of CL, CD and Cm, NaN where
+    an alpha is outside the computed range of a polar.
+    """
+    alphas = np.atleast_1d(np.asarray(alphas, dtype=float))
+    off = store["offsets"]
+    a = store["alpha"]
+    n = len(off) - 1
+    first, last = off[:-1], off[1:] - 1
+
+    # Knots of all polars as one increasing key: polar index * span + alpha
+    span = a.max() - a.min() + 1.0
+    poly = np.repeat(np.arange(n), np.diff(off))
+    keys = poly * span + (a - a.min())
+    q = np.arange(n)[:, None] * span + (alphas[None, :] - a.min())
+    j = np.searchsorted(keys, q, side="right") - 1
+    j = np.clip(j, first[:, None], np.maximum(last - 1, first)[:, None])
+    k = np.minimum(j + 1, last[:, None])
+
+    x0, x1 = a[j], a[k]
+    h = np.where(x1 > x0, x1 - x0, 1.0)
+    t = ((alphas[None, :] - x0) / h)[..., None]
+    h = h[..., None]
+    y0, y1 = store["values"][j], store["values"][k]
+    d0, d1 = store["slopes"][j], store["slopes"][k]
+    t2, t3 = t * t, t * t * t
+    out = (
+        (2 * t3 - 3 * t2 + 1) * y0
+        + (t3 - 2 * t2 + t) * h * d0
+        + (-2 * t3 + 3 * t2) * y1
+        + (t3 - t2) * h * d1
+    )
+    # Knots may be stored as float32: compare the range with some slack
+    outside = (alphas[None, :] < a[first][:, None] - 1e-4) | (
+        alphas[None, :] > a[last][:, None] + 1e-4
+    )
+    out[outside] = np.nan
+    return out
+
+
+def surrogate_table(store, alphas):
+    """Evaluate a store at ``alphas`` as a long table (one row per polar and alpha)."""
+    alphas = np.atleast_1d(np.asarray(alphas, dtype=float))
+    values = evaluate_surrogates(store, alphas)
+    n = len(store["files"])
+    df = pd.DataFrame(
+        {
+            "File": np.repeat(store["files"], len(alphas)),
+            "Profile": np.repeat(store["profiles"], len(alphas)),
+            "Re": np.repeat(store["re"], len(alphas)),
+            "alpha": np.tile(alphas, n),
+        }
+    )
+    for i, c in enumerate(SURROGATE_COEFFS):
+        df[c] = values[..., i].ravel()
+    df["Cl_Cd"] = df["CL"] / df["CD"].replace(0, np.nan)
+    return df
+
+
+def error_table(store):
+    """Per-polar fit report: points, knots and maximum error per coefficient."""
+    df = pd.DataFrame(
+        {
+            "File": store["files"],
+            "Profile": store["profiles"],
+            "Re": store["re"],
+            "Points": store["points"],
+            "Knots": np.diff(store["offsets"]),
+        }
+    )
+    for i, c in enumerate(SURROGATE_COEFFS):
+        df[f"max |err {c}|"] = store["errors"][:, i]
+    return df
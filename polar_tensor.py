@@ -0,0 +1,217 @@
+"""Dense profile x Re x alpha tensor of polars resampled on a common grid."""
+
+import hashlib
+from pathlib import Path
+
+import numpy as np
+
+from polars_reader import (
+    cache_dir,
+    file_signature,
+    parse_polar_file,
+    select_polar_files,
+)
+
+COEFFS = ["CL", "CD", "Cm", "Cl_Cd"]
+
+# Default common alpha grid (deg): the range and step of the shipped polars
+ALPHA_MIN = -10.0
+ALPHA_MAX = 30.0
+ALPHA_STEP = 0.1
+# Holes between converged points wider than this (deg) are masked, not bridged
+MAX_GAP = 0.5
+
+
+def alpha_grid(alpha_min=ALPHA_MIN, alpha_max=ALPHA_MAX, alpha_step=ALPHA_STEP):
+    """Return the common alpha grid, endpoints included."""
+    n = int(round((alpha_max - alpha_min) / alpha_step)) + 1
+    return np.round(alpha_min + alpha_step * np.arange(n), 6)
+
+
+def resample_polar(df, alpha, max_gap=MAX_GAP):
+    """
+    Resample one polar DataFrame onto ``alpha``.
+
+    Returns (values, mask): values has shape (len(alpha), len(COEFFS)) with
+    NaN where mask is False. Grid points outside the computed alpha range or
+    inside a gap wider than ``max_gap`` are masked instead of extrapolated.
+    """
+    a = df["alpha"].to_numpy(dtype=float)
+    values = np.full((len(alpha), len(COEFFS)), np.nan)
+    if len(a) == 0:
+        return values, np.zeros(len(alpha), dtype=bool)
+
+    # Interval of the source samples around each grid point
+    hi = np.searchsorted(a, alpha, side="left")
+    lo = np.clip(hi - 1, 0, len(a) - 1)
+    hi = np.clip(hi, 0, len(a) - 1)
+    exact = np.isclose(a[hi], alpha) | np.isclose(a[lo], alpha)
+    inside = (alpha >= a[0]) & (alpha <= a[-1])
+    mask = inside & (exact | (a[hi] - a[lo] <= max_gap))
+
+    for j, c in enumerate(COEFFS):
+        values[mask, j] = np.interp(alpha[mask], a, df[c].to_numpy(dtype=float))
+    return values, mask
+
+
+def _cache_path(polars_dir, files, alpha, max_gap):
+    h = hashlib.sha1()
+    h.update(np.asarray(alpha).tobytes())
+    h.update(repr((max_gap, COEFFS)).encode())
+    for f in files:
+        h.update(repr((Path(f).name, file_signature(f))).encode())
+    return cache_dir(polars_dir) / f"tensor_{h.hexdigest()[:16]}.npz"
+
+
+def tensor_cache_path(
+    polars_dir=None,
+    profiles=None,
+    re_filter=None,
+    alpha_min=ALPHA_MIN,
+    alpha_max=ALPHA_MAX,
+    alpha_step=ALPHA_STEP,
+    max_gap=MAX_GAP,
+):
+    """
+    Return the cache file of the tensor for a selection and grid.
+
+    Only file names and stat() results are used, so this is cheap; caches
+    derived from a tensor can be keyed on it without loading the tensor.
+    """
+    files = select_polar_files(polars_dir, profiles, re_filter)
+    alpha = alpha_grid(alpha_min, alpha_max, alpha_step)
+    return _cache_path(polars_dir, files, alpha, max_gap)
+
+
+def build_polar_tensor(
+    polars_dir=None,
+    profiles=None,
+    re_filter=None,
+    alpha_min=ALPHA_MIN,
+    alpha_max=ALPHA_MAX,
+    alpha_step=ALPHA_STEP,
+    max_gap=MAX_GAP,
+    use_cache=True,
+):
+    """
+    Resample all selected polars onto one dense array.
+
+    Parameters:
+    -----------
+    polars_dir : str
+        Directory containing polar files
+    profiles : list
+        List of profile name filters
+    re_filter : str
+        Reynolds number filter
+    alpha_min, alpha_max, alpha_step : float
+        Common alpha grid (deg)
+    max_gap : float
+        Largest hole between converged points that is interpolated (deg)
+    use_cache : bool
+        Load/save the tensor in the polars cache directory. The cache key
+        covers the file names, their modification times and sizes, the grid
+        and max_gap, so any change rebuilds the tensor.
+
+    Returns:
+    --------
+    dict
+        - profiles: list of profile names (axis 0)
+        - re: array of Reynolds numbers (axis 1)
+        - alpha: common alpha grid (axis 2)
+        - coeffs: coefficient names (axis 3 of data)
+        - data: array (profiles, re, alpha, coeffs), NaN where not computed
+        - mask: bool array (profiles, re, alpha), True where data is valid
+        - path: cache file, if any
+    """
+    files = select_polar_files(polars_dir, profiles, re_filter)
+    if not files:
+        raise RuntimeError("No polar files matched selection")
+    alpha = alpha_grid(alpha_min, alpha_max, alpha_step)
+
+    cache_path = None
+    if use_cache:
+        cache_path = _cache_path(polars_dir, files, alpha, max_gap)
+        if cache_path.exists():
+            return load_polar_tensor(cache_path)
+
+    parsed = []
+    for f in files:
+        p = parse_polar_file(f)
+        if p["df"] is None or p["df"].empty or p["re"] is None:
+            print(f"WARNING: Skipping '{p['name']}' - no polar data available")
+            continue
+        parsed.append(p)
+    if not parsed:
+        raise RuntimeError("No polar data available for the selection")
+
+    names = sorted({p["name"] for p in parsed})
+    re_values = np.array(sorted({round(p["re"]) for p in parsed}), dtype=float)
+    p_index = {n: i for i, n in enumerate(names)}
+    r_index = {r: i for i, r in enumerate(re_values)}
+
+    data = np.full((len(names), len(re_values), len(alpha), len(COEFFS)), np.nan)
+    mask = np.zeros(data.shape[:3], dtype=bool)
+    for p in parsed:
+        i, k = p_index[p["name"]], r_index[round(p["re"])]
+        if mask[i, k].any():
+            print(
+                f"WARNING: Several polars for '{p['name']}' at Re {p['re']:.0f}; "
+                f"using {Path(p['path']).name}"
+            )
+        data[i, k], mask[i, k] = resample_polar(p["df"], alpha, max_gap)
+
+    tensor = {
+        "profiles": names,
+        "re": re_values,
+        "alpha": alpha,
+        "coeffs": list(COEFFS),
+        "data": data,
+        "mask": mask,
+        "path": cache_path,
+    }
+    if cache_path is not None:
+        save_polar_tensor(tensor, cache_path)
+    return tensor
+
+
+def save_polar_tensor(tensor, path):
+    """
+    Save a tensor built by build_polar_tensor as a compressed .npz file.
+
+    '.npz' is appended to any other suffix, as numpy does; returns the path
+    actually written.
+    """
+    path = Path(path)
+    if path.suffix.lower() != ".npz":
+        path = path.with_name(path.name + ".npz")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.savez_compressed(
+        path,
+        profiles=np.array(tensor["profiles"]),
+        re=tensor["re"],
+        alpha=tensor["alpha"],
+        coeffs=np.array(tensor["coeffs"]),
+        data=tensor["data"],
+        mask=tensor["mask"],
+    )
+    return path
+
+
+def load_polar_tensor(path):
+    """Load a tensor saved by save_polar_tensor."""
+    with np.load(path) as z:
+        return {
+            "profiles": z["profiles"].tolist(),
+            "re": z["re"],
+            "alpha": z["alpha"],
+            "coeffs": z["coeffs"].tolist(),
+            "data": z["data"],
+            "mask": z["mask"],
+            "path": Path(path),
+        }
+
+
+def coefficient(tensor, name):
+    """Return the (profiles, re, alpha) array of one coefficient."""
+    return tensor["data"][..., tensor["coeffs"].index(name)]
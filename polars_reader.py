@@ -1,4 +1,11 @@
+import hashlib
+import importlib
+import io
+import json
 import re
+import threading
+import zlib
+from collections import OrderedDict
 from pathlib import Path
 
 import numpy as np
@@ -9,11 +16,155 @@ POLARS_DIR = Path(__file__).parent / "polars"
 _re_re = re.compile(r"Re\s*=\s*([0-9.+-eE]+)\s*e\s*([0-9]+)")
 _re_re_simple = re.compile(r"Re([0-9.]+)")
 _re_name = re.compile(r"Calculated polar for:\s*(.*)")
+_re_mach = re.compile(r"Mach\s*=\s*([0-9.+-]+)")
+_re_ncrit = re.compile(r"Ncrit\s*=\s*([0-9.+-]+)")
 
+# Single-file data sources that can stand in for a polars directory, mapped
+# to the module implementing list_members(source) and read_member(source, name)
+SOURCE_BACKENDS = {
+    ".parquet": "corpus_io",
+    ".feather": "corpus_io",
+    ".arrow": "corpus_io",
+    ".sqlite": "polar_db",
+    ".sqlite3": "polar_db",
+    ".db": "polar_db",
+    ".zip": "polar_archive",
+    ".tar": "polar_archive",
+    ".tar.gz": "polar_archive",
+    ".tgz": "polar_archive",
+    ".tar.zst": "polar_archive",
+    ".tzst": "polar_archive",
+}
 
-def list_polar_files(polars_dir=None):
+
+# Known-bad files written by the 'check' action, stored in cache_dir()
+QUARANTINE_FILE = "quarantine.json"
+_quarantine_noted = set()  # (directory, skipped names) already reported
+
+# In-process cache of parsed polars (see parse_polar_file)
+CACHE_BUDGET = 256 * 2**20  # bytes of DataFrame memory kept at most
+_cache = OrderedDict()  # (path, sort) -> (signature, parsed dict, nbytes)
+_cache_lock = threading.Lock()
+_cache_state = {
+    "budget": CACHE_BUDGET,
+    "bytes": 0,
+    "hits": 0,
+    "misses": 0,
+    "evictions": 0,
+}
+
+
+def source_backend(path):
+    """Return the backend module for a single-file polar source, or None."""
+    name = Path(path).name.lower()
+    # Longest suffix first, so '.tar.gz' is matched as a whole
+    suffix = next(
+        (s for s in sorted(SOURCE_BACKENDS, key=len, reverse=True) if name.endswith(s)),
+        None,
+    )
+    module = SOURCE_BACKENDS.get(suffix)
+    return importlib.import_module(module) if module else None
+
+
+def cache_dir(polars_dir=None):
+    """Directory for data derived from a polar source (caches, quarantine)."""
     d = Path(polars_dir) if polars_dir else POLARS_DIR
-    return sorted([p for p in d.glob("*.txt")])
+    return (d.parent if d.is_file() else d) / ".cache"
+
+
+def file_signature(path):
+    """Return (mtime_ns, size) of a polar file, or of its single-file source."""
+    path = Path(path)
+    if not path.exists() and path.parent.is_file():
+        path = path.parent
+    st = path.stat()
+    return st.st_mtime_ns, st.st_size
+
+
+def content_hash(path):
+    """Hash of the file contents (of the parsed points for archive members)."""
+    path = Path(path)
+    if path.exists():
+        return hashlib.blake2b(path.read_bytes(), digest_size=16).hexdigest()
+    df = parse_polar_file(path)["df"]
+    return hashlib.blake2b(df.to_numpy().tobytes(), digest_size=16).hexdigest()
+
+
+def load_quarantine(polars_dir=None):
+    """Return {file name: {"mtime_ns", "size", "issues"}} of quarantined files."""
+    path = cache_dir(polars_dir) / QUARANTINE_FILE
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _drop_quarantined(files, polars_dir):
+    quarantine = load_quarantine(polars_dir)
+    if not quarantine:
+        return files
+    kept = []
+    for f in files:
+        entry = quarantine.get(f.name)
+        if entry is not None:
+            st = f.stat()
+            # Skip only while the file is unchanged since it was checked
+            if (st.st_mtime_ns, st.st_size) == (entry["mtime_ns"], entry["size"]):
+                continue
+        kept.append(f)
+    skipped = tuple(sorted({f.name for f in files} - {f.name for f in kept}))
+    if skipped and (str(polars_dir), skipped) not in _quarantine_noted:
+        # Once per process: the file list is read by several loaders
+        _quarantine_noted.add((str(polars_dir), skipped))
+        print(f"Note: skipped {len(skipped)} quarantined file(s) (see check)")
+    return kept
+
+
+def list_polar_files(polars_dir=None, skip_quarantined=True):
+    d = Path(polars_dir) if polars_dir else POLARS_DIR
+    if d.is_file():
+        backend = source_backend(d)
+        if backend is None:
+            raise ValueError(
+                f"Unsupported polar source '{d}'. Use a directory or one of: "
+                f"{', '.join(SOURCE_BACKENDS)}"
+            )
+        # Members are addressed as <source>/<original file name>
+        return [d / name for name in backend.list_members(d)]
+    files = sorted([p for p in d.glob("*.txt")])
+    if skip_quarantined:
+        files = _drop_quarantined(files, d)
+    return files
+
+
+def shard_of(name, count):
+    """Shard (0 to count - 1) of a polar file name; stable across machines."""
+    return zlib.crc32(Path(name).name.encode("utf-8")) % count
+
+
+def select_polar_files(
+    polars_dir=None, profiles=None, re_filter=None, skip_quarantined=True, shard=None
+):
+    """
+    List polar files matching profile substrings and a Reynolds filter.
+
+    ``shard`` is an optional (index, count) pair, index from 0: only the
+    files whose name hashes to that shard are kept (see shard_of), so
+    ``count`` runs with different indices split the selection between them.
+    """
+    files = list_polar_files(polars_dir, skip_quarantined)
+    if shard is not None:
+        index, count = shard
+        files = [f for f in files if shard_of(f.name, count) == index]
+    if profiles:
+        procs = []
+        for p in profiles:
+            for f in files:
+                if p in f.name:
+                    procs.append(f)
+        files = sorted(set(procs), key=lambda p: p.name)
+    if re_filter:
+        files = [f for f in files if re_filter in f.name]
+    return files
 
 
 def parse_re_from_header(text):
@@ -38,12 +189,197 @@ def parse_name_from_header(text):
     return m.group(1).strip() if m else None
 
 
-def parse_polar_file(path):
+def parse_mach_ncrit_from_header(text):
+    """Return (Mach, Ncrit) from an XFLR5 header, None where missing."""
+    m = _re_mach.search(text)
+    n = _re_ncrit.search(text)
+    mach = float(m.group(1)) if m else None
+    ncrit = float(n.group(1)) if n else None
+    return mach, ncrit
+
+
+def _entry_size(parsed):
+    df = parsed["df"]
+    # Small fixed overhead for the dict and header values
+    return 1024 + (int(df.memory_usage(deep=True).sum()) if df is not None else 0)
+
+
+def _evict(budget):
+    while _cache and _cache_state["bytes"] > budget:
+        _, (_, _, nbytes) = _cache.popitem(last=False)
+        _cache_state["bytes"] -= nbytes
+        _cache_state["evictions"] += 1
+
+
+def cache_info():
+    """
+    Return statistics of the parsed polar cache.
+
+    Keys: hits, misses, evictions, entries, bytes (DataFrame memory held)
+    and budget (bytes, 0 when the cache is disabled).
+    """
+    with _cache_lock:
+        return dict(_cache_state, entries=len(_cache))
+
+
+def set_cache_budget(nbytes):
+    """Set the memory budget of the parsed polar cache (0 disables it)."""
+    if nbytes < 0:
+        raise ValueError("Cache budget must be >= 0")
+    with _cache_lock:
+        _cache_state["budget"] = int(nbytes)
+        _evict(nbytes)
+
+
+def invalidate_cache(path=None):
+    """
+    Drop cached parses.
+
+    With no argument the whole cache is cleared (statistics are kept);
+    otherwise the entries of ``path`` (a polar file) or of every file under
+    ``path`` (a polars directory or single-file source) are dropped.
+    Returns the number of entries removed.
+    """
+    with _cache_lock:
+        if path is None:
+            keys = list(_cache)
+        else:
+            p = Path(path).resolve()
+            keys = [
+                k
+                for k in _cache
+                if Path(k[0]).resolve() == p or Path(k[0]).resolve().parent == p
+            ]
+        for k in keys:
+            _cache_state["bytes"] -= _cache.pop(k)[2]
+        return len(keys)
+
+
+def parse_polar_file(path, sort=True, use_cache=True):
+    """
+    Parse an XFLR5 polar file.
+
+    Returns a dict with the profile ``name``, ``re``, ``mach``, ``ncrit`` and
+    the point table ``df`` (sorted by alpha unless ``sort`` is False).
+
+    Results are kept in an in-process LRU cache keyed by path, modification
+    time and size, so a file is parsed again only after it changes. The cache
+    holds at most the budget set with set_cache_budget (CACHE_BUDGET by
+    default); see cache_info and invalidate_cache. Cached DataFrames are
+    shared between calls: copy ``df`` before modifying it in place.
+    """
     path = Path(path)
+    if not use_cache or not _cache_state["budget"]:
+        return _parse_polar_file(path, sort)
+
+    key = (str(path), sort)
+    signature = file_signature(path)
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry is not None and entry[0] == signature:
+            _cache.move_to_end(key)
+            _cache_state["hits"] += 1
+            return dict(entry[1])
+        _cache_state["misses"] += 1
+
+    parsed = _parse_polar_file(path, sort)
+    _cache_store(key, signature, parsed)
+    return dict(parsed)
+
+
+def _cache_store(key, signature, parsed):
+    nbytes = _entry_size(parsed)
+    with _cache_lock:
+        old = _cache.pop(key, None)
+        if old is not None:
+            _cache_state["bytes"] -= old[2]
+        if nbytes <= _cache_state["budget"]:
+            _cache[key] = (signature, parsed, nbytes)
+            _cache_state["bytes"] += nbytes
+            _evict(_cache_state["budget"])
+
+
+def parse_polar_files(paths, sort=True, use_cache=True):
+    """
+    Parse many polar files, as parse_polar_file does for each one.
+
+    Members of a source that can read several at once (archives) and that
+    are not cached are read in a single sequential pass over the source,
+    instead of one access per member. Returns a list in the order of
+    ``paths``.
+    """
+    return [parsed for _, parsed in iter_polar_files(paths, sort, use_cache)]
+
+
+def iter_polar_files(paths, sort=True, use_cache=True):
+    """
+    Lazy parse_polar_files: yield (path, parsed) in the order of ``paths``.
+
+    Each file is parsed only when the consumer asks for it, so results can
+    be used (and dropped) while the next files are read. Uncached archive
+    members are still read in one pass per archive; members arriving out
+    of ``paths`` order are held until their turn.
+    """
+    paths = [Path(p) for p in paths]
+    readers = {}  # source -> (read_members generator, members read ahead)
+
+    def batched(path):
+        source = path.parent
+        if path.exists() or not source.is_file():
+            return False
+        if source in readers:
+            return path.name in readers[source][1] or readers[source][0] is not None
+        if not hasattr(source_backend(source), "read_members"):
+            return False
+        with _cache_lock:
+            entry = _cache.get((str(path), sort))
+        return not (use_cache and entry and entry[0] == file_signature(source))
+
+    for i, path in enumerate(paths):
+        if not batched(path):
+            yield path, parse_polar_file(path, sort, use_cache)
+            continue
+        source = path.parent
+        if source not in readers:
+            # One pass over the archive for the remaining members of this source
+            names = list(dict.fromkeys(p.name for p in paths[i:] if p.parent == source))
+            members = source_backend(source).read_members(source, names)
+            readers[source] = (members, {})
+        members, ahead = readers[source]
+        signature = file_signature(source)
+        while path.name not in ahead and members is not None:
+            try:
+                name, parsed = next(members)
+            except StopIteration:
+                members = None
+                readers[source] = (None, ahead)
+                break
+            if use_cache and _cache_state["budget"]:
+                _cache_store((str(source / name), sort), signature, parsed)
+            ahead[name] = parsed
+        parsed = ahead.pop(path.name, None)
+        if parsed is None:
+            # Listed twice: the first occurrence consumed it (now cached)
+            parsed = parse_polar_file(path, sort, use_cache)
+        yield path, dict(parsed)
+
+
+def _parse_polar_file(path, sort=True):
+    path = Path(path)
+    if not path.exists() and path.parent.is_file():
+        # Member of a single-file source (corpus export, database, archive, ...)
+        return source_backend(path.parent).read_member(path.parent, path.name)
     text = path.read_text(encoding="utf-8", errors="ignore")
+    return parse_polar_text(text, path, sort)
+
+
+def parse_polar_text(text, path, sort=True):
+    """Parse the contents of an XFLR5 polar file read from ``path``."""
+    path = Path(path)
     name = parse_name_from_header(text) or path.stem
     # try to get Re from header string
     re_val = parse_re_from_header(text)
+    mach, ncrit = parse_mach_ncrit_from_header(text)
 
     lines = text.splitlines()
     # find header line that contains 'alpha' (case-insensitive) and 'CL'
@@ -86,7 +422,7 @@ def parse_polar_file(path):
     if not data:
         try:
             df = pd.read_csv(
-                path,
+                io.StringIO(text),
                 sep=r"\s+",
                 comment="%",
                 header=None,
@@ -121,10 +457,18 @@ def parse_polar_file(path):
 
     df = pd.DataFrame(data)
     if not df.empty:
-        df = df.sort_values("alpha").reset_index(drop=True)
+        if sort:
+            df = df.sort_values("alpha").reset_index(drop=True)
         df["Cl_Cd"] = df["CL"] / df["CD"].replace(0, np.nan)
 
-    return {"path": path, "name": name, "re": re_val, "df": df}
+    return {
+        "path": path,
+        "name": name,
+        "re": re_val,
+        "mach": mach,
+        "ncrit": ncrit,
+        "df": df,
+    }
 
 
 def list_available_re(polars_dir=None):
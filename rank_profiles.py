@@ -0,0 +1,255 @@
+"""Weighted objective scoring and top-k selection over the limits table."""
+
+import ast
+import operator
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from extract_limits import extract_limits
+from filter_profiles import apply_criteria, resolve_column
+
+NORMALIZATIONS = ["none", "minmax", "zscore", "rank"]
+AGGREGATIONS = ["none", "mean", "min"]
+
+_BINARY = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.Pow: operator.pow,
+}
+_UNARY = {ast.USub: operator.neg, ast.UAdd: operator.pos}
+_FUNCTIONS = {"abs": np.abs, "log": np.log, "sqrt": np.sqrt}
+
+
+def parse_objective(expr, columns):
+    """
+    Parse an objective expression over limits columns.
+
+    Only numbers, column names or filter aliases (e.g. ``cl_cd_max``),
+    + - * / **, parentheses and abs/log/sqrt are accepted; anything else
+    raises ValueError. Returns (evaluate, used) where ``used`` lists the
+    referenced columns and ``evaluate(values)`` computes the objective from
+    a {column: array} mapping.
+    """
+    try:
+        tree = ast.parse(expr, mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"Invalid objective '{expr}': {e.msg}") from None
+
+    used = []
+
+    def check(node):
+        if isinstance(node, ast.Expression):
+            return check(node.body)
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+            return
+        if isinstance(node, ast.Name):
+            col = resolve_column(node.id)
+            if col not in columns:
+                raise ValueError(
+                    f"Unknown column '{node.id}' in objective. "
+                    f"Available columns: {', '.join(columns)}"
+                )
+            if col not in used:
+                used.append(col)
+            return
+        if isinstance(node, ast.BinOp) and type(node.op) in _BINARY:
+            check(node.left)
+            return check(node.right)
+        if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY:
+            return check(node.operand)
+        if (
+            isinstance(node, ast.Call)
+            and isinstance(node.func, ast.Name)
+            and node.func.id in _FUNCTIONS
+            and len(node.args) == 1
+            and not node.keywords
+        ):
+            return check(node.args[0])
+        raise ValueError(
+            f"Unsupported element '{ast.unparse(node)}' in objective '{expr}'"
+        )
+
+    check(tree)
+
+    def evaluate(values):
+        def ev(node):
+            if isinstance(node, ast.Expression):
+                return ev(node.body)
+            if isinstance(node, ast.Constant):
+                return node.value
+            if isinstance(node, ast.Name):
+                return values[resolve_column(node.id)]
+            if isinstance(node, ast.BinOp):
+                return _BINARY[type(node.op)](ev(node.left), ev(node.right))
+            if isinstance(node, ast.UnaryOp):
+                return _UNARY[type(node.op)](ev(node.operand))
+            return _FUNCTIONS[node.func.id](ev(node.args[0]))
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return ev(tree)
+
+    return evaluate, used
+
+
+def objective_columns(expr):
+    """
+    Columns named in an objective expression (aliases resolved), without
+    checking them against a table. Raises ValueError if it does not parse.
+    """
+    try:
+        tree = ast.parse(expr, mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"Invalid objective '{expr}': {e.msg}") from None
+    return [resolve_column(n.id) for n in ast.walk(tree) if isinstance(n, ast.Name)]
+
+
+def normalize_column(values, method, axis=None):
+    """
+    Normalize one column: 'none', 'minmax' (0-1), 'zscore' or 'rank' (0-1).
+
+    With ``axis`` the statistics are taken along that axis only (each row of
+    a samples x profiles array is normalized on its own). NaN values are
+    ignored by the statistics.
+    """
+    x = np.asarray(values, dtype=float)
+    if method == "none":
+        return x
+    keep = axis is not None
+    with warnings.catch_warnings():
+        # Rows without any value (nothing selected in a sample) warn otherwise
+        warnings.simplefilter("ignore", RuntimeWarning)
+        if method == "minmax":
+            lo = np.nanmin(x, axis=axis, keepdims=keep)
+            hi = np.nanmax(x, axis=axis, keepdims=keep)
+            span = np.where(hi > lo, hi - lo, np.inf)
+            return np.where(hi > lo, (x - lo) / span, 0.0)
+        if method == "zscore":
+            sd = np.nanstd(x, axis=axis, keepdims=keep)
+            mean = np.nanmean(x, axis=axis, keepdims=keep)
+            scale = np.where(sd > 0, sd, np.inf)
+            return np.where(sd > 0, (x - mean) / scale, 0.0)
+    if method == "rank":
+        if axis is not None:
+            ranked = pd.DataFrame(np.moveaxis(x, axis, -1)).rank(axis=1, pct=True)
+            return np.moveaxis(ranked.to_numpy(), -1, axis)
+        return pd.Series(x).rank(pct=True).to_numpy()
+    raise ValueError(f"Unknown normalization '{method}'. Use one of: {NORMALIZATIONS}")
+
+
+def score_table(df, objective, normalize="none"):
+    """
+    Evaluate ``objective`` on every row of a limits table.
+
+    Each referenced column is normalized over the whole table first (see
+    normalize_column), so weights compare columns of different magnitude
+    when ``normalize`` is not 'none'. Returns a float array.
+    """
+    evaluate, used = parse_objective(objective, list(df.columns))
+    values = {c: normalize_column(df[c].to_numpy(), normalize) for c in used}
+    score = np.asarray(evaluate(values), dtype=float)
+    return np.broadcast_to(score, (len(df),)).astype(float)
+
+
+def top_k(scores, k):
+    """
+    Indices of the k highest scores, best first.
+
+    Uses partial selection (argpartition), so only the k selected rows are
+    sorted. NaN scores are never selected.
+    """
+    scores = np.where(np.isnan(scores), -np.inf, scores)
+    n_valid = int((scores > -np.inf).sum())
+    k = min(k, n_valid) if k else n_valid
+    if k <= 0:
+        return np.array([], dtype=int)
+    if k < len(scores):
+        idx = np.argpartition(-scores, k - 1)[:k]
+    else:
+        idx = np.arange(len(scores))
+    return idx[np.argsort(-scores[idx], kind="stable")]
+
+
+def rank_profiles(
+    objective,
+    polars_dir=None,
+    profiles=None,
+    re_filter=None,
+    normalize="none",
+    top=None,
+    criteria=None,
+    across_re="none",
+    parser=None,
+):
+    """
+    Rank profiles by a weighted objective over the limits columns.
+
+    Parameters:
+    -----------
+    objective : str
+        Expression to maximize, e.g. '2*cl_cd_max - 5000*cd_min + cl_max'
+        (column names or filter aliases; use a negative weight to penalize)
+    polars_dir : str
+        Directory containing polar files
+    profiles : list
+        List of profile name filters
+    re_filter : str
+        Reynolds number filter; without it every (profile, Re) is scored
+    normalize : str
+        Column normalization before weighting: 'none', 'minmax', 'zscore'
+        or 'rank' (percentile)
+    top : int, optional
+        Number of rows returned (all by default)
+    criteria : dict, optional
+        Filter criteria applied before scoring (see filter_profiles)
+    across_re : str
+        'none' ranks (profile, Re) rows; 'mean' or 'min' rank profiles by the
+        mean or worst score over the selected Reynolds numbers
+    parser : callable, optional
+        Function used to parse each polar file (defaults to parse_polar_file)
+
+    Returns:
+    --------
+    pd.DataFrame
+        Rank, Score and the limits columns of the selected rows, best first
+    """
+    if across_re not in AGGREGATIONS:
+        raise ValueError(
+            f"Unknown aggregation '{across_re}'. Use one of: {AGGREGATIONS}"
+        )
+
+    df = extract_limits(
+        polars_dir=polars_dir,
+        profiles=profiles,
+        re_filter=re_filter,
+        parser=parser,
+        with_re=True,
+    )
+    if df.empty:
+        return df
+    from re_scaling import merge_re_fits, needs_re_fits
+
+    if needs_re_fits(objective_columns(objective) + list(criteria or [])):
+        df = merge_re_fits(df, polars_dir)
+    df = apply_criteria(df, criteria).reset_index(drop=True)
+    if df.empty:
+        return df
+
+    scores = score_table(df, objective, normalize)
+    if across_re != "none":
+        per_row = pd.Series(scores).groupby(df["Profile"])
+        agg = per_row.mean() if across_re == "mean" else per_row.min()
+        n_re = per_row.size()
+        df = pd.DataFrame(
+            {"Profile": agg.index, "Re count": n_re.to_numpy()}
+        ).reset_index(drop=True)
+        scores = agg.to_numpy()
+
+    idx = top_k(scores, top)
+    result = df.iloc[idx].reset_index(drop=True)
+    result.insert(0, "Score", scores[idx])
+    result.insert(0, "Rank", np.arange(1, len(result) + 1))
+    return result
@@ -0,0 +1,238 @@
+"""Reynolds scaling of the limits per profile: power-law fits and monotone splines."""
+
+import hashlib
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from extract_limits import extract_limits
+from hermite import hermite_eval, pchip_slopes
+from polars_reader import cache_dir, file_signature, list_polar_files
+
+# Limits fitted against Re
+FIT_METRICS = ["Cd_min", "Cl_max", "Cl/Cd_max"]
+
+# Columns added to the limits table by merge_re_fits
+FIT_COLUMNS = (
+    [f"n {m}" for m in FIT_METRICS]
+    + [f"R² {m}" for m in FIT_METRICS]
+    + ["Cd_min low/high Re"]
+)
+
+
+def power_law_fit(log_re, values):
+    """
+    Least-squares fit of log(values) = c + n * log(Re) for many rows at once.
+
+    Parameters:
+    -----------
+    log_re : array (R,)
+        Natural log of the Reynolds numbers
+    values : array (P, R)
+        Metric values; NaN or non-positive entries are ignored
+
+    Returns:
+    --------
+    (n, c, r2) : arrays (P,)
+        Exponent, intercept and coefficient of determination in log-log
+        space; NaN for rows with fewer than two usable points
+    """
+    values = np.asarray(values, dtype=float)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        y = np.log(np.where(values > 0, values, np.nan))
+    m = ~np.isnan(y)
+    x = np.broadcast_to(log_re, y.shape)
+    x0 = np.where(m, x, 0.0)
+    y0 = np.where(m, y, 0.0)
+
+    n_pts = m.sum(axis=1)
+    sx, sy = x0.sum(axis=1), y0.sum(axis=1)
+    sxx, sxy, syy = (x0 * x0).sum(axis=1), (x0 * y0).sum(axis=1), (y0 * y0).sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        n = (n_pts * sxy - sx * sy) / (n_pts * sxx - sx**2)
+        c = (sy - n * sx) / n_pts
+        resid = np.where(m, y - c[:, None] - n[:, None] * x, 0.0)
+        ss_res = (resid**2).sum(axis=1)
+        ss_tot = syy - sy**2 / n_pts
+        r2 = np.where(ss_tot > 0, 1 - ss_res / ss_tot, np.nan)
+    bad = n_pts < 2
+    n[bad] = c[bad] = r2[bad] = np.nan
+    return n, c, r2
+
+
+def _cache_path(polars_dir, files):
+    h = hashlib.sha1(repr(FIT_METRICS).encode())
+    for f in files:
+        h.update(repr((Path(f).name, file_signature(f))).encode())
+    return cache_dir(polars_dir) / f"re_fits_{h.hexdigest()[:16]}.npz"
+
+
+def build_re_fits(polars_dir=None, use_cache=True):
+    """
+    Fit the Reynolds dependence of the limits of every profile.
+
+    All Reynolds numbers of each profile are used. For every metric in
+    FIT_METRICS two models are stored:
+
+    - a power law ``metric = exp(c) * Re**n`` (log-log least squares,
+      computed for all profiles at once)
+    - a monotone cubic spline (PCHIP) in log Re through the computed values,
+      which follows the data exactly and never overshoots between Re
+
+    Parameters:
+    -----------
+    polars_dir : str
+        Directory containing polar files
+    use_cache : bool
+        Load/save the coefficients in the polars cache directory (keyed by
+        the file names, modification times and sizes)
+
+    Returns:
+    --------
+    dict
+        - profiles: profile names (axis 0)
+        - metrics: FIT_METRICS (axis 1)
+        - re: Reynolds numbers (axis 2)
+        - values: array (profiles, metrics, re), NaN where not computed
+        - slopes: PCHIP slopes d(metric)/d(log Re), same shape
+        - exponent, intercept, r2: power-law coefficients (profiles, metrics)
+        - path: cache file, if any
+    """
+    cache_path = None
+    if use_cache:
+        cache_path = _cache_path(polars_dir, list_polar_files(polars_dir))
+        if cache_path.exists():
+            return load_re_fits(cache_path)
+
+    limits = extract_limits(polars_dir=polars_dir, with_re=True)
+    limits = limits.dropna(subset=["Re"])
+    if limits.empty:
+        raise RuntimeError("No polar data with a Reynolds number available")
+    limits["Re"] = limits["Re"].round()
+
+    names = sorted(limits["Profile"].unique())
+    re_values = np.array(sorted(limits["Re"].unique()), dtype=float)
+    log_re = np.log(re_values)
+    values = np.stack(
+        [
+            limits.pivot_table(index="Profile", columns="Re", values=m, aggfunc="mean")
+            .reindex(index=names, columns=re_values)
+            .to_numpy(dtype=float)
+            for m in FIT_METRICS
+        ],
+        axis=1,
+    )
+
+    exponent = np.full(values.shape[:2], np.nan)
+    intercept = np.full(values.shape[:2], np.nan)
+    r2 = np.full(values.shape[:2], np.nan)
+    for j in range(len(FIT_METRICS)):
+        exponent[:, j], intercept[:, j], r2[:, j] = power_law_fit(log_re, values[:, j])
+
+    # Spline slopes: all complete rows at once, rows with holes one by one
+    slopes = np.full(values.shape, np.nan)
+    flat = values.reshape(-1, len(re_values))
+    flat_slopes = slopes.reshape(-1, len(re_values))
+    complete = ~np.isnan(flat).any(axis=1)
+    if complete.any() and len(re_values) >= 2:
+        flat_slopes[complete] = pchip_slopes(log_re, flat[complete])
+    for i in np.flatnonzero(~complete):
+        ok = ~np.isnan(flat[i])
+        if ok.sum() >= 2:
+            flat_slopes[i, ok] = pchip_slopes(log_re[ok], flat[i, ok])
+
+    fits = {
+        "profiles": names,
+        "metrics": list(FIT_METRICS),
+        "re": re_values,
+        "values": values,
+        "slopes": slopes,
+        "exponent": exponent,
+        "intercept": intercept,
+        "r2": r2,
+        "path": cache_path,
+    }
+    if cache_path is not None:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez(
+            cache_path,
+            **{k: np.array(v) for k, v in fits.items() if k != "path"},
+        )
+    return fits
+
+
+def load_re_fits(path):
+    """Load coefficients saved by build_re_fits."""
+    with np.load(path) as z:
+        fits = {k: z[k] for k in z.files}
+    fits["profiles"] = fits["profiles"].tolist()
+    fits["metrics"] = fits["metrics"].tolist()
+    fits["path"] = Path(path)
+    return fits
+
+
+def fit_table(fits):
+    """
+    Return the fitted exponents as a table with one row per profile.
+
+    Columns: Profile, 'n <metric>' (exponent of metric ∝ Re^n), 'R² <metric>'
+    (log-log fit quality) and 'Cd_min low/high Re' (Cd_min at the lowest
+    computed Re divided by Cd_min at the highest: the low-Re drag penalty).
+    """
+    table = {"Profile": fits["profiles"]}
+    for j, m in enumerate(fits["metrics"]):
+        table[f"n {m}"] = fits["exponent"][:, j]
+    for j, m in enumerate(fits["metrics"]):
+        table[f"R² {m}"] = fits["r2"][:, j]
+
+    cd = fits["values"][:, fits["metrics"].index("Cd_min")]
+    ok = cd > 0  # also skips NaN
+    first = np.argmax(ok, axis=1)
+    last = cd.shape[1] - 1 - np.argmax(ok[:, ::-1], axis=1)
+    rows = np.arange(len(cd))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ratio = cd[rows, first] / cd[rows, last]
+    table["Cd_min low/high Re"] = np.where(ok.sum(axis=1) >= 2, ratio, np.nan)
+    return pd.DataFrame(table)
+
+
+def predict(fits, profile, metric, re):
+    """
+    Evaluate the Reynolds model of one profile and metric at ``re``.
+
+    Inside the computed Re range the monotone spline is used; outside it the
+    power law is followed from the nearest computed point, which gives a
+    continuous extrapolation with the fitted exponent.
+    """
+    i = fits["profiles"].index(profile)
+    j = fits["metrics"].index(metric)
+    y = fits["values"][i, j]
+    ok = ~np.isnan(y)
+    if ok.sum() < 2:
+        raise ValueError(
+            f"Not enough Reynolds numbers to model {metric} of '{profile}'"
+        )
+    x = np.log(fits["re"][ok])
+    y, d = y[ok], fits["slopes"][i, j][ok]
+    n = fits["exponent"][i, j]
+
+    xq = np.log(np.atleast_1d(np.asarray(re, dtype=float)))
+    out = hermite_eval(x, y, d, xq)
+    lo, hi = xq < x[0], xq > x[-1]
+    out[lo] = y[0] * np.exp(n * (xq[lo] - x[0]))
+    out[hi] = y[-1] * np.exp(n * (xq[hi] - x[-1]))
+    return out
+
+
+def needs_re_fits(names):
+    """True if any column name or alias in ``names`` is a Reynolds-fit column."""
+    from filter_profiles import resolve_column
+
+    return any(resolve_column(n) in FIT_COLUMNS for n in names or [])
+
+
+def merge_re_fits(df, polars_dir=None):
+    """Add the FIT_COLUMNS of each profile to a limits table."""
+    fits = fit_table(build_re_fits(polars_dir))
+    return df.merge(fits, on="Profile", how="left")
@@ -0,0 +1,403 @@
+"""Monte-Carlo robustness of the profile selection under Re and threshold uncertainty."""
+
+import re
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from extract_limits import extract_limits
+from filter_profiles import resolve_column
+from rank_profiles import normalize_column, objective_columns, parse_objective
+
+# Objective used when neither an objective nor a sort column is given
+DEFAULT_OBJECTIVE = "cl_cd_max"
+
+# Ranks shown as separate bars by plot_rank_distribution (the rest is grouped)
+PLOT_RANKS = 5
+
+
+def limits_by_re(polars_dir=None, profiles=None, columns=None):
+    """
+    Limits columns of every profile at every shipped Reynolds number.
+
+    Returns (profile names, Re values, array (profiles, Re, columns)), NaN
+    where a profile has no polar at a Re. Reynolds-fit columns (see
+    re_scaling) are constant along the Re axis.
+    """
+    df = extract_limits(polars_dir=polars_dir, profiles=profiles, with_re=True)
+    df = df.dropna(subset=["Re"])
+    if df.empty:
+        raise RuntimeError("No polar data with a Reynolds number available")
+    from re_scaling import merge_re_fits, needs_re_fits
+
+    if needs_re_fits(columns):
+        df = merge_re_fits(df, polars_dir)
+    missing = [c for c in columns if c not in df.columns]
+    if missing:
+        raise ValueError(
+            f"Unknown column(s): {', '.join(missing)}. "
+            f"Available columns: {', '.join(df.columns)}"
+        )
+    df["Re"] = df["Re"].round()
+
+    names = sorted(df["Profile"].unique())
+    re_values = np.array(sorted(df["Re"].unique()), dtype=float)
+    cube = np.stack(
+        [
+            df.pivot_table(index="Profile", columns="Re", values=c, aggfunc="mean")
+            .reindex(index=names, columns=re_values)
+            .to_numpy(dtype=float)
+            for c in columns
+        ],
+        axis=-1,
+    )
+    return names, re_values, cube
+
+
+def interp_log_re(re_values, cube, re_points):
+    """
+    Linear interpolation of a (profiles, Re, columns) array in log Re.
+
+    Returns an array (points, profiles, columns); a value is NaN when either
+    neighbouring Re is missing for that profile.
+    """
+    log_re = np.log(re_values)
+    x = np.log(np.asarray(re_points, dtype=float))
+    i = np.clip(np.searchsorted(log_re, x) - 1, 0, len(log_re) - 2)
+    w = ((x - log_re[i]) / (log_re[i + 1] - log_re[i]))[:, None, None]
+    lo = cube[:, i].transpose(1, 0, 2)
+    hi = cube[:, i + 1].transpose(1, 0, 2)
+    return lo * (1 - w) + hi * w
+
+
+def sample_thresholds(criteria, n_samples, spread, rng):
+    """
+    Perturb the numeric thresholds of filter criteria.
+
+    Every threshold t becomes t * (1 + spread * N(0, 1)), drawn independently
+    per sample and criterion (both ends of 'between' are perturbed). Returns
+    {column: (operator, thresholds)} with arrays of shape (samples,) or
+    (samples, 2) for 'between'.
+    """
+    out = {}
+    for param, (operator, value) in criteria.items():
+        shape = (n_samples, 2) if operator == "between" else (n_samples,)
+        base = np.asarray(value, dtype=float)
+        out[resolve_column(param)] = (
+            operator,
+            base * (1 + spread * rng.standard_normal(shape)),
+        )
+    return out
+
+
+def selection_mask(values, thresholds):
+    """
+    Evaluate filter criteria on all samples at once.
+
+    Parameters:
+    -----------
+    values : dict
+        {column: array (samples, profiles)}
+    thresholds : dict
+        {column: (operator, thresholds)} as returned by sample_thresholds
+
+    Returns:
+    --------
+    np.ndarray
+        Boolean array (samples, profiles); NaN values never pass
+    """
+    ops = {
+        ">": np.greater,
+        ">=": np.greater_equal,
+        "<": np.less,
+        "<=": np.less_equal,
+        "==": np.equal,
+        "!=": np.not_equal,
+    }
+    selected = None
+    for col, (operator, t) in thresholds.items():
+        v = values[col]
+        if operator == "between":
+            ok = (v >= t[:, :1]) & (v <= t[:, 1:])
+        elif operator in ops:
+            ok = ops[operator](v, t[:, None])
+        else:
+            raise ValueError(
+                f"Invalid operator '{operator}'. Use: >, >=, <, <=, ==, !=, between"
+            )
+        ok &= ~np.isnan(v)
+        selected = ok if selected is None else selected & ok
+    return selected
+
+
+def rank_samples(scores, selected):
+    """
+    Rank the selected profiles of every sample by score (1 = highest).
+
+    Returns a float array (samples, profiles), NaN for profiles not selected
+    or without a score in a sample.
+    """
+    valid = selected & ~np.isnan(scores)
+    keyed = np.where(valid, scores, -np.inf)
+    order = np.argsort(-keyed, axis=1, kind="stable")
+    ranks = np.empty(scores.shape)
+    rows = np.arange(scores.shape[0])[:, None]
+    ranks[rows, order] = np.arange(1, scores.shape[1] + 1)
+    return np.where(valid, ranks, np.nan)
+
+
+def _parse_re(re_filter):
+    """Reynolds number of an --re filter such as '0.300' or 'Re0.300' (millions)."""
+    m = re.search(r"\d+(\.\d+)?", re_filter or "")
+    if not m:
+        raise ValueError(f"Cannot read a Reynolds number from '{re_filter}'")
+    return float(m.group()) * 1e6
+
+
+def robustness_ranking(
+    polars_dir=None,
+    profiles=None,
+    re_filter=None,
+    criteria=None,
+    objective=None,
+    sort=None,
+    normalize="none",
+    n_samples=2000,
+    re_spread=0.1,
+    threshold_spread=0.05,
+    re_min=None,
+    re_max=None,
+    seed=0,
+    top_k=3,
+):
+    """
+    Selection probability and rank distribution of every profile.
+
+    Thousands of scenarios are sampled at once: a Reynolds number per sample
+    (log-normal around the nominal Re, or log-uniform in [re_min, re_max])
+    and perturbed filter thresholds. The limits of every profile are
+    interpolated in log Re between the shipped polars for all samples
+    (samples x profiles arrays), the criteria are evaluated on those arrays
+    and the selected profiles of every sample are ranked by the objective.
+
+    Parameters:
+    -----------
+    polars_dir : str
+        Directory containing polar files
+    profiles : list
+        List of profile name filters
+    re_filter : str
+        Nominal Reynolds number as in file names (e.g. '0.300')
+    criteria : dict, optional
+        Filter criteria (see filter_profiles); text criteria such as
+        'family == Eppler' are applied once, numeric thresholds are sampled
+    objective : str, optional
+        Expression to maximize (see rank_profiles.parse_objective)
+    sort : str, optional
+        Column to rank by instead of an objective ('-' prefix: highest
+        first, as --sort). Default: DEFAULT_OBJECTIVE
+    normalize : str
+        Normalization of the objective columns over the selected profiles of
+        each sample ('none', 'minmax', 'zscore', 'rank')
+    n_samples : int
+        Number of Monte-Carlo samples
+    re_spread : float
+        Standard deviation of log(Re) around the nominal Re
+    threshold_spread : float
+        Relative standard deviation of each threshold (0.05: 5 %)
+    re_min, re_max : float, optional
+        Sample Re log-uniformly in this range instead
+    seed : int
+        Random seed
+    top_k : int
+        Rank counted by the 'P(top k)' column
+
+    Returns:
+    --------
+    dict
+        - summary: per profile (best first): Profile, 'Nominal rank' (at the
+          nominal Re and thresholds), 'P(selected)', 'P(rank 1)',
+          'P(top k)', 'Mean rank', 'Rank p5', 'Median rank', 'Rank p95'
+          (rank statistics over the samples where the profile is selected)
+        - ranks: array (samples, profiles), NaN when not selected
+        - profiles: profile names (axis 1 of ranks)
+        - re_samples: sampled Reynolds numbers
+        - n_samples, objective
+    """
+    criteria = dict(criteria or {})
+    text = {p: c for p, c in criteria.items() if isinstance(c[1], str)}
+    numeric = {p: c for p, c in criteria.items() if p not in text}
+    if n_samples < 1:
+        raise ValueError("The number of samples must be positive")
+
+    sign = 1.0
+    if objective is None and sort:
+        # --sort is ascending unless prefixed with '-'; scores are maximized
+        sign = 1.0 if sort.startswith("-") else -1.0
+        objective = sort.lstrip("-")
+    objective = objective or DEFAULT_OBJECTIVE
+    # Column names are checked against the limits table by limits_by_re
+    evaluate, used = parse_objective(objective, objective_columns(objective))
+    columns = list(dict.fromkeys(used + [resolve_column(p) for p in numeric]))
+
+    names, re_values, cube = limits_by_re(polars_dir, profiles, columns)
+    if len(re_values) < 2:
+        raise RuntimeError(
+            "Robustness sampling needs polars at two Reynolds numbers or more"
+        )
+    if text:
+        from filter_profiles import apply_criteria
+
+        keep = set(apply_criteria(pd.DataFrame({"Profile": names}), text)["Profile"])
+        idx = [i for i, n in enumerate(names) if n in keep]
+        names = [names[i] for i in idx]
+        cube = cube[idx]
+        if not names:
+            raise ValueError("No profiles match the text criteria")
+
+    rng = np.random.default_rng(seed)
+    if re_min is not None and re_max is not None:
+        re_samples = np.exp(rng.uniform(np.log(re_min), np.log(re_max), n_samples))
+        re_nominal = np.sqrt(re_min * re_max)
+    else:
+        if not re_filter:
+            raise ValueError("A nominal Reynolds number (--re) or a range is needed")
+        re_nominal = _parse_re(re_filter)
+        re_samples = re_nominal * np.exp(re_spread * rng.standard_normal(n_samples))
+    outside = (re_samples < re_values[0]) | (re_samples > re_values[-1])
+    if outside.any():
+        print(
+            f"WARNING: {outside.mean():.1%} of the sampled Re fall outside the shipped "
+            f"range ({re_values[0]:.3g} to {re_values[-1]:.3g}) and are clipped to it"
+        )
+    re_samples = np.clip(re_samples, re_values[0], re_values[-1])
+
+    def evaluate_samples(re_points, thresholds):
+        interp = interp_log_re(re_values, cube, re_points)
+        values = {c: interp[..., j] for j, c in enumerate(columns)}
+        selected = np.ones(interp.shape[:2], dtype=bool)
+        if thresholds:
+            selected = selection_mask(values, thresholds)
+        # Normalization statistics over the selected profiles of each sample
+        masked = {
+            c: normalize_column(np.where(selected, values[c], np.nan), normalize, 1)
+            for c in used
+        }
+        score = sign * np.broadcast_to(
+            np.asarray(evaluate(masked), dtype=float), selected.shape
+        )
+        return rank_samples(score, selected)
+
+    nominal = evaluate_samples(
+        np.clip([re_nominal], re_values[0], re_values[-1]),
+        sample_thresholds(numeric, 1, 0.0, rng),
+    )[0]
+    ranks = evaluate_samples(
+        re_samples, sample_thresholds(numeric, n_samples, threshold_spread, rng)
+    )
+
+    chosen = ~np.isnan(ranks)
+    p_selected = chosen.mean(axis=0)
+    with warnings.catch_warnings():
+        # Profiles never selected have no rank statistics
+        warnings.simplefilter("ignore", RuntimeWarning)
+        p5, p50, p95 = np.nanpercentile(ranks, [5, 50, 95], axis=0)
+        mean_rank = np.nanmean(ranks, axis=0)
+    summary = pd.DataFrame(
+        {
+            "Profile": names,
+            "Nominal rank": pd.Series(nominal).astype("Int64"),
+            "P(selected)": p_selected,
+            "P(rank 1)": (ranks == 1).mean(axis=0),
+            f"P(top {top_k})": (ranks <= top_k).mean(axis=0),
+            "Mean rank": mean_rank,
+            "Rank p5": p5,
+            "Median rank": p50,
+            "Rank p95": p95,
+        }
+    )
+    order = np.lexsort(
+        (
+            np.nan_to_num(mean_rank, nan=np.inf),
+            -p_selected,
+            -summary[f"P(top {top_k})"].to_numpy(),
+            -summary["P(rank 1)"].to_numpy(),
+        )
+    )
+    summary = summary.iloc[order].reset_index(drop=True)
+    return {
+        "summary": summary,
+        "ranks": ranks,
+        "profiles": names,
+        "re_samples": re_samples,
+        "n_samples": n_samples,
+        "objective": ("-" if sign < 0 else "") + objective,
+    }
+
+
+def rank_distribution(result, max_rank=PLOT_RANKS):
+    """
+    Probability of each rank per profile: columns 'rank 1' ... 'rank N', then
+    '> N' (selected with a lower rank) and 'not selected', rows as in the
+    summary.
+    """
+    names = result["summary"]["Profile"]
+    idx = [result["profiles"].index(n) for n in names]
+    ranks = result["ranks"][:, idx]
+    table = {"Profile": names.to_numpy()}
+    for r in range(1, max_rank + 1):
+        table[f"rank {r}"] = (ranks == r).mean(axis=0)
+    table[f"> {max_rank}"] = (ranks > max_rank).mean(axis=0)
+    table["not selected"] = np.isnan(ranks).mean(axis=0)
+    return pd.DataFrame(table)
+
+
+def plot_rank_distribution(result, out_path=None, top=15, figsize=(14, 9)):
+    """
+    Stacked bars of the rank probabilities of the ``top`` first profiles of
+    the summary (rank 1 to PLOT_RANKS, lower ranks and not selected).
+    """
+    import matplotlib.pyplot as plt
+
+    dist = rank_distribution(result).head(top).iloc[::-1]
+    parts = [c for c in dist.columns if c != "Profile"]
+    colors = [plt.get_cmap("viridis")(i / PLOT_RANKS) for i in range(PLOT_RANKS)]
+    colors += ["#bbbbbb", "#eeeeee"]
+
+    fig, ax = plt.subplots(figsize=figsize)
+    left = np.zeros(len(dist))
+    for col, color in zip(parts, colors):
+        ax.barh(
+            dist["Profile"],
+            dist[col],
+            left=left,
+            color=color,
+            edgecolor="white",
+            label=col,
+        )
+        left += dist[col].to_numpy()
+    ax.set_xlim(0, 1)
+    ax.set_xlabel("Probabilidad", fontsize=18)
+    ax.tick_params(axis="both", labelsize=13)
+    ax.grid(True, axis="x", alpha=0.3)
+    re_samples = result["re_samples"]
+    ax.set_title(
+        f"Robustez de la selección: {result['n_samples']} muestras, "
+        f"Re {re_samples.min():.3g} a {re_samples.max():.3g}, "
+        f"objetivo {result['objective']}",
+        fontsize=18,
+        pad=15,
+    )
+    ax.legend(
+        title="Posición",
+        loc="center left",
+        bbox_to_anchor=(1.01, 0.5),
+        fontsize=12,
+    )
+    fig.tight_layout()
+    if out_path:
+        fig.savefig(out_path, dpi=300, bbox_inches="tight")
+        print("Saved figure to", out_path)
+    else:
+        plt.show()
@@ -0,0 +1,66 @@
+"""Shard specification and merging of partial limits/extract outputs."""
+
+import glob
+from pathlib import Path
+
+import pandas as pd
+
+from corpus_io import read_table
+
+SOURCE_COLUMN = "Source file"
+
+
+def parse_shard(spec):
+    """Parse 'i/N' (i from 1 to N) into the (index, count) pair used by the loaders."""
+    try:
+        i, n = (int(v) for v in str(spec).split("/"))
+    except ValueError:
+        raise ValueError(f"Invalid shard '{spec}'. Use i/N, e.g. 1/4") from None
+    if n < 1 or not 1 <= i <= n:
+        raise ValueError(f"Invalid shard '{spec}': i must be between 1 and N")
+    return i - 1, n
+
+
+def expand_inputs(inputs):
+    """Expand comma-separated paths and glob patterns into a sorted file list."""
+    paths = []
+    for item in [p.strip() for p in inputs.split(",") if p.strip()]:
+        matches = sorted(glob.glob(item))
+        if not matches:
+            raise RuntimeError(f"No shard output matches '{item}'")
+        paths += [Path(m) for m in matches if Path(m) not in paths]
+    return paths
+
+
+def merge_shard_tables(frames):
+    """
+    Combine partial tables written with --shard into the single-run table.
+
+    Rows are put back in polar file order using the 'Source file' column,
+    which is then dropped. Extract tables (with 'Alpha_target') keep, as a
+    single run does, one set of rows per profile: those of its last file,
+    in the order of the profile's first file.
+    """
+    frames = [f for f in frames if not f.empty]
+    if not frames:
+        return pd.DataFrame()
+    df = pd.concat(frames, ignore_index=True)
+    if SOURCE_COLUMN not in df.columns:
+        raise ValueError(
+            f"Missing '{SOURCE_COLUMN}' column: merge only accepts outputs written with --shard"
+        )
+    df = df.sort_values(SOURCE_COLUMN, kind="stable")
+
+    if "Alpha_target" in df.columns:
+        first = {p: i for i, p in enumerate(df["Profile"].drop_duplicates())}
+        last_file = df.groupby("Profile")[SOURCE_COLUMN].transform("max")
+        df = df[df[SOURCE_COLUMN] == last_file]
+        df = df.sort_values("Profile", key=lambda s: s.map(first), kind="stable")
+
+    return df.drop(columns=SOURCE_COLUMN).reset_index(drop=True)
+
+
+def merge_shard_outputs(inputs):
+    """Read the shard outputs matching ``inputs`` and merge them (see merge_shard_tables)."""
+    paths = expand_inputs(inputs)
+    return merge_shard_tables([read_table(p) for p in paths]), paths
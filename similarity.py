@@ -0,0 +1,154 @@
+"""Polar similarity search: fixed-length embeddings and k nearest neighbours."""
+
+import numpy as np
+import pandas as pd
+
+from mission import drag_polar_grid
+from polar_tensor import build_polar_tensor, coefficient, tensor_cache_path
+
+# Embedding grids: Cl(alpha) and Cm(alpha) on EMBED_ALPHA, Cd(Cl) on EMBED_CL
+EMBED_ALPHA = np.round(np.arange(-5.0, 15.0 + 1e-9, 0.5), 6)
+EMBED_CL = np.round(np.arange(0.0, 1.2 + 1e-9, 0.05), 6)
+# Minimum fraction of features valid for both polars to compare them
+MIN_COVERAGE = 0.5
+
+# Embeddings loaded in this process, keyed by cache file
+_EMBEDDINGS = {}
+
+
+def polar_embeddings(tensor):
+    """
+    Embed every polar of a tensor as one fixed-length vector.
+
+    The vector concatenates Cl(alpha), Cm(alpha) and Cd(Cl) resampled on
+    EMBED_ALPHA / EMBED_CL. Each block is divided by its standard deviation
+    over the corpus so the three curves weigh the same in distances.
+    Missing values (outside a polar's range) are NaN.
+
+    Returns an array (profiles, re, features).
+    """
+    alpha = tensor["alpha"]
+    idx = np.clip(np.searchsorted(alpha, EMBED_ALPHA), 0, len(alpha) - 1)
+    if not np.allclose(alpha[idx], EMBED_ALPHA):
+        raise ValueError("The tensor alpha grid does not contain the embedding grid")
+    cl = coefficient(tensor, "CL")[:, :, idx]
+    cm = coefficient(tensor, "Cm")[:, :, idx]
+    cd = drag_polar_grid(tensor, EMBED_CL)
+
+    blocks = [b / np.nanstd(b) for b in (cl, cm, cd)]
+    return np.concatenate(blocks, axis=2)
+
+
+def load_embeddings(polars_dir=None, use_cache=True):
+    """
+    Return (profiles, re, embeddings) for the whole corpus.
+
+    Embeddings are cached on disk next to the polar tensor they derive from
+    and kept in memory, so repeated queries skip loading the tensor.
+    """
+    if not use_cache:
+        tensor = build_polar_tensor(polars_dir, use_cache=False)
+        return tensor["profiles"], tensor["re"], polar_embeddings(tensor)
+
+    tensor_path = tensor_cache_path(polars_dir)
+    cache_path = tensor_path.with_name(tensor_path.name.replace("tensor_", "embed_"))
+    if cache_path in _EMBEDDINGS:
+        return _EMBEDDINGS[cache_path]
+    if cache_path.exists():
+        with np.load(cache_path) as z:
+            result = (z["profiles"].tolist(), z["re"], z["embeddings"])
+    else:
+        tensor = build_polar_tensor(polars_dir)
+        result = (tensor["profiles"], tensor["re"], polar_embeddings(tensor))
+        np.savez(
+            cache_path,
+            profiles=np.array(result[0]),
+            re=result[1],
+            embeddings=result[2],
+        )
+    _EMBEDDINGS[cache_path] = result
+    return result
+
+
+def _resolve_profile(name, names):
+    if name in names:
+        return names.index(name)
+    matches = [n for n in names if name.lower() in n.lower()]
+    if len(matches) != 1:
+        raise ValueError(
+            f"Profile '{name}' matches {len(matches)} profiles"
+            + (f": {', '.join(matches)}" if matches else "")
+        )
+    return names.index(matches[0])
+
+
+def similar_profiles(
+    query,
+    re_min=None,
+    re_max=None,
+    k=10,
+    polars_dir=None,
+    candidates=None,
+):
+    """
+    Find the k profiles whose polars are closest to ``query``.
+
+    Parameters:
+    -----------
+    query : str
+        Profile name (exact, or a unique case-insensitive substring)
+    re_min, re_max : float, optional
+        Reynolds range compared (all shipped Re by default)
+    k : int
+        Number of neighbours returned
+    polars_dir : str
+        Directory containing polar files
+    candidates : list, optional
+        Profile name substrings the neighbours are restricted to
+
+    Returns:
+    --------
+    pd.DataFrame
+        Rank, Profile, Distance (RMS over the common valid features of all
+        compared Re, in block-standardized units) and Coverage (fraction of
+        features valid for both profiles)
+    """
+    names, re_values, emb = load_embeddings(polars_dir)
+    q = _resolve_profile(query, names)
+
+    re_sel = np.ones(len(re_values), dtype=bool)
+    if re_min is not None:
+        re_sel &= re_values >= re_min
+    if re_max is not None:
+        re_sel &= re_values <= re_max
+    if not re_sel.any():
+        raise RuntimeError("No shipped Reynolds number in the requested range")
+
+    x = emb[:, re_sel].reshape(len(names), -1)
+    xq = x[q]
+    valid = ~np.isnan(x) & ~np.isnan(xq)
+    diff = np.where(valid, x - xq, 0.0)
+    n_common = valid.sum(axis=1)
+    coverage = n_common / max(int((~np.isnan(xq)).sum()), 1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        dist = np.sqrt((diff**2).sum(axis=1) / n_common)
+
+    usable = coverage >= MIN_COVERAGE
+    usable[q] = False
+    if candidates:
+        usable &= np.array([any(c in n for c in candidates) for n in names])
+    dist = np.where(usable, dist, np.inf)
+
+    k = min(k, int(usable.sum()))
+    if k <= 0:
+        return pd.DataFrame(columns=["Rank", "Profile", "Distance", "Coverage"])
+    top = np.argpartition(dist, k - 1)[:k]
+    top = top[np.argsort(dist[top])]
+    return pd.DataFrame(
+        {
+            "Rank": np.arange(1, k + 1),
+            "Profile": [names[i] for i in top],
+            "Distance": dist[top],
+            "Coverage": coverage[top],
+        }
+    )
@@ -0,0 +1,154 @@
+"""Watch a polars directory and incrementally refresh results on change."""
+
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from extract_limits import compute_limits
+from filter_profiles import apply_criteria
+from polars_reader import file_signature, parse_polar_file, select_polar_files
+
+
+def snapshot_polar_files(polars_dir=None, profiles=None, re_filter=None):
+    """
+    Return {path: (mtime_ns, size)} for the selected polar files.
+
+    Members of an archive or database source get the signature of the source
+    file (see file_signature), so a rewritten archive marks them modified.
+    """
+    snapshot = {}
+    for f in select_polar_files(polars_dir, profiles, re_filter):
+        try:
+            snapshot[f] = file_signature(f)
+        except FileNotFoundError:
+            # Removed between listing and stat
+            continue
+    return snapshot
+
+
+def diff_snapshots(old, new):
+    """Compare two snapshots and return (added, modified, removed) paths."""
+    added = [p for p in new if p not in old]
+    modified = [p for p in new if p in old and new[p] != old[p]]
+    removed = [p for p in old if p not in new]
+    return added, modified, removed
+
+
+class PolarWatcher:
+    """
+    Keep parsed polars and their limits rows in sync with a directory.
+
+    Only files that were added or modified since the previous refresh are
+    parsed again; removed files are dropped from the in-memory state.
+    """
+
+    def __init__(self, polars_dir=None, profiles=None, re_filter=None):
+        self.polars_dir = polars_dir
+        self.profiles = profiles
+        self.re_filter = re_filter
+        self.snapshot = {}
+        self.polars = {}
+        self.limits = {}
+
+    def refresh(self):
+        """Update the state from disk and return (added, modified, removed)."""
+        new = snapshot_polar_files(self.polars_dir, self.profiles, self.re_filter)
+        added, modified, removed = diff_snapshots(self.snapshot, new)
+        for path in removed:
+            self.polars.pop(path, None)
+            self.limits.pop(path, None)
+        for path in added + modified:
+            try:
+                parsed = parse_polar_file(path)
+            except FileNotFoundError:
+                # Removed or renamed since the snapshot: forget it until the
+                # next poll lists it again
+                new.pop(path)
+                self.polars.pop(path, None)
+                self.limits.pop(path, None)
+                continue
+            self.polars[path] = parsed
+            df = parsed["df"]
+            if df is None or df.empty:
+                print(
+                    f"WARNING: Skipping '{parsed['name']}' - no polar data available (empty file)"
+                )
+                self.limits[path] = None
+            else:
+                self.limits[path] = compute_limits(df, parsed["name"])
+        removed += [p for p in modified if p not in new]
+        added = [p for p in added if p in new]
+        modified = [p for p in modified if p in new]
+        self.snapshot = new
+        return added, modified, removed
+
+    def parse(self, path):
+        """Parser hook for the loaders: return the cached parse of ``path``."""
+        path = Path(path)
+        if path not in self.polars:
+            try:
+                self.polars[path] = parse_polar_file(path)
+            except FileNotFoundError:
+                # Gone since the last refresh: read as an empty polar (the
+                # loaders skip it) and leave it to the next poll
+                return {
+                    "path": path,
+                    "name": path.stem,
+                    "re": None,
+                    "mach": None,
+                    "ncrit": None,
+                    "df": None,
+                }
+        return self.polars[path]
+
+    def limits_table(self, criteria=None):
+        """Build the limits table (same row order as extract_limits)."""
+        rows = [self.limits[p] for p in self.snapshot if self.limits.get(p)]
+        df = pd.DataFrame(rows)
+        if df.empty:
+            return df
+        return apply_criteria(df, criteria)
+
+
+def watch(
+    on_change,
+    polars_dir=None,
+    profiles=None,
+    re_filter=None,
+    interval=0.5,
+    max_cycles=None,
+):
+    """
+    Poll the polars directory and call ``on_change`` whenever files change.
+
+    Parameters:
+    -----------
+    on_change : callable
+        Called as on_change(watcher, (added, modified, removed)) once at
+        start-up and then after every detected change
+    polars_dir : str
+        Directory containing polar files
+    profiles : list
+        List of profile name filters
+    re_filter : str
+        Reynolds number filter
+    interval : float
+        Polling interval in seconds
+    max_cycles : int, optional
+        Stop after this many polling cycles (runs until Ctrl+C by default)
+    """
+    watcher = PolarWatcher(polars_dir, profiles, re_filter)
+    on_change(watcher, watcher.refresh())
+
+    cycles = 0
+    try:
+        while max_cycles is None or cycles < max_cycles:
+            time.sleep(interval)
+            cycles += 1
+            changes = watcher.refresh()
+            if any(changes):
+                on_change(watcher, changes)
+    except KeyboardInterrupt:
+        print("Stopped watching.")
+    return watcher
@@ -0,0 +1,234 @@
+"""Spanwise wing evaluation: profile drag of every profile with Re-varying stations."""
+
+import numpy as np
+import pandas as pd
+
+from mission import CL_STEP, MU, RHO, drag_polar_grid, interp_cd
+from polar_tensor import build_polar_tensor, coefficient
+
+
+def load_stations(path):
+    """
+    Read a planform stations CSV.
+
+    Columns: 'y' (spanwise position in m, root to tip, half wing), 'chord'
+    (m) and either 'cl' (local lift coefficient) or 'twist' (local
+    geometric twist in deg, relative to the root). Rows are sorted by y.
+    """
+    stations = pd.read_csv(path)
+    stations.columns = [c.strip().lower() for c in stations.columns]
+    missing = {"y", "chord"} - set(stations.columns)
+    if missing:
+        raise ValueError(
+            f"Stations file needs 'y' and 'chord' columns (missing: {', '.join(sorted(missing))})"
+        )
+    if "cl" not in stations.columns and "twist" not in stations.columns:
+        raise ValueError("Stations file needs a 'cl' or a 'twist' column")
+    if len(stations) < 2:
+        raise ValueError("At least two stations are needed to integrate over the span")
+    return stations.sort_values("y").reset_index(drop=True)
+
+
+def interp_alpha(tensor, name, re_points, alpha_points):
+    """
+    Bilinear interpolation of a coefficient in (log Re, alpha).
+
+    Parameters:
+    -----------
+    tensor : dict
+        Polar tensor (see polar_tensor.build_polar_tensor)
+    name : str
+        Coefficient name ('CL', 'CD', 'Cm', 'Cl_Cd')
+    re_points : array (S,)
+        Reynolds number of each station
+    alpha_points : array (P, ..., S)
+        Angle of attack (deg) of each profile at each station
+
+    Returns:
+    --------
+    np.ndarray
+        Same shape as alpha_points; NaN outside the shipped Re range, the
+        alpha grid or the converged points of a polar.
+    """
+    values = coefficient(tensor, name)
+    alpha = tensor["alpha"]
+    a = np.asarray(alpha_points, dtype=float)
+    log_re = np.log(tensor["re"])
+    x = np.log(np.asarray(re_points, dtype=float))
+
+    ir = np.clip(np.searchsorted(log_re, x) - 1, 0, len(log_re) - 2)
+    wr = (x - log_re[ir]) / (log_re[ir + 1] - log_re[ir])
+    step = alpha[1] - alpha[0]
+    ia = np.clip((np.nan_to_num(a - alpha[0]) // step).astype(int), 0, len(alpha) - 2)
+    wa = (a - alpha[ia]) / step
+    p = np.arange(values.shape[0]).reshape((-1,) + (1,) * (a.ndim - 1))
+
+    out = (
+        values[p, ir, ia] * (1 - wr) * (1 - wa)
+        + values[p, ir + 1, ia] * wr * (1 - wa)
+        + values[p, ir, ia + 1] * (1 - wr) * wa
+        + values[p, ir + 1, ia + 1] * wr * wa
+    )
+    outside = (
+        (x < log_re[0] - 1e-9)
+        | (x > log_re[-1] + 1e-9)
+        | (a < alpha[0])
+        | (a > alpha[-1])
+    )
+    return np.where(outside, np.nan, out)
+
+
+def _span_integral(values, y):
+    """Both halves of the wing: 2 * trapezoidal integral over the stations."""
+    return ((values[..., 1:] + values[..., :-1]) * np.diff(y)).sum(axis=-1)
+
+
+def wing_ranking(
+    stations,
+    speed,
+    weight=None,
+    rho=RHO,
+    mu=MU,
+    polars_dir=None,
+    profiles=None,
+    candidates=None,
+    cl_step=CL_STEP,
+    tensor=None,
+):
+    """
+    Rank profiles by the profile drag of a wing built with them.
+
+    Parameters:
+    -----------
+    stations : pd.DataFrame
+        Half-wing stations with 'y', 'chord' and 'cl' or 'twist' columns
+        (see load_stations)
+    speed : float
+        Flight speed (m/s)
+    weight : float, optional
+        Lift to carry (N). With 'cl' stations the Cl distribution is scaled
+        to carry it; with 'twist' stations it is required, and the root
+        angle of attack giving this lift is found for every profile
+    rho, mu : float
+        Air density (kg/m^3) and dynamic viscosity (Pa s)
+    polars_dir : str
+        Directory containing polar files
+    profiles : list
+        List of profile name filters
+    candidates : list, optional
+        Exact profile names allowed (e.g. the result of filter_profiles);
+        the best profile of the station table is chosen among them
+    cl_step : float
+        Step of the Cl grid used to tabulate Cd(Cl)
+    tensor : dict, optional
+        Prebuilt polar tensor (see polar_tensor.build_polar_tensor)
+
+    Every station has its own Re (from its chord) and Cl; Cd of all
+    profiles at all stations is interpolated at once (profiles x stations)
+    and the sectional drag q*c*Cd is integrated over the span. With twist,
+    the section angle is the root angle plus the local twist (strip theory,
+    induced angles neglected).
+
+    Returns:
+    --------
+    (pd.DataFrame, pd.DataFrame)
+        Ranking (best first; profiles that cannot fly every station are
+        ranked last): Rank, Profile, 'Profile drag (N)', 'Wing Cd0'
+        (profile drag over q*S), 'Feasible stations' and, with twist,
+        'α root (deg)'. Station table with y, chord, Re and Cl (for twist,
+        Cl of the best profile), and Cd of the best profile.
+    """
+    y = stations["y"].to_numpy(dtype=float)
+    chord = stations["chord"].to_numpy(dtype=float)
+    q = 0.5 * rho * speed**2
+    re_points = rho * speed * chord / mu
+    area = _span_integral(chord, y)
+    stations = stations.assign(Re=re_points)
+
+    if tensor is None:
+        tensor = build_polar_tensor(polars_dir, profiles)
+    if len(tensor["re"]) < 2:
+        raise RuntimeError(
+            "Wing evaluation needs polars at two Reynolds numbers or more"
+        )
+    re_values = tensor["re"]
+    outside = (re_points < re_values[0]) | (re_points > re_values[-1])
+    if outside.any():
+        print(
+            f"WARNING: {outside.sum()} station(s) outside the shipped Reynolds range "
+            f"({re_values[0]:.3g} to {re_values[-1]:.3g})"
+        )
+
+    alpha_root = None
+    if "cl" in stations.columns:
+        cl_points = stations["cl"].to_numpy(dtype=float)
+        if weight:
+            lift = q * _span_integral(chord * cl_points, y)
+            cl_points = cl_points * weight / lift
+            stations["cl"] = cl_points
+        cl_all = coefficient(tensor, "CL")
+        cl_grid = np.arange(
+            np.floor(np.nanmin(cl_all) / cl_step) * cl_step,
+            np.nanmax(cl_all) + cl_step,
+            cl_step,
+        )
+        cd_grid = drag_polar_grid(tensor, cl_grid)
+        cd = interp_cd(re_values, cl_grid, cd_grid, re_points, cl_points)
+        cl = np.broadcast_to(cl_points, cd.shape)
+    else:
+        if not weight:
+            raise ValueError("Stations with 'twist' need the weight to carry")
+        twist = stations["twist"].to_numpy(dtype=float)
+        n_p = len(tensor["profiles"])
+        # Lift of every profile at every root angle of the alpha grid
+        roots = tensor["alpha"]
+        grid = np.broadcast_to(roots[None, :, None] + twist, (n_p, len(roots), len(y)))
+        lift = q * _span_integral(
+            chord * interp_alpha(tensor, "CL", re_points, grid), y
+        )
+        # First crossing of the required lift on the rising branch
+        cross = (lift[:, :-1] < weight) & (lift[:, 1:] >= weight)
+        k = np.argmax(cross, axis=1)
+        found = cross.any(axis=1)
+        rows = np.arange(n_p)
+        lo, hi = lift[rows, k], lift[rows, k + 1]
+        alpha_root = roots[k] + (weight - lo) / (hi - lo) * (roots[1] - roots[0])
+        alpha_root = np.where(found, alpha_root, np.nan)
+        section = alpha_root[:, None] + twist
+        cl = interp_alpha(tensor, "CL", re_points, section)
+        cd = interp_alpha(tensor, "CD", re_points, section)
+
+    feasible = ~np.isnan(cd)
+    n_ok = feasible.sum(axis=1)
+    all_ok = n_ok == len(y)
+    drag = q * _span_integral(chord * np.where(feasible, cd, 0.0), y)
+
+    ranking = pd.DataFrame(
+        {
+            "Profile": tensor["profiles"],
+            "Profile drag (N)": np.where(all_ok, drag, np.nan),
+            "Wing Cd0": np.where(all_ok, drag / (q * area), np.nan),
+            "Feasible stations": n_ok,
+        }
+    )
+    if alpha_root is not None:
+        ranking["α root (deg)"] = alpha_root
+    ranking["_i"] = np.arange(len(ranking))
+    if candidates is not None:
+        ranking = ranking[ranking["Profile"].isin(list(candidates))]
+        if ranking.empty:
+            raise RuntimeError("No candidate profile in the polar data")
+    # Infeasible profiles last, ordered by how many stations they can fly
+    ranking = ranking.sort_values(
+        ["Profile drag (N)", "Feasible stations"],
+        ascending=[True, False],
+        na_position="last",
+    ).reset_index(drop=True)
+    best = int(ranking["_i"].iloc[0])
+    ranking = ranking.drop(columns="_i")
+    ranking.insert(0, "Rank", np.arange(1, len(ranking) + 1))
+
+    if alpha_root is not None:
+        stations["Cl (best)"] = cl[best]
+    stations["Cd (best)"] = cd[best]
+    return ranking, stations